@@ -1,7 +1,19 @@
+from dataclasses import dataclass
+from operator import attrgetter
 from typing import Optional
-from utils.identity import Identity
-from utils.hashing import Hashing
 
+# Record keys match attribute names one-to-one; built once so to_record avoids a dict literal per call.
+_RECORD_KEYS = ("name", "version", "source", "description")
+_get_record_values = attrgetter(*_RECORD_KEYS)
+
+# Required attributes and the error raised when each is missing, in check order.
+_REQUIRED_FIELDS = (
+    ("name", "Name is required"),
+    ("version", "Version is required"),
+    ("source", "Source is required"),
+)
+
+@dataclass(slots=True, eq=False)
 class Dataset:
     """Represents a versioned dataset used for training models.
     
@@ -14,24 +26,21 @@ class Dataset:
         version: The version identifier of the dataset.
         source: The source or path where the dataset is located.
         description: Optional description of the dataset.
+        RECORD_KEYS: The stored column names, in the order to_record emits them.
     """
+    RECORD_KEYS = _RECORD_KEYS
+    
+    name: str
+    version: str
+    source: str
+    description: Optional[str] = None
         
-    def __init__(self, name: str, version: str, source: str, description: str | Optional[str] = None) -> None:
-        """Initialize a Dataset instance.
+    def __post_init__(self) -> None:
+        """Validate a newly initialized Dataset instance.
         
-        Args:
-            name: The name of the dataset.
-            version: The version identifier of the dataset.
-            source: The source or path where the dataset is located (e.g., S3 URI, file path).
-            description: Optional description of the dataset.
-            
         Raises:
             ValueError: If any required field (name, version, source) is missing.
         """ 
-        self.name = name
-        self.version = version
-        self.source = source
-        self.description = description
         self._enforce_required_fields()
         
         
@@ -41,12 +50,11 @@ class Dataset:
         Raises:
             ValueError: If any required field is missing or empty.
         """
-        if not self.name:
-            raise ValueError("Name is required")
-        if not self.version:
-            raise ValueError("Version is required")
-        if not self.source:
-            raise ValueError("Source is required")
+        if self.name and self.version and self.source:
+            return
+        for attr, message in _REQUIRED_FIELDS:
+            if not getattr(self, attr):
+                raise ValueError(message)
         
         
     def to_record(self) -> dict:
@@ -56,27 +64,41 @@ class Dataset:
             dict: A dictionary containing all dataset fields suitable for
                   persistence in the metadata store.
         """
-        return {
-            "name": self.name,
-            "version": self.version,
-            "source": self.source,
-            "description": self.description
-        }
+        return dict(zip(_RECORD_KEYS, _get_record_values(self)))
     
     
     @classmethod
     def from_record(cls, record: dict) -> "Dataset":
         """Create a Dataset instance from a dictionary record.
         
+        Fields are passed positionally, in declaration order, which is cheaper
+        than keyword arguments. Validation still runs.
+        
         Args:
             record: Dictionary containing dataset fields.
             
         Returns:
             Dataset: A Dataset instance created from the record.
         """
-        return cls(
-            name=record["name"],
-            version=record["version"],
-            source=record["source"],
-            description=record.get("description")
-        )
+        return cls(record["name"], record["version"], record["source"], record.get("description"))
+    
+    
+    @classmethod
+    def from_trusted_record(cls, record: dict) -> "Dataset":
+        """Create a Dataset instance from a record read back from the metadata store.
+        
+        The store already enforces the required columns, so this skips
+        __init__ and validation. Use from_record for untrusted input.
+        
+        Args:
+            record: Dictionary containing dataset fields, as returned by the database.
+            
+        Returns:
+            Dataset: A Dataset instance created from the record.
+        """
+        dataset = object.__new__(cls)
+        dataset.name = record["name"]
+        dataset.version = record["version"]
+        dataset.source = record["source"]
+        dataset.description = record.get("description")
+        return dataset
@@ -1,3 +1,22 @@
+import sys
+from dataclasses import dataclass
+from operator import attrgetter, itemgetter
+
+# Record keys paired positionally with the attributes that populate them.
+_RECORD_KEYS = ("artifact_uri", "model_name", "run_id", "lifecycle_stage")
+_get_record_values = attrgetter("artifact_uri", "model_name", "associated_run_id", "lifecycle_stage")
+# Stored record values in Model field order, for bulk construction.
+_get_field_values = itemgetter(*_RECORD_KEYS)
+
+# Required attributes and the error raised when each is missing, in check order.
+_REQUIRED_FIELDS = (
+    ("artifact_uri", "Artifact URI is required"),
+    ("associated_run_id", "Associated run is required"),
+    ("model_name", "Model name is required"),
+)
+
+
+@dataclass(slots=True, eq=False)
 class Model:
     """Represents a trained model artifact produced by a run.
     
@@ -10,30 +29,29 @@ class Model:
         model_name: The name of the model.
         associated_run_id: The identifier of the run that produced this model.
         lifecycle_stage: The current lifecycle stage of the model (registered, staging, production, or archived).
-        ALLOWED_STAGES: Set of valid lifecycle stages for a model.
+        ALLOWED_STAGES: Frozen set of valid lifecycle stages for a model.
+        RECORD_KEYS: The stored column names, in the order to_record emits them.
     """
-    ALLOWED_STAGES = {"registered", "staging", "production", "archived"}
+    ALLOWED_STAGES = frozenset({"registered", "staging", "production", "archived"})
+    RECORD_KEYS = _RECORD_KEYS
     
-    def __init__(self, artifact_uri: str, model_name: str ,associated_run_id: str, lifecycle_stage: str):
-        """Initialize a Model instance.
+    artifact_uri: str
+    model_name: str
+    associated_run_id: str
+    lifecycle_stage: str
+    
+    def __post_init__(self) -> None:
+        """Validate a newly initialized Model instance.
         
-        Args:
-            artifact_uri: The URI or path where the model artifact is stored (e.g., S3 URI, file path).
-            model_name: The name of the model.
-            associated_run_id: The identifier of the run that produced this model.
-            lifecycle_stage: The current lifecycle stage of the model. Must be one of:
-                           "registered", "staging", "production", or "archived".
+        lifecycle_stage must be one of "registered", "staging", "production", or
+        "archived". Once validated it is interned, so models loaded in bulk share
+        the four stage strings instead of holding one decoded copy each.
             
         Raises:
             ValueError: If any required field is missing or lifecycle_stage is invalid.
         """
-        self.artifact_uri = artifact_uri
-        
-        self.associated_run_id = associated_run_id
-        self.lifecycle_stage = lifecycle_stage
-        self.model_name = model_name
-        
         self._enforce_required_fields()
+        self.lifecycle_stage = sys.intern(self.lifecycle_stage)
     
     
     
@@ -43,12 +61,10 @@ class Model:
         Raises:
             ValueError: If any required field is missing or empty.
         """
-        if not self.artifact_uri:
-            raise ValueError("Artifact URI is required")
-        if not self.associated_run_id:
-            raise ValueError("Associated run is required")
-        if not self.model_name:
-            raise ValueError("Model name is required")
+        if not (self.artifact_uri and self.associated_run_id and self.model_name):
+            for attr, message in _REQUIRED_FIELDS:
+                if not getattr(self, attr):
+                    raise ValueError(message)
         if not self.lifecycle_stage or self.lifecycle_stage not in self.ALLOWED_STAGES:
             raise ValueError("Invalid lifecycle stage")
     
@@ -59,12 +75,7 @@ class Model:
         Returns:
             dict: Dictionary containing all model metadata.
         """
-        return {
-            "artifact_uri": self.artifact_uri,
-            "model_name": self.model_name,
-            "run_id": self.associated_run_id,
-            "lifecycle_stage": self.lifecycle_stage
-        }
+        return dict(zip(_RECORD_KEYS, _get_record_values(self)))
         
     @classmethod
     def from_record(cls, record: dict) -> "Model":
@@ -83,4 +94,20 @@ class Model:
             associated_run_id=run_id,
             lifecycle_stage=record["lifecycle_stage"]
         )
+    
+    @classmethod
+    def from_records(cls, records: list[dict]) -> list["Model"]:
+        """Create Model instances from stored records in bulk.
+        
+        Faster than calling from_record per row: each record's values are
+        pulled with a single itemgetter call and passed positionally.
+        
+        Args:
+            records: Dictionaries keyed by the stored column names (``run_id``,
+                     not ``associated_run_id``).
+            
+        Returns:
+            list[Model]: The Model instances, in record order.
+        """
+        return [cls(*_get_field_values(record)) for record in records]
         
\ No newline at end of file
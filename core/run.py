@@ -1,5 +1,39 @@
+from dataclasses import dataclass, field
+from operator import attrgetter
 from typing import Optional
 from datetime import datetime
+
+# Every record key, in the order to_record emits them. The leading keys are
+# paired positionally with _get_record_values; the timestamps are serialized last.
+_RECORD_KEYS = ("dataset_id", "name", "actor", "parameters", "code_reference", "metrics", "start_time", "end_time")
+_get_record_values = attrgetter("dataset_id", "run_name", "actor", "parameters", "code_reference", "metrics")
+
+# Required attributes and the error raised when each is missing, in check order.
+_REQUIRED_FIELDS = (
+    ("dataset_id", "Dataset is required"),
+    ("actor", "Actor is required"),
+    ("run_name", "Run name is required"),
+)
+
+_from_iso = datetime.fromisoformat
+_from_timestamp = datetime.fromtimestamp
+
+
+def _parse_timestamp(value):
+    """Convert a stored timestamp (epoch number or ISO string) to a datetime.
+    
+    Values of any other type (e.g. datetimes, None) are returned unchanged.
+    """
+    if isinstance(value, str):
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return _from_iso(value)
+    if isinstance(value, (int, float)):
+        return _from_timestamp(value)
+    return value
+
+
+@dataclass(slots=True, eq=False)
 class Run:
     """Represents a single execution of a training attempt (experiment run).
     
@@ -10,42 +44,39 @@ class Run:
     
     Attributes:
         dataset_id: The identifier of the dataset used for this training run.
+        run_name: The name of this run.
         actor: The identity of who executed this run.
-        parameters: Dictionary of hyperparameters and configuration used.
+        parameters: Dictionary of hyperparameters and configuration used. Must be a plain
+                    dict; dict subclasses are rejected.
         code_reference: Optional reference to the code version (e.g., git commit hash).
         metrics: Dictionary of metrics recorded during the run (defaults to empty dict).
         start_time: Timestamp when the run started.
         end_time: Optional timestamp when the run ended.
+        RECORD_KEYS: The stored column names, in the order to_record emits them.
     """
-    def __init__(self, dataset_id: str, run_name: str, actor: str, parameters: dict, start_time: datetime, code_reference: str | None = None, metrics: dict | None = None, end_time: datetime | None = None) -> None:
-        """Initialize a Run instance.
+    RECORD_KEYS = _RECORD_KEYS
+    
+    dataset_id: str
+    run_name: str
+    actor: str
+    parameters: dict
+    start_time: datetime
+    code_reference: Optional[str] = None
+    metrics: Optional[dict] = field(default_factory=dict)
+    end_time: Optional[datetime] = None
+    
+    def __post_init__(self) -> None:
+        """Normalize and validate a newly initialized Run instance.
         
-        Args:
-            dataset_id: The identifier of the dataset used for this training run.
-            run_name: The name of this run.
-            actor: The identity of who executed this run.
-            parameters: Dictionary of hyperparameters and configuration parameters.
-            start_time: Timestamp when the run started.
-            code_reference: Optional reference to the code version (e.g., git commit hash).
-            metrics: Optional dictionary of metrics recorded during the run.
-                     If None, defaults to an empty dictionary.
-            end_time: Optional timestamp when the run ended.
+        Omitted metrics default to a fresh empty dictionary; an explicit None
+        is normalized the same way.
             
         Raises:
             ValueError: If required fields are missing, parameters is not a dict,
                        or end_time is before start_time.
         """
-        self.dataset_id = dataset_id
-        self.actor = actor
-        self.parameters = parameters
-        self.code_reference = code_reference
-        self.run_name = run_name
-        if metrics is None:
+        if self.metrics is None:
             self.metrics = {}
-        else:
-            self.metrics = metrics
-        self.start_time = start_time
-        self.end_time = end_time
         self._enforce_required_fields()
         
         
@@ -53,16 +84,14 @@ class Run:
         """Validate that all required fields are present and valid.
         
         Raises:
-            ValueError: If any required field is missing, parameters is not a dict,
-                       or end_time is before start_time.
+            ValueError: If any required field is missing, parameters is not exactly
+                       a dict, or end_time is before start_time.
         """
-        if not self.dataset_id:
-            raise ValueError("Dataset is required")
-        if not self.actor:
-            raise ValueError("Actor is required")
-        if not self.run_name:
-            raise ValueError("Run name is required")
-        if self.parameters is None or not isinstance(self.parameters, dict):
+        if not (self.dataset_id and self.actor and self.run_name):
+            for attr, message in _REQUIRED_FIELDS:
+                if not getattr(self, attr):
+                    raise ValueError(message)
+        if type(self.parameters) is not dict:
             raise ValueError("Parameters are required")
         if not self.start_time:
             raise ValueError("Start time is required")
@@ -70,23 +99,29 @@ class Run:
             raise ValueError("End time must be greater than start time")
     
     
-    def to_record(self) -> dict:
+    def to_record(self, start_time: Optional[str] = None) -> dict:
         """Convert the Run instance to a dictionary representation.
         
+        Keys are always emitted in the same order, so serialized records are
+        byte-stable across calls.
+        
+        Args:
+            start_time: Optional ISO timestamp emitted instead of the run's own
+                        start_time, which is then not serialized at all.
+        
         Returns:
             dict: Dictionary containing all run metadata.
         """
-        record = {
-            "dataset_id": self.dataset_id,
-            "name": self.run_name,
-            "actor": self.actor,
-            "parameters": self.parameters,
-            "code_reference": self.code_reference,
-            "metrics": self.metrics,
-            "start_time": self.start_time.isoformat() if isinstance(self.start_time, datetime) else self.start_time,
-            "end_time": self.end_time.isoformat() if self.end_time and isinstance(self.end_time, datetime) else self.end_time
-        }
-        return record
+        if start_time is None:
+            start_time = self.start_time
+            if isinstance(start_time, datetime):
+                start_time = start_time.isoformat()
+        end_time = self.end_time
+        return dict(zip(_RECORD_KEYS, (
+            *_get_record_values(self),
+            start_time,
+            end_time.isoformat() if end_time and isinstance(end_time, datetime) else end_time,
+        )))
     
     
     @classmethod
@@ -99,19 +134,11 @@ class Run:
         Returns:
             Run: A Run instance created from the record.
         """
-        from datetime import datetime
-        start_time = record["start_time"]
-        if isinstance(start_time, (int, float)):
-            start_time = datetime.fromtimestamp(start_time)
-        elif isinstance(start_time, str):
-            start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+        start_time = _parse_timestamp(record["start_time"])
         
         end_time = record.get("end_time")
         if end_time:
-            if isinstance(end_time, (int, float)):
-                end_time = datetime.fromtimestamp(end_time)
-            elif isinstance(end_time, str):
-                end_time = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+            end_time = _parse_timestamp(end_time)
         
         return cls(
             dataset_id=record["dataset_id"],
@@ -123,3 +150,46 @@ class Run:
             metrics=record.get("metrics"),
             end_time=end_time
         )
+    
+    
+    @classmethod
+    def from_trusted_record(cls, record: dict) -> "Run":
+        """Create a Run instance from a record read back from the metadata store.
+        
+        The store already enforces the required columns, so this skips
+        __init__ and validation; timestamps are still parsed. Use from_record
+        for untrusted input.
+        
+        Args:
+            record: Dictionary containing run fields, as returned by the database.
+            
+        Returns:
+            Run: A Run instance created from the record.
+        """
+        end_time = record.get("end_time")
+        
+        run = object.__new__(cls)
+        run.dataset_id = record["dataset_id"]
+        run.run_name = record.get("name") or record.get("run_name")
+        run.actor = record["actor"]
+        run.parameters = record["parameters"]
+        run.start_time = _parse_timestamp(record["start_time"])
+        run.code_reference = record.get("code_reference")
+        run.metrics = record.get("metrics") or {}
+        run.end_time = _parse_timestamp(end_time) if end_time else end_time
+        return run
+    
+    @classmethod
+    def from_trusted_records(cls, records: list[dict]) -> list["Run"]:
+        """Create Run instances from records read back from the metadata store, in bulk.
+        
+        Calls from_trusted_record per record, looking the method up once.
+        
+        Args:
+            records: Dictionaries containing run fields, as returned by the database.
+            
+        Returns:
+            list[Run]: The Run instances, in record order.
+        """
+        from_record = cls.from_trusted_record
+        return [from_record(record) for record in records]
@@ -0,0 +1,309 @@
+import asyncio
+from copy import copy
+from functools import cached_property
+from .async_db import AsyncDatabaseConnection
+from .dataset_repository import (
+    DatasetRepository,
+    _MISSING_NAME_VERSION_MESSAGE,
+    _collect_records,
+    _composite_key_filter,
+    _filter_pairs,
+    _split_cached,
+    _unique_pairs,
+)
+from core.dataset import Dataset
+from utils.cache import LRUCache
+from typing import Optional
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+
+class AsyncDatasetRepository:
+    """Asyncio counterpart of DatasetRepository.
+
+    Exposes the same operations as coroutines so callers can overlap dataset
+    round-trips with other work. Batch methods send their chunked requests
+    concurrently; the connection caps how many are in flight at once.
+
+    Attributes:
+        DATASET_TABLE: The name of the table where datasets are stored.
+        SELECT_FIELDS: The columns fetched when loading datasets.
+        BATCH_QUERY_CHUNK_SIZE: Maximum number of keys per batch query, to stay below URL length limits.
+        CACHE_MAXSIZE: Maximum number of datasets kept in the get_dataset cache.
+        GET_BY_KEYS_FUNCTION: Database function used by batch_get to join keys server-side.
+        UNDEFINED_FUNCTION_CODE: PostgREST error code returned when a database function does not exist.
+        db_connection: The async database connection instance.
+    """
+
+    DATASET_TABLE = DatasetRepository.DATASET_TABLE
+    SELECT_FIELDS = DatasetRepository.SELECT_FIELDS
+    _SELECT_COLUMNS = DatasetRepository._SELECT_COLUMNS
+    BATCH_QUERY_CHUNK_SIZE = DatasetRepository.BATCH_QUERY_CHUNK_SIZE
+    CACHE_MAXSIZE = DatasetRepository.CACHE_MAXSIZE
+    GET_BY_KEYS_FUNCTION = DatasetRepository.GET_BY_KEYS_FUNCTION
+    UNDEFINED_FUNCTION_CODE = DatasetRepository.UNDEFINED_FUNCTION_CODE
+
+    def __init__(self, db_connection: AsyncDatabaseConnection, cache: bool = True):
+        """Initialize an AsyncDatasetRepository instance.
+
+        Args:
+            db_connection: An AsyncDatabaseConnection instance for database operations.
+            cache: Whether get_dataset results are cached in-process.
+        """
+        self.db_connection = db_connection
+        self._cache: Optional[LRUCache] = LRUCache(self.CACHE_MAXSIZE) if cache else None
+        # Set once batch_get finds its database function missing, so later calls skip the probe
+        self._get_by_keys_function_missing = False
+
+    @cached_property
+    def _table(self):
+        """Query builder for the dataset table, created once per repository.
+
+        Each select/update/delete call on the builder starts a fresh request,
+        so the builder itself can be reused across queries.
+        """
+        return self.db_connection.table(self.DATASET_TABLE)
+
+    async def add_dataset(self, dataset: Dataset) -> None:
+        """Add a new dataset to the storage system.
+
+        Args:
+            dataset: The Dataset instance to add to storage.
+
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        await self.db_connection.insert(self.DATASET_TABLE, dataset.to_record())
+        self._invalidate(dataset.name, dataset.version)
+
+    async def get_dataset(self, name: str, version: str) -> Optional[Dataset]:
+        """Retrieve a dataset by name and version.
+
+        Args:
+            name: The name of the dataset.
+            version: The version of the dataset.
+
+        Returns:
+            Optional[Dataset]: The retrieved dataset or None if not found.
+
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        if self._cache is not None:
+            cached = self._cache.get((name, version))
+            if cached is not None:
+                return copy(cached)
+
+        query = (
+            self._table
+            .select(self._SELECT_COLUMNS)
+            .eq("name", name)
+            .eq("version", version))
+        try:
+            response = await self.db_connection.execute(query)
+        except Exception as e:
+            raise RuntimeError(f"Error retrieving dataset: {str(e)}")
+
+        if not response.data:
+            return None
+
+        dataset = Dataset.from_trusted_record(response.data[0])
+        if self._cache is not None:
+            self._cache.put((name, version), copy(dataset))
+        return dataset
+
+    async def get_dataset_id(self, name: str, version: str) -> Optional[str]:
+        """Get the UUID of a dataset by name and version.
+
+        Args:
+            name: The name of the dataset.
+            version: The version of the dataset.
+
+        Returns:
+            Optional[str]: The UUID of the dataset, or None if not found.
+
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        query = (
+            self._table
+            .select("dataset_id")
+            .eq("name", name)
+            .eq("version", version))
+        try:
+            response = await self.db_connection.execute(query)
+        except APIError as e:
+            raise RuntimeError(f"Error retrieving dataset ID: {e.message}")
+
+        if not response.data:
+            return None
+
+        return response.data[0].get("dataset_id")
+
+    async def delete_dataset(self, name: str, version: str) -> int:
+        """Delete a dataset by name and version.
+
+        The server is asked for the deleted row count only, not the deleted rows.
+
+        Args:
+            name: The name of the dataset to delete.
+            version: The version of the dataset to delete.
+
+        Returns:
+            int: The number of records deleted (typically 0 or 1).
+
+        Raises:
+            ValueError: If name or version is empty or None.
+            RuntimeError: If the database operation fails.
+        """
+        if not name or not version:
+            raise ValueError(_MISSING_NAME_VERSION_MESSAGE)
+
+        query = (
+            self._table
+            .delete(count="exact", returning=ReturnMethod.minimal)
+            .eq("name", name)
+            .eq("version", version))
+        try:
+            response = await self.db_connection.execute(query)
+        except Exception as e:
+            raise RuntimeError(f"Error deleting dataset: {str(e)}")
+
+        self._invalidate(name, version)
+        return response.count or 0
+
+    async def batch_get(self, names_versions: list[tuple[str, str]]) -> tuple[list[Dataset], int]:
+        """Retrieve multiple datasets by their names and versions.
+
+        Uses the ``get_datasets_by_keys`` database function when installed;
+        otherwise the chunked queries are sent concurrently. With caching
+        enabled, cached pairs are not requested and fetched datasets are cached.
+
+        Args:
+            names_versions: A list of tuples containing (name, version) pairs.
+
+        Returns:
+            tuple[list[Dataset], int]: A tuple containing:
+                - List of retrieved Dataset instances, in request order (empty entries are skipped)
+                - Count of successfully retrieved datasets
+
+        Raises:
+            RuntimeError: If any database operation fails.
+        """
+        pairs = _unique_pairs(names_versions)
+        if not pairs:
+            return ([], 0)
+
+        found, missing = _split_cached(self._cache, pairs)
+        if missing:
+            records = None
+            if not self._get_by_keys_function_missing:
+                keys = [{"name": name, "version": version} for name, version in missing]
+                try:
+                    response = await self.db_connection.execute(
+                        self.db_connection.rpc(self.GET_BY_KEYS_FUNCTION, {"keys": keys})
+                    )
+                except APIError as e:
+                    if e.code != self.UNDEFINED_FUNCTION_CODE:
+                        raise RuntimeError(f"Error retrieving dataset: {e.message}")
+                    self._get_by_keys_function_missing = True
+                except Exception as e:
+                    raise RuntimeError(f"Error retrieving dataset: {str(e)}")
+                else:
+                    records = response.data or []
+            if records is None:
+                records = await self._select_by_pairs(missing)
+            _collect_records(self._cache, records, missing, found)
+
+        datasets = [found[pair] for pair in pairs if pair in found]
+        return (datasets, len(datasets))
+
+    async def _select_by_pairs(self, pairs: list[tuple[str, str]]) -> list[dict]:
+        """Fetch dataset records for (name, version) pairs using one concurrent query per chunk.
+
+        Each chunk is matched exactly (see ``_filter_pairs``), so only
+        requested pairs are returned.
+
+        Raises:
+            RuntimeError: If any database operation fails.
+        """
+        async def select_chunk(chunk: list[tuple[str, str]]) -> list[dict]:
+            query = _filter_pairs(self._table.select(self._SELECT_COLUMNS), chunk)
+            try:
+                response = await self.db_connection.execute(query)
+            except Exception as e:
+                raise RuntimeError(f"Error retrieving dataset: {str(e)}")
+            return response.data or []
+
+        results = await asyncio.gather(*(
+            select_chunk(pairs[start:start + self.BATCH_QUERY_CHUNK_SIZE])
+            for start in range(0, len(pairs), self.BATCH_QUERY_CHUNK_SIZE)
+        ))
+        return [record for chunk in results for record in chunk]
+
+    async def batch_create(self, datasets: list[Dataset]) -> None:
+        """Add multiple datasets to the storage system in a batch operation.
+
+        Inserted rows are not echoed back, since nothing reads them.
+
+        Args:
+            datasets: A list of Dataset instances to add to storage.
+                      Empty entries (None) are skipped.
+
+        Raises:
+            RuntimeError: If any database operation fails.
+        """
+        records = [dataset.to_record() for dataset in datasets if dataset]
+        if not records:
+            return
+        await self.db_connection.bulk_insert(self.DATASET_TABLE, records, returning=ReturnMethod.minimal)
+        for record in records:
+            self._invalidate(record["name"], record["version"])
+
+    async def batch_delete(self, name_versions: list[tuple[str, str]]) -> int:
+        """Delete multiple datasets by their names and versions in a batch operation.
+
+        Chunks of exact (name, version) matches are deleted concurrently; only
+        the deleted row counts are sent back.
+
+        Args:
+            name_versions: A list of tuples containing (name, version) pairs.
+                          Invalid entries (empty name or version) are skipped.
+
+        Returns:
+            int: Total number of datasets deleted across all operations.
+
+        Raises:
+            RuntimeError: If any database operation fails.
+        """
+        async def delete_chunk(chunk: list[tuple[str, str]]) -> int:
+            query = (
+                self._table
+                .delete(count="exact", returning=ReturnMethod.minimal)
+                .or_(_composite_key_filter(chunk)))
+            try:
+                response = await self.db_connection.execute(query)
+            except APIError as e:
+                raise RuntimeError(f"Error deleting dataset: {e.message}")
+            except Exception as e:
+                raise RuntimeError(f"Error deleting dataset: {str(e)}")
+            return response.count or 0
+
+        pairs = _unique_pairs(name_versions)
+        if not pairs:
+            return 0
+        try:
+            deleted_counts = await asyncio.gather(*(
+                delete_chunk(pairs[start:start + self.BATCH_QUERY_CHUNK_SIZE])
+                for start in range(0, len(pairs), self.BATCH_QUERY_CHUNK_SIZE)
+            ))
+        finally:
+            # Evict every pair, even after a failure: the server may have committed a failed chunk
+            for name, version in pairs:
+                self._invalidate(name, version)
+        return sum(deleted_counts)
+
+    def _invalidate(self, name: str, version: str) -> None:
+        """Drop a (name, version) pair from the get_dataset cache, if caching is enabled."""
+        if self._cache is not None:
+            self._cache.pop((name, version))
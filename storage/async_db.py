@@ -0,0 +1,194 @@
+import asyncio
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+import httpx
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+from .db import SUPABASE_URL, SUPABASE_KEY, BULK_CHUNK_SIZE, HTTP_TIMEOUT, OrjsonRequestMixin, http_pool_limits, orjson
+
+# Upper bound on requests one connection keeps in flight at once.
+MAX_CONCURRENT_REQUESTS = 32
+# Lower bound for bulk insert chunks: concurrent writes contend for locks and
+# WAL on the server, so throughput drops well before the read limit.
+MAX_CONCURRENT_WRITES = 8
+
+
+class AsyncOrjsonClient(OrjsonRequestMixin, httpx.AsyncClient):
+    """Asynchronous httpx client using orjson for request bodies."""
+
+
+class AsyncDatabaseConnection:
+    """Wrapper around the async Supabase client for database operations.
+
+    Mirrors DatabaseConnection for asyncio callers. Queries are awaited through
+    execute(), which caps the number of requests in flight so fanned-out
+    batch operations overlap their round-trips without overwhelming the server.
+    Bulk insert chunks are additionally held to a smaller write limit.
+
+    Attributes:
+        client: The underlying async Supabase client instance.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncClient",
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        max_concurrent_writes: int = MAX_CONCURRENT_WRITES,
+    ):
+        """Initialize AsyncDatabaseConnection with an async Supabase client.
+
+        Args:
+            client: A Supabase AsyncClient instance.
+            max_concurrency: Maximum number of requests awaited concurrently.
+            max_concurrent_writes: Maximum number of bulk insert chunks in flight at once.
+        """
+        self.client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._write_semaphore = asyncio.Semaphore(max_concurrent_writes)
+
+    async def execute(self, query):
+        """Await a query builder's execute() within the concurrency limit.
+
+        Args:
+            query: An async Supabase query builder.
+
+        Returns:
+            The API response of the query.
+        """
+        async with self._semaphore:
+            return await query.execute()
+
+    async def insert(self, table: str, record: dict) -> dict:
+        """Insert a record into the specified table.
+
+        Args:
+            table: The name of the table to insert into.
+            record: Dictionary containing the record data.
+
+        Returns:
+            dict: The inserted record with generated fields (e.g., UUIDs).
+
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        try:
+            response = await self.execute(self.client.table(table).insert(record))
+            if response.data and len(response.data) > 0:
+                return response.data[0]
+            return record
+        except APIError as e:
+            raise RuntimeError(f"Failed to insert into {table}: {e.message}")
+
+    async def bulk_insert(
+        self,
+        table: str,
+        records: list[dict],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        returning: ReturnMethod = ReturnMethod.representation,
+    ) -> list[dict]:
+        """Insert many records into the specified table, sending chunks concurrently.
+
+        At most ``max_concurrent_writes`` chunks are in flight at once.
+
+        Args:
+            table: The name of the table to insert into.
+            records: List of dictionaries containing the record data.
+            chunk_size: Maximum number of rows sent per request.
+            returning: ``ReturnMethod.minimal`` stops the server from echoing the
+                       inserted rows back, for loads that don't need generated fields.
+
+        Returns:
+            list[dict]: The inserted records with generated fields (e.g., UUIDs),
+                        or the records as sent when ``returning`` is minimal.
+
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        async def insert_chunk(start: int) -> list[dict]:
+            chunk = records[start:start + chunk_size]
+            try:
+                async with self._write_semaphore:
+                    response = await self.execute(self.client.table(table).insert(chunk, returning=returning))
+            except APIError as e:
+                raise RuntimeError(
+                    f"Failed to insert into {table} (rows {start}-{start + len(chunk) - 1}): {e.message}"
+                )
+            return response.data or chunk
+
+        results = await asyncio.gather(*(
+            insert_chunk(start)
+            for start in range(0, len(records), chunk_size)
+        ))
+        return [record for chunk in results for record in chunk]
+
+    def rpc(self, function: str, params: dict):
+        """Get a query builder that calls a Postgres function.
+
+        Args:
+            function: The name of the database function.
+            params: Dictionary of named arguments passed to the function.
+
+        Returns:
+            The Supabase RPC query builder.
+        """
+        return self.client.rpc(function, params)
+
+    def table(self, table: str):
+        """Get a query builder for the specified table.
+
+        Args:
+            table: The name of the table.
+
+        Returns:
+            The Supabase table query builder.
+        """
+        return self.client.table(table)
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client used by the Supabase client, if any."""
+        http_client = getattr(getattr(self.client, "options", None), "httpx_client", None)
+        if http_client is not None:
+            await http_client.aclose()
+
+    async def __aenter__(self) -> "AsyncDatabaseConnection":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+
+def create_async_http_client() -> httpx.AsyncClient:
+    """Create the pooled async HTTP client shared by all queries on a connection.
+
+    HTTP/2 is enabled when the optional ``h2`` package is installed, letting
+    concurrent requests share one connection. Request bodies are encoded with
+    ``orjson`` when it is installed. Timeout and redirect handling match the
+    sync client.
+
+    Returns:
+        httpx.AsyncClient: A keep-alive async HTTP client.
+    """
+    client_class = AsyncOrjsonClient if orjson is not None else httpx.AsyncClient
+    return client_class(
+        http2=find_spec("h2") is not None,
+        limits=http_pool_limits(),
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+    )
+
+
+async def connect_to_supabase_async() -> "AsyncClient":
+    """Establish an async connection to the database.
+
+    Returns:
+        AsyncClient: An instance of the async Supabase client connected to the database.
+    """
+    if not SUPABASE_URL or not SUPABASE_KEY: # fail fast if env vars are not set
+        raise RuntimeError("Supabase credentials are not set in environment variables")
+    from supabase import acreate_client, AsyncClientOptions
+    options = AsyncClientOptions(httpx_client=create_async_http_client())
+    return await acreate_client(SUPABASE_URL, SUPABASE_KEY, options=options)
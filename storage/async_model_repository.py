@@ -0,0 +1,159 @@
+import asyncio
+from functools import cached_property
+from .async_db import AsyncDatabaseConnection
+from .model_repository import ModelRepository, _unique_names
+from core.model import Model
+from typing import Optional
+
+
+class AsyncModelRepository:
+    """Asyncio counterpart of ModelRepository's read operations.
+
+    Lets callers overlap independent model lookups (e.g. several get_model or
+    get_artifact_uri calls) with asyncio.gather. Batch lookups send their
+    chunked queries concurrently; the connection caps how many are in flight.
+
+    Attributes:
+        MODEL_TABLE: The name of the table where models are stored.
+        SELECT_FIELDS: The columns fetched when loading models.
+        BATCH_QUERY_CHUNK_SIZE: Maximum number of names per batch query, to stay below URL length limits.
+        db_connection: The async database connection instance.
+    """
+
+    MODEL_TABLE = ModelRepository.MODEL_TABLE
+    SELECT_FIELDS = ModelRepository.SELECT_FIELDS
+    _SELECT_COLUMNS = ModelRepository._SELECT_COLUMNS
+    BATCH_QUERY_CHUNK_SIZE = ModelRepository.BATCH_QUERY_CHUNK_SIZE
+
+    def __init__(self, db_connection: AsyncDatabaseConnection):
+        """Initialize an AsyncModelRepository instance.
+
+        Args:
+            db_connection: An AsyncDatabaseConnection instance for database operations.
+        """
+        self.db_connection = db_connection
+
+    @cached_property
+    def _table(self):
+        """Query builder for the model table, created once per repository.
+
+        Each select/update/delete call on the builder starts a fresh request,
+        so the builder itself can be reused across queries.
+        """
+        return self.db_connection.table(self.MODEL_TABLE)
+
+    async def get_model(self, model_name: str) -> Optional[Model]:
+        """Retrieve a model by its name.
+
+        Args:
+            model_name: The name of the model to retrieve.
+
+        Returns:
+            Optional[Model]: The retrieved model or None if not found.
+
+        Raises:
+            ValueError: If model_name is empty or None.
+            RuntimeError: If the database operation fails.
+        """
+        if not model_name:
+            raise ValueError("Model name is required")
+        query = self._table.select(self._SELECT_COLUMNS).eq("model_name", model_name)
+        try:
+            response = await self.db_connection.execute(query)
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve model: {str(e)}")
+
+        if not response.data:
+            return None
+        return Model.from_record(response.data[0])
+
+    async def get_artifact_uri(self, model_name: str) -> Optional[str]:
+        """Get the artifact URI for a model by its name.
+
+        Args:
+            model_name: The name of the model.
+
+        Returns:
+            Optional[str]: The artifact URI of the model, or None if the model is not found.
+
+        Raises:
+            ValueError: If model_name is empty or None.
+            RuntimeError: If the database operation fails.
+        """
+        model = await self.get_model(model_name)
+        if model is None:
+            return None
+        return model.artifact_uri
+
+    async def model_exists(self, model_name: str) -> bool:
+        """Check if a model exists in the storage system.
+
+        Args:
+            model_name: The name of the model to check.
+
+        Returns:
+            bool: True if the model exists, False otherwise.
+
+        Raises:
+            ValueError: If model_name is empty or None.
+            RuntimeError: If the database operation fails.
+        """
+        if not model_name:
+            raise ValueError("Model name is required")
+        query = (
+            self._table
+            .select("model_name", head=True, count="exact")
+            .eq("model_name", model_name))
+        try:
+            response = await self.db_connection.execute(query)
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve model: {str(e)}")
+        return (response.count or 0) > 0
+
+    async def list_models(self) -> list[Model]:
+        """List all models in the storage system.
+
+        Returns:
+            list[Model]: A list of all Model instances in the database.
+
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        try:
+            response = await self.db_connection.execute(self._table.select(self._SELECT_COLUMNS))
+        except Exception as e:
+            raise RuntimeError(f"Failed to list models: {str(e)}")
+        return Model.from_records(response.data)
+
+    async def batch_get(self, model_names: list[str]) -> list[Model]:
+        """Retrieve multiple models by their names.
+
+        Args:
+            model_names: A list of model names to retrieve.
+                        Invalid entries (empty names) and duplicates are skipped.
+
+        Returns:
+            list[Model]: List of retrieved Model instances, in request order (skips models that are not found).
+
+        Raises:
+            ValueError: If any model name is not a string.
+            RuntimeError: If any database operation fails.
+        """
+        if not model_names:
+            return []
+        names = _unique_names(model_names)
+
+        async def select_chunk(chunk: list[str]) -> list[dict]:
+            query = self._table.select(self._SELECT_COLUMNS).in_("model_name", chunk)
+            try:
+                response = await self.db_connection.execute(query)
+            except Exception as e:
+                raise RuntimeError(f"Failed to retrieve model: {str(e)}")
+            return response.data or []
+
+        results = await asyncio.gather(*(
+            select_chunk(names[start:start + self.BATCH_QUERY_CHUNK_SIZE])
+            for start in range(0, len(names), self.BATCH_QUERY_CHUNK_SIZE)
+        ))
+        by_name = {record["model_name"]: record for chunk in results for record in chunk}
+        return [Model.from_record(by_name[name]) for name in names if name in by_name]
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+from functools import cached_property
+from .async_db import AsyncDatabaseConnection
+from .run_repository import RunRepository, _utc_now_iso
+from core.run import Run
+from utils.cache import LRUCache
+from typing import Optional
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRunRepository:
+    """Asyncio counterpart of RunRepository's create and read operations.
+
+    Lets callers overlap independent run lookups with asyncio.gather. Batch
+    lookups send their chunked queries concurrently; the connection caps how
+    many are in flight.
+
+    Attributes:
+        RUN_TABLE: The name of the table where runs are stored.
+        SELECT_FIELDS: The columns fetched when loading runs.
+        BATCH_QUERY_CHUNK_SIZE: Maximum number of names per batch query, to stay below URL length limits.
+        CACHE_MAXSIZE: Maximum number of run IDs kept in the get_run_id cache.
+        db_connection: The async database connection instance.
+    """
+
+    RUN_TABLE = RunRepository.RUN_TABLE
+    SELECT_FIELDS = RunRepository.SELECT_FIELDS
+    _SELECT_COLUMNS = RunRepository._SELECT_COLUMNS
+    BATCH_QUERY_CHUNK_SIZE = RunRepository.BATCH_QUERY_CHUNK_SIZE
+    CACHE_MAXSIZE = RunRepository.CACHE_MAXSIZE
+
+    def __init__(self, db_connection: AsyncDatabaseConnection, cache: bool = True):
+        """Initialize an AsyncRunRepository instance.
+
+        Args:
+            db_connection: An AsyncDatabaseConnection instance for database operations.
+            cache: Whether get_run_id results are cached in-process.
+        """
+        self.db_connection = db_connection
+        self._id_cache: Optional[LRUCache] = LRUCache(self.CACHE_MAXSIZE) if cache else None
+
+    @cached_property
+    def _table(self):
+        """Query builder for the run table, created once per repository.
+
+        Each select/update/delete call on the builder starts a fresh request,
+        so the builder itself can be reused across queries.
+        """
+        return self.db_connection.table(self.RUN_TABLE)
+
+    async def add_run(self, run: Run) -> Optional[str]:
+        """Add a new run to the storage system.
+
+        The start_time in the record is overwritten with the current timestamp.
+
+        Args:
+            run: The Run instance to add to storage.
+
+        Returns:
+            Optional[str]: The UUID of the new run, or None if the server did not return it.
+
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        record = RunRepository._to_insert_record(run, _utc_now_iso())
+        try:
+            inserted = await self.db_connection.insert(self.RUN_TABLE, record)
+        except Exception as e:
+            raise RuntimeError(f"Failed to add run: {str(e)}")
+
+        run_id = inserted.get("run_id")
+        if self._id_cache is not None and run_id is not None and run.run_name:
+            self._id_cache.put(run.run_name, run_id)
+        return run_id
+
+    async def get_run(self, run_name: str) -> Optional[Run]:
+        """Retrieve a run by its name.
+
+        Args:
+            run_name: The name of the run to retrieve.
+
+        Returns:
+            Optional[Run]: The retrieved run or None if not found.
+
+        Raises:
+            ValueError: If run_name is empty or None.
+            RuntimeError: If the database operation fails.
+        """
+        if not run_name:
+            raise ValueError("Run name is required to retrieve a run")
+
+        query = (
+            self._table
+            .select(self._SELECT_COLUMNS)
+            .eq("name", run_name)
+            .limit(1))
+        try:
+            response = await self.db_connection.execute(query)
+        except Exception as e:
+            raise RuntimeError(f"Error retrieving run: {str(e)}")
+        if not response.data:
+            return None
+        return Run.from_trusted_record(response.data[0])
+
+    async def get_run_id(self, name: str) -> Optional[str]:
+        """Get the UUID of a run by its name.
+
+        Args:
+            name: The name of the run.
+
+        Returns:
+            Optional[str]: The UUID of the run, or None if not found.
+
+        Raises:
+            ValueError: If name is empty or None.
+            RuntimeError: If the database operation fails.
+        """
+        if not name:
+            raise ValueError("Run name is required to retrieve a run ID")
+        if self._id_cache is not None:
+            cached = self._id_cache.get(name)
+            if cached is not None:
+                return cached
+
+        query = (
+            self._table
+            .select("run_id")
+            .eq("name", name)
+            .limit(1))
+        try:
+            response = await self.db_connection.execute(query)
+        except APIError as e:
+            raise RuntimeError(f"Error retrieving run ID: {str(e)}")
+
+        if not response.data:
+            return None
+
+        run_id = response.data[0]["run_id"]
+        if self._id_cache is not None and run_id is not None:
+            self._id_cache.put(name, run_id)
+        return run_id
+
+    async def get_many(self, run_names: list[str]) -> dict[str, Optional[Run]]:
+        """Retrieve several runs by name with all lookups in flight at once.
+
+        Each name is fetched by its own get_run query, issued concurrently so
+        the round-trips overlap (and share one HTTP/2 connection when ``h2``
+        is installed). Prefer batch_get for large lists; this suits a handful
+        of names whose lookups should not wait on each other.
+
+        Args:
+            run_names: The names of the runs to retrieve. Duplicates are fetched once.
+
+        Returns:
+            dict[str, Optional[Run]]: Each requested name mapped to its run, or None if not found.
+
+        Raises:
+            ValueError: If any run name is empty or None.
+            RuntimeError: If any database operation fails.
+        """
+        names = list(dict.fromkeys(run_names))
+        runs = await asyncio.gather(*(self.get_run(name) for name in names))
+        return dict(zip(names, runs))
+
+    async def batch_get(self, run_names: list[str], *, strict: bool = False) -> tuple[list[Run], int]:
+        """Retrieve multiple runs by their names.
+
+        Args:
+            run_names: A list of run names to retrieve.
+                       Empty names and duplicates are skipped.
+            strict: Raise if any chunk query fails instead of skipping it.
+
+        Returns:
+            tuple[list[Run], int]: A tuple containing:
+                - List of retrieved Run instances, in request order (skips runs that cause errors)
+                - Count of successfully retrieved runs
+
+        Raises:
+            RuntimeError: If strict is set and a chunk query fails.
+
+        Note:
+            Unless strict is set, a failed chunk query is logged and its runs
+            are skipped rather than failing the entire batch operation.
+        """
+        names = list(dict.fromkeys(name for name in run_names or [] if name))
+        if not names:
+            return [], 0
+
+        async def select_chunk(chunk: list[str]) -> list[dict]:
+            query = self._table.select(self._SELECT_COLUMNS).in_("name", chunk)
+            try:
+                response = await self.db_connection.execute(query)
+            except Exception as e:
+                if strict:
+                    raise RuntimeError(f"Error retrieving runs: {str(e)}")
+                # Don't want to fail the whole batch, just skip this chunk
+                logger.warning("Skipping %d runs after a failed batch query: %s", len(chunk), e)
+                return []
+            return response.data or []
+
+        results = await asyncio.gather(*(
+            select_chunk(names[start:start + self.BATCH_QUERY_CHUNK_SIZE])
+            for start in range(0, len(names), self.BATCH_QUERY_CHUNK_SIZE)
+        ))
+        by_name = {record.get("name") or record.get("run_name"): record for chunk in results for record in chunk}
+        collected_runs = Run.from_trusted_records([by_name[name] for name in names if name in by_name])
+        return collected_runs, len(collected_runs)
+
+    async def batch_create(self, runs: list[Run]) -> None:
+        """Add multiple runs to the storage system in a batch operation.
+
+        All records are stamped with the same start_time; the connection sends
+        their insert chunks concurrently. Inserted rows are not echoed back,
+        since nothing reads them.
+
+        Args:
+            runs: A list of Run instances to add to storage.
+                  Invalid entries (runs without run_name) are skipped.
+
+        Raises:
+            RuntimeError: If any database operation fails.
+        """
+        start_time = _utc_now_iso()
+        records = [RunRepository._to_insert_record(run, start_time) for run in runs if run.run_name]
+        if not records:
+            return
+        try:
+            await self.db_connection.bulk_insert(self.RUN_TABLE, records, returning=ReturnMethod.minimal)
+        except Exception as e:
+            raise RuntimeError(f"Failed to add runs: {str(e)}")
@@ -1,7 +1,99 @@
-from .db import DatabaseConnection
+from copy import copy
+from functools import cached_property
+from itertools import islice
+from .db import BULK_CHUNK_SIZE, DatabaseConnection, quote_filter_value
 from core.dataset import Dataset
-from typing import Optional, Tuple
+from utils.cache import LRUCache
+from utils.concurrency import map_chunks
+from typing import Iterable, Iterator, Optional, Tuple
 from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+# Shared by the sync and async delete_dataset so both raise the same message.
+_MISSING_NAME_VERSION_MESSAGE = "Both name and version are required to delete a dataset."
+
+
+def _unique_pairs(names_versions: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Drop invalid (empty name or version) and duplicate pairs, keeping request order."""
+    return list(dict.fromkeys(
+        (name, version) for name, version in names_versions if name and version
+    ))
+
+
+def _composite_key_filter(pairs: list[tuple[str, str]]) -> str:
+    """Build a PostgREST ``or`` filter matching exact (name, version) pairs.
+    
+    Values are double-quoted so reserved characters (commas, dots,
+    parentheses) in names or versions do not break the filter.
+    
+    Args:
+        pairs: A list of (name, version) tuples.
+        
+    Returns:
+        str: A filter expression suitable for ``.or_()``.
+    """
+    return ",".join(
+        f"and(name.eq.{quote_filter_value(name)},version.eq.{quote_filter_value(version)})"
+        for name, version in pairs
+    )
+
+
+def _filter_pairs(query, pairs: list[tuple[str, str]]):
+    """Restrict a query to exactly the given (name, version) pairs.
+    
+    When the pairs form a full grid (e.g. one name with several versions), two
+    ``IN`` filters match exactly those pairs and keep the URL short; otherwise
+    the exact ``or`` filter is used so no unrequested rows come back.
+    
+    Args:
+        query: The query builder to filter.
+        pairs: A list of deduplicated (name, version) tuples.
+        
+    Returns:
+        The filtered query builder.
+    """
+    names = list(dict.fromkeys(name for name, _ in pairs))
+    versions = list(dict.fromkeys(version for _, version in pairs))
+    if len(names) * len(versions) == len(pairs):
+        return query.in_("name", names).in_("version", versions)
+    return query.or_(_composite_key_filter(pairs))
+
+
+def _split_cached(cache: Optional[LRUCache], pairs: list[tuple[str, str]]) -> tuple[dict, list[tuple[str, str]]]:
+    """Split pairs into datasets already in the get_dataset cache and pairs still to fetch.
+    
+    Args:
+        cache: The get_dataset cache, or None when caching is disabled.
+        pairs: A list of deduplicated (name, version) tuples.
+        
+    Returns:
+        tuple[dict, list[tuple[str, str]]]: Copies of the cached datasets keyed by pair, and the uncached pairs in order.
+    """
+    if cache is None:
+        return {}, pairs
+    found = {}
+    for pair in pairs:
+        cached = cache.get(pair)
+        if cached is not None:
+            found[pair] = copy(cached)
+    return found, [pair for pair in pairs if pair not in found]
+
+
+def _collect_records(cache: Optional[LRUCache], records: list[dict], pairs: list[tuple[str, str]], found: dict) -> None:
+    """Build datasets for the requested pairs from fetched records.
+    
+    Each dataset is added to ``found`` under its pair and, when caching is
+    enabled, a copy of it to the get_dataset cache. Records for other pairs
+    are ignored.
+    """
+    by_key = {(record["name"], record["version"]): record for record in records}
+    for pair in pairs:
+        if pair in by_key:
+            dataset = Dataset.from_trusted_record(by_key[pair])
+            found[pair] = dataset
+            if cache is not None:
+                cache.put(pair, copy(dataset))
+
 
 class DatasetRepository:
     """Repository for managing datasets in the storage system.
@@ -10,21 +102,53 @@ class DatasetRepository:
     from the persistent storage. It abstracts database operations and provides
     a clean interface for dataset management operations.
     
+    All lookups filter on (name, version) together and rely on the composite
+    index defined in ``storage/sql/dataset_name_version_idx.sql``.
+    
     Attributes:
         DATASET_TABLE: The name of the table where datasets are stored.
+        SELECT_FIELDS: The columns fetched when loading datasets (Dataset.RECORD_KEYS, what Dataset.from_record reads).
+        BATCH_QUERY_CHUNK_SIZE: Maximum number of keys per batch query, to stay below URL length limits.
+        CACHE_MAXSIZE: Maximum number of entries kept in each lookup cache.
+        GET_BY_KEYS_FUNCTION: Database function used by batch_get to join keys server-side.
+        UNDEFINED_FUNCTION_CODE: PostgREST error code returned when a database function does not exist.
+        MAX_PARALLEL_QUERIES: Maximum number of chunk queries a batch method sends at once (1 disables threading).
         db_connection: The database connection instance.
     """
     
     
     DATASET_TABLE = "Dataset"
+    SELECT_FIELDS = Dataset.RECORD_KEYS
+    _SELECT_COLUMNS = ",".join(SELECT_FIELDS)
+    BATCH_QUERY_CHUNK_SIZE = 200
+    CACHE_MAXSIZE = 1024
+    GET_BY_KEYS_FUNCTION = "get_datasets_by_keys"
+    UNDEFINED_FUNCTION_CODE = "PGRST202"
+    MAX_PARALLEL_QUERIES = 8
     
-    def __init__(self, db_connection: DatabaseConnection):
+    def __init__(self, db_connection: DatabaseConnection, cache: bool = True):
         """Initialize a DatasetRepository instance.
         
         Args:
             db_connection: A DatabaseConnection instance for database operations.
+            cache: Whether get_dataset and get_dataset_id results are cached in-process.
+                   A (name, version) pair identifies an immutable dataset, so hits
+                   skip the database.
         """
         self.db_connection = db_connection
+        self._cache: Optional[LRUCache] = LRUCache(self.CACHE_MAXSIZE) if cache else None
+        self._id_cache: Optional[LRUCache] = LRUCache(self.CACHE_MAXSIZE) if cache else None
+        # Set once batch_get finds its database function missing, so later calls skip the probe
+        self._get_by_keys_function_missing = False
+    
+    @cached_property
+    def _table(self):
+        """Query builder for the dataset table, created once per repository.
+        
+        Each select/delete call on the builder starts a fresh request, so the
+        builder itself can be reused across queries.
+        """
+        return self.db_connection.table(self.DATASET_TABLE)
     
     def add_dataset(self, dataset: Dataset) -> None:
         """Add a new dataset to the storage system.
@@ -39,11 +163,15 @@ class DatasetRepository:
         """
         record = dataset.to_record()
         self.db_connection.insert(self.DATASET_TABLE, record)
+        self._invalidate(dataset.name, dataset.version)
     
     
     def get_dataset(self, name: str, version: str) -> Optional[Dataset]:
         """Retrieve a dataset by name and version.
 
+        Found datasets are served from the in-process cache when enabled;
+        callers get their own copy of a cached dataset.
+
         Args:
             name: The name of the dataset.
             version: The version of the dataset.
@@ -54,11 +182,15 @@ class DatasetRepository:
         Raises:
             RuntimeError: If the database operation fails.
         """
+        if self._cache is not None:
+            cached = self._cache.get((name, version))
+            if cached is not None:
+                return copy(cached)
+        
         try:
             response = (
-                self.db_connection
-                .table(self.DATASET_TABLE)
-                .select("*")
+                self._table
+                .select(self._SELECT_COLUMNS)
                 .eq("name", name)
                 .eq("version", version)
                 .execute())
@@ -69,13 +201,17 @@ class DatasetRepository:
             return None
                 
         record = response.data[0]
-        return Dataset.from_record(record)
+        dataset = Dataset.from_trusted_record(record)
+        if self._cache is not None:
+            self._cache.put((name, version), copy(dataset))
+        return dataset
     
     def get_dataset_id(self, name: str, version: str) -> Optional[str]:
         """Get the UUID of a dataset by name and version.
         
         This is useful when you need the dataset UUID for creating related entities
-        (e.g., creating a Run that uses this dataset).
+        (e.g., creating a Run that uses this dataset). Found IDs are served from
+        the in-process cache when enabled.
         
         Args:
             name: The name of the dataset.
@@ -87,10 +223,14 @@ class DatasetRepository:
         Raises:
             RuntimeError: If the database operation fails.
         """
+        if self._id_cache is not None:
+            cached = self._id_cache.get((name, version))
+            if cached is not None:
+                return cached
+        
         try:
             response = (
-                self.db_connection
-                .table(self.DATASET_TABLE)
+                self._table
                 .select("dataset_id")
                 .eq("name", name)
                 .eq("version", version)
@@ -101,12 +241,17 @@ class DatasetRepository:
         if not response.data:
             return None
             
-        return response.data[0].get("dataset_id")
+        dataset_id = response.data[0].get("dataset_id")
+        if self._id_cache is not None and dataset_id is not None:
+            self._id_cache.put((name, version), dataset_id)
+        return dataset_id
     
     
     def delete_dataset(self, name: str, version: str) -> int:
         """Delete a dataset by name and version.
         
+        The server is asked for the deleted row count only, not the deleted rows.
+        
         Args:
             name: The name of the dataset to delete.
             version: The version of the dataset to delete.
@@ -119,13 +264,12 @@ class DatasetRepository:
             RuntimeError: If the database operation fails.
         """
         if not name or not version:
-            raise ValueError("Both name and version are required to delete a dataset.")
+            raise ValueError(_MISSING_NAME_VERSION_MESSAGE)
         
         try:
             response = (
-                self.db_connection
-                .table(self.DATASET_TABLE)
-                .delete()
+                self._table
+                .delete(count="exact", returning=ReturnMethod.minimal)
                 .eq("name", name)
                 .eq("version", version)
                 .execute()
@@ -133,7 +277,22 @@ class DatasetRepository:
         except Exception as e:
             raise RuntimeError(f"Error deleting dataset: {str(e)}")
         
-        return len(response.data or [])
+        self._invalidate(name, version)
+        return response.count or 0
+    
+    
+    def clear_cache(self) -> None:
+        """Flush every cached dataset and dataset ID, e.g. after out-of-band bulk changes."""
+        if self._cache is not None:
+            self._cache.clear()
+            self._id_cache.clear()
+    
+    
+    def _invalidate(self, name: str, version: str) -> None:
+        """Drop a (name, version) pair from the lookup caches, if caching is enabled."""
+        if self._cache is not None:
+            self._cache.pop((name, version))
+            self._id_cache.pop((name, version))
     
         
     
@@ -141,42 +300,129 @@ class DatasetRepository:
     def batch_get(self, names_versions: list[tuple[str, str]]) -> tuple[list[Dataset], int]:
         """Retrieve multiple datasets by their names and versions.
         
+        All pairs are resolved in one request through the ``get_datasets_by_keys``
+        database function (see ``storage/sql/get_datasets_by_keys.sql``), which
+        joins the keys against the dataset table server-side. If the function is
+        not installed, pairs are fetched with one query per chunk of
+        ``BATCH_QUERY_CHUNK_SIZE`` keys instead. With caching enabled, pairs
+        already in the get_dataset cache are not requested, and fetched
+        datasets are added to it.
+        
         Args:
             names_versions: A list of tuples containing (name, version) pairs.
             
         Returns:
             tuple[list[Dataset], int]: A tuple containing:
-                - List of retrieved Dataset instances (empty entries are skipped)
+                - List of retrieved Dataset instances, in request order (empty entries are skipped)
                 - Count of successfully retrieved datasets
                 
         Raises:
             RuntimeError: If any database operation fails.
         """
-        datasets = []
-        for name, version in names_versions:
-            if not name or not version:
-                # Skip invalid entries
-                continue
-            dataset = self.get_dataset(name, version)
-            if dataset:
-                datasets.append(dataset)
+        pairs = _unique_pairs(names_versions)
+        if not pairs:
+            return ([], 0)
+        
+        found, missing = _split_cached(self._cache, pairs)
+        if missing:
+            records = None
+            if not self._get_by_keys_function_missing:
+                keys = [{"name": name, "version": version} for name, version in missing]
+                try:
+                    response = self.db_connection.rpc(self.GET_BY_KEYS_FUNCTION, {"keys": keys}).execute()
+                except APIError as e:
+                    if e.code != self.UNDEFINED_FUNCTION_CODE:
+                        raise RuntimeError(f"Error retrieving dataset: {e.message}")
+                    self._get_by_keys_function_missing = True
+                except Exception as e:
+                    raise RuntimeError(f"Error retrieving dataset: {str(e)}")
+                else:
+                    records = response.data or []
+            if records is None:
+                records = self._select_by_pairs(missing)
+            _collect_records(self._cache, records, missing, found)
         
+        datasets = [found[pair] for pair in pairs if pair in found]
         return (datasets, len(datasets))
+
     
     
+    def batch_get_iter(self, names_versions: list[tuple[str, str]]) -> Iterator[Dataset]:
+        """Iterate over multiple datasets by their names and versions, one chunk at a time.
+        
+        A streaming alternative to batch_get for large requests: each chunk of
+        ``BATCH_QUERY_CHUNK_SIZE`` pairs is fetched only when the previous one
+        has been consumed, so memory stays bounded by the chunk size.
+        
+        Args:
+            names_versions: A list of tuples containing (name, version) pairs.
+            
+        Yields:
+            Dataset: Each retrieved dataset, in request order (empty entries and missing datasets are skipped).
+            
+        Raises:
+            RuntimeError: If any database operation fails.
+        """
+        pairs = _unique_pairs(names_versions)
+        for start in range(0, len(pairs), self.BATCH_QUERY_CHUNK_SIZE):
+            datasets, _ = self.batch_get(pairs[start:start + self.BATCH_QUERY_CHUNK_SIZE])
+            yield from datasets
     
+    def _select_by_pairs(self, pairs: list[tuple[str, str]]) -> list[dict]:
+        """Fetch dataset records for (name, version) pairs using one query per chunk.
+        
+        Each chunk is matched exactly (see ``_filter_pairs``), so only
+        requested pairs are returned. Up to ``MAX_PARALLEL_QUERIES`` chunks are
+        queried at once.
+        
+        Args:
+            pairs: A list of deduplicated (name, version) tuples.
+            
+        Returns:
+            list[dict]: The raw dataset records returned by the database.
+            
+        Raises:
+            RuntimeError: If any database operation fails.
+        """
+        def select_chunk(chunk: list[tuple[str, str]]) -> list[dict]:
+            try:
+                response = _filter_pairs(self._table.select(self._SELECT_COLUMNS), chunk).execute()
+            except Exception as e:
+                raise RuntimeError(f"Error retrieving dataset: {str(e)}")
+            return response.data or []
+        
+        results = map_chunks(select_chunk, pairs, self.BATCH_QUERY_CHUNK_SIZE, self.MAX_PARALLEL_QUERIES)
+        return [record for chunk in results for record in chunk]
     
-    def batch_create(self, datasets: list[Dataset]) -> None:
+    
+    
+    
+    def batch_create(self, datasets: Iterable[Dataset], chunk_size: int = BULK_CHUNK_SIZE) -> None:
         """Add multiple datasets to the storage system in a batch operation.
         
+        Datasets are consumed lazily and sent as one bulk insert per
+        ``chunk_size`` records rather than one request per dataset, so a
+        generator over a large import only holds one chunk of records in
+        memory. Nothing is read back, so the server is told not to echo the
+        inserted rows.
+        
         Args:
-            datasets: A list of Dataset instances to add to storage.
+            datasets: The Dataset instances to add to storage, e.g. a list or generator.
+                      Empty entries (None) are skipped.
+            chunk_size: Maximum number of records per bulk insert.
             
         Raises:
-            RuntimeError: If any database operation fails.
+            RuntimeError: If any database operation fails. Chunks sent before
+                          the failure stay inserted.
         """
-        for dataset in datasets:
-            self.add_dataset(dataset)
+        records_iter = (dataset.to_record() for dataset in datasets if dataset)
+        while True:
+            records = list(islice(records_iter, chunk_size))
+            if not records:
+                return
+            self.db_connection.bulk_insert(self.DATASET_TABLE, records, returning=ReturnMethod.minimal)
+            for record in records:
+                self._invalidate(record["name"], record["version"])
         
 
     
@@ -184,6 +430,11 @@ class DatasetRepository:
     def batch_delete(self, name_versions: list[tuple[str, str]]) -> int:
         """Delete multiple datasets by their names and versions in a batch operation.
         
+        Pairs are removed with one DELETE per chunk of ``BATCH_QUERY_CHUNK_SIZE``
+        keys, using an ``or`` of exact (name, version) matches so no unrequested
+        combinations are deleted. Up to ``MAX_PARALLEL_QUERIES`` chunks are
+        deleted at once, and only the deleted row counts are sent back.
+        
         Args:
             name_versions: A list of tuples containing (name, version) pairs.
                           Invalid entries (empty name or version) are skipped.
@@ -194,12 +445,27 @@ class DatasetRepository:
         Raises:
             RuntimeError: If any database operation fails.
         """
-        total_deleted_datasets = 0
-        for name, version in name_versions:
-            if not name or not version:
-                # Skip invalid entries
-                continue
-            deleted_count = self.delete_dataset(name, version)
-            total_deleted_datasets += deleted_count
-            
-        return total_deleted_datasets
+        def delete_chunk(chunk: list[tuple[str, str]]) -> int:
+            try:
+                response = (
+                    self._table
+                    .delete(count="exact", returning=ReturnMethod.minimal)
+                    .or_(_composite_key_filter(chunk))
+                    .execute()
+                )
+            except APIError as e:
+                raise RuntimeError(f"Error deleting dataset: {e.message}")
+            except Exception as e:
+                raise RuntimeError(f"Error deleting dataset: {str(e)}")
+            return response.count or 0
+        
+        pairs = _unique_pairs(name_versions)
+        if not pairs:
+            return 0
+        try:
+            deleted_counts = map_chunks(delete_chunk, pairs, self.BATCH_QUERY_CHUNK_SIZE, self.MAX_PARALLEL_QUERIES)
+        finally:
+            # Evict every pair, even after a failure: other chunks may already be gone
+            for name, version in pairs:
+                self._invalidate(name, version)
+        return sum(deleted_counts)
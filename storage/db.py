@@ -1,10 +1,157 @@
 import os
-from supabase import create_client, Client
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+import httpx
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
 from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+if TYPE_CHECKING:
+    # The full supabase package (auth, storage, realtime clients) is slow to
+    # import and only needed to open a connection; see connect_to_supabase.
+    from supabase import Client
+
+try:
+    import orjson
+except ImportError:  # optional: request bodies fall back to the stdlib encoder
+    orjson = None
+
+# numpy scalars and arrays (common in run parameters and metrics) are encoded
+# natively instead of failing like they do with the stdlib encoder.
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
 
 SUPABASE_URL: str | None = os.environ.get("ML_LINEAGE_SUPABASE_URL")
 SUPABASE_KEY: str | None = os.environ.get("ML_LINEAGE_SUPABASE_KEY")
 
+# Upper bound on rows sent in a single bulk request; keeps payloads below provider limits.
+BULK_CHUNK_SIZE = 500
+
+# Default size of the shared HTTP client's connection pool: the cap on
+# concurrent connections, all of which are kept alive for reuse across queries.
+# ML_LINEAGE_DB_POOL_SIZE overrides it; see http_pool_limits.
+HTTP_POOL_SIZE = 20
+
+# Request timeout (seconds) of the shared HTTP client; matches the client
+# postgrest builds itself when none is injected.
+HTTP_TIMEOUT = DEFAULT_POSTGREST_CLIENT_TIMEOUT
+
+
+def http_pool_limits() -> httpx.Limits:
+    """Connection pool limits shared by the sync and async HTTP clients.
+
+    The pool size is ``ML_LINEAGE_DB_POOL_SIZE`` when set, else ``HTTP_POOL_SIZE``.
+
+    Raises:
+        ValueError: If ML_LINEAGE_DB_POOL_SIZE is not a positive integer.
+    """
+    size = HTTP_POOL_SIZE
+    value = os.environ.get("ML_LINEAGE_DB_POOL_SIZE")
+    if value is not None:
+        try:
+            size = int(value)
+        except ValueError:
+            size = 0
+        if size <= 0:
+            raise ValueError(f"ML_LINEAGE_DB_POOL_SIZE must be a positive integer (got {value!r})")
+    return httpx.Limits(max_connections=size, max_keepalive_connections=size)
+
+
+def quote_filter_value(value: str) -> str:
+    """Double-quote a value for a PostgREST ``or``/``and`` filter expression.
+    
+    Reserved characters (commas, dots, parentheses) in the value would
+    otherwise break the filter.
+    """
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+class OrjsonRequestMixin:
+    """httpx client mixin that encodes JSON request bodies with orjson.
+
+    postgrest hands row payloads to httpx via ``json=``, which httpx encodes
+    with the stdlib json module. This encodes them with orjson instead, falling
+    back to the default path for payloads orjson cannot serialize. Response
+    bodies need no such hook: postgrest already parses them with pydantic's
+    native JSON parser.
+    """
+
+    def build_request(self, method, url, *, content=None, json=None, headers=None, **kwargs):
+        if json is not None and content is None:
+            try:
+                content = orjson.dumps(json, option=ORJSON_OPTIONS)
+            except TypeError:
+                pass
+            else:
+                json = None
+                headers = httpx.Headers(headers)
+                headers["Content-Type"] = "application/json"
+        return super().build_request(method, url, content=content, json=json, headers=headers, **kwargs)
+
+
+class OrjsonClient(OrjsonRequestMixin, httpx.Client):
+    """Synchronous httpx client using orjson for request bodies."""
+
+
+class InsertPipeline:
+    """Buffers inserts per table and sends each table's rows as bulk inserts.
+
+    Created by ``DatabaseConnection.pipeline()``. A table is flushed as soon as
+    its buffer reaches ``chunk_size`` rows, and everything left is flushed when
+    the ``with`` block exits normally. Rows still buffered when the block
+    raises are discarded.
+    """
+
+    def __init__(self, connection: "DatabaseConnection", chunk_size: int = BULK_CHUNK_SIZE):
+        """Initialize an empty pipeline.
+
+        Args:
+            connection: The DatabaseConnection used to flush buffered rows.
+            chunk_size: Number of buffered rows for a table that triggers a flush.
+        """
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self._buffers: dict[str, list[dict]] = {}
+
+    def insert(self, table: str, record: dict) -> None:
+        """Queue a record for insertion into the specified table.
+
+        Args:
+            table: The name of the table to insert into.
+            record: Dictionary containing the record data.
+
+        Raises:
+            RuntimeError: If a triggered flush fails.
+        """
+        buffer = self._buffers.setdefault(table, [])
+        buffer.append(record)
+        if len(buffer) >= self.chunk_size:
+            self._flush_table(table)
+
+    def flush(self) -> None:
+        """Send every buffered record, one bulk insert per table.
+
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        for table in list(self._buffers):
+            self._flush_table(table)
+
+    def _flush_table(self, table: str) -> None:
+        records = self._buffers.pop(table, None)
+        if records:
+            self.connection.bulk_insert(table, records, self.chunk_size)
+
+    def __enter__(self) -> "InsertPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self._buffers.clear()
+
 
 class DatabaseConnection:
     """Wrapper around Supabase client for database operations.
@@ -16,7 +163,7 @@ class DatabaseConnection:
         client: The underlying Supabase client instance.
     """
     
-    def __init__(self, client: Client):
+    def __init__(self, client: "Client"):
         """Initialize DatabaseConnection with a Supabase client.
         
         Args:
@@ -45,6 +192,111 @@ class DatabaseConnection:
         except APIError as e:
             raise RuntimeError(f"Failed to insert into {table}: {e.message}")
     
+    def bulk_insert(
+        self,
+        table: str,
+        records: list[dict],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        returning: ReturnMethod = ReturnMethod.representation,
+    ) -> list[dict]:
+        """Insert many records into the specified table with as few requests as possible.
+        
+        Records are sent as multi-row inserts of at most ``chunk_size`` rows each,
+        so N records cost roughly N / chunk_size round-trips instead of N.
+        Chunks are not atomic with each other: if one fails, the chunks before
+        it stay written, and the error names the failed row range.
+        
+        Args:
+            table: The name of the table to insert into.
+            records: List of dictionaries containing the record data.
+            chunk_size: Maximum number of rows sent per request.
+            returning: ``ReturnMethod.minimal`` stops the server from echoing the
+                       inserted rows back, for loads that don't need generated fields.
+        
+        Returns:
+            list[dict]: The inserted records with generated fields (e.g., UUIDs),
+                        or the records as sent when ``returning`` is minimal.
+        
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        inserted = []
+        for start in range(0, len(records), chunk_size):
+            chunk = records[start:start + chunk_size]
+            try:
+                response = self.client.table(table).insert(chunk, returning=returning).execute()
+            except APIError as e:
+                raise RuntimeError(
+                    f"Failed to insert into {table} (rows {start}-{start + len(chunk) - 1}): {e.message}"
+                )
+            inserted.extend(response.data or chunk)
+        return inserted
+    
+    def upsert(self, table: str, record: dict, on_conflict: str) -> dict:
+        """Insert a record, or update the existing row it conflicts with.
+        
+        Args:
+            table: The name of the table to write to.
+            record: Dictionary containing the record data.
+            on_conflict: Comma-separated columns of the unique constraint that
+                         identifies an existing row.
+        
+        Returns:
+            dict: The written record with generated fields (e.g., UUIDs).
+        
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        try:
+            response = self.client.table(table).upsert(record, on_conflict=on_conflict).execute()
+        except APIError as e:
+            raise RuntimeError(f"Failed to upsert into {table}: {e.message}")
+        if response.data:
+            return response.data[0]
+        return record
+    
+    def pipeline(self, chunk_size: int = BULK_CHUNK_SIZE) -> InsertPipeline:
+        """Start a pipeline that batches inserts across one or more tables.
+        
+        Use it as a context manager so related records (e.g. a run and its
+        datasets) are written with one round-trip per table:
+        
+            with connection.pipeline() as pipeline:
+                pipeline.insert("Dataset", dataset.to_record())
+                pipeline.insert("Run", run_record)
+        
+        Args:
+            chunk_size: Number of buffered rows for a table that triggers a flush.
+        
+        Returns:
+            InsertPipeline: The pipeline buffering the inserts.
+        """
+        return InsertPipeline(self, chunk_size)
+    
+    def rpc(self, function: str, params: dict):
+        """Get a query builder that calls a Postgres function.
+        
+        Args:
+            function: The name of the database function.
+            params: Dictionary of named arguments passed to the function.
+            
+        Returns:
+            The Supabase RPC query builder.
+        """
+        return self.client.rpc(function, params)
+    
+    def close(self) -> None:
+        """Close the pooled HTTP client used by the Supabase client, if any."""
+        http_client = getattr(getattr(self.client, "options", None), "httpx_client", None)
+        if http_client is not None:
+            http_client.close()
+    
+    def __enter__(self) -> "DatabaseConnection":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     def table(self, table: str):
         """Get a query builder for the specified table.
         
@@ -57,12 +309,60 @@ class DatabaseConnection:
         return self.client.table(table)
 
 
-def connect_to_supabase() -> Client:
+def create_http_client() -> httpx.Client:
+    """Create the pooled HTTP client shared by all queries on a connection.
+
+    Reusing one client keeps TCP/TLS connections alive between requests; up to
+    ``ML_LINEAGE_DB_POOL_SIZE`` (default 20) connections serve concurrent callers.
+    HTTP/2 is enabled when the optional ``h2`` package is installed, and
+    request bodies are encoded with ``orjson`` when it is installed. Like the
+    client postgrest creates by default, requests time out after
+    ``HTTP_TIMEOUT`` seconds and follow redirects.
+
+    Returns:
+        httpx.Client: A keep-alive HTTP client.
+    """
+    client_class = OrjsonClient if orjson is not None else httpx.Client
+    return client_class(
+        http2=find_spec("h2") is not None,
+        limits=http_pool_limits(),
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+    )
+
+
+def connect_to_supabase() -> "Client":
     """Establish a connection to the database.
 
+    The returned client sends every request through a single pooled HTTP
+    client; close it with ``DatabaseConnection.close()``.
+
     Returns:
         Client: An instance of the Supabase client connected to the database.
     """
     if not SUPABASE_URL or not SUPABASE_KEY: # fail fast if env vars are not set
         raise RuntimeError("Supabase credentials are not set in environment variables")
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
\ No newline at end of file
+    from supabase import create_client, ClientOptions
+    options = ClientOptions(httpx_client=create_http_client())
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
+
+
+@lru_cache(maxsize=1)
+def get_connection() -> DatabaseConnection:
+    """Return the process-wide DatabaseConnection, creating it on first use.
+
+    Repositories built from this connection share one Supabase client and
+    its pooled HTTP client, so TLS and auth are negotiated once per process
+    instead of once per repository. Call ``close_connection()`` on shutdown.
+
+    Returns:
+        DatabaseConnection: The shared database connection.
+    """
+    return DatabaseConnection(connect_to_supabase())
+
+
+def close_connection() -> None:
+    """Close the shared connection, if one was created, and forget it."""
+    if get_connection.cache_info().currsize:
+        get_connection().close()
+        get_connection.cache_clear()
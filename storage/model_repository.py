@@ -1,6 +1,24 @@
-from .db import DatabaseConnection
+from copy import copy
+from functools import cached_property
+from .db import DatabaseConnection, quote_filter_value
 from core.model import Model 
-from typing import Optional, Tuple
+from postgrest.exceptions import APIError
+from utils.cache import TTLCache
+from typing import Iterator, Optional, Tuple
+
+
+def _unique_names(model_names: list[str]) -> list[str]:
+    """Drop empty and duplicate model names, keeping request order.
+    
+    Raises:
+        ValueError: If any non-empty entry is not a string, naming its index.
+    """
+    names = [name for name in model_names if name]
+    if not all(isinstance(name, str) for name in names):
+        index = next(i for i, name in enumerate(model_names) if name and not isinstance(name, str))
+        raise ValueError(f"Model names must be strings (got {type(model_names[index]).__name__} at index {index})")
+    return list(dict.fromkeys(names))
+
 
 class ModelRepository:
     """Repository for managing models in the storage system.
@@ -11,19 +29,53 @@ class ModelRepository:
     
     Attributes:
         MODEL_TABLE: The name of the table where models are stored.
+        SELECT_FIELDS: The columns fetched when loading models (Model.RECORD_KEYS, what Model.from_record reads).
+        BATCH_QUERY_CHUNK_SIZE: Maximum number of names per batch query, to stay below URL length limits.
+        CACHE_MAXSIZE: Maximum number of models kept in the get_model cache.
+        MODEL_CACHE_TTL: Seconds a model fetched by get_model is served from cache.
+        LIST_PAGE_SIZE: Number of models fetched per page by iter_models.
+        MODEL_ID_COLUMN: The unique model key iter_models pages on after model_name, which may repeat
+                         (added by ``storage/sql/model_name_id_idx.sql``).
+        UNDEFINED_COLUMN_CODE: PostgreSQL error code returned when a selected column does not exist.
         db_connection: The database connection instance.
     """
     MODEL_TABLE = "Model"
+    SELECT_FIELDS = Model.RECORD_KEYS
+    _SELECT_COLUMNS = ",".join(SELECT_FIELDS)
+    BATCH_QUERY_CHUNK_SIZE = 200
+    CACHE_MAXSIZE = 1024
+    MODEL_CACHE_TTL = 30.0
+    LIST_PAGE_SIZE = 1000
+    MODEL_ID_COLUMN = "model_id"
+    _PAGE_COLUMNS = f"{_SELECT_COLUMNS},{MODEL_ID_COLUMN}"
+    UNDEFINED_COLUMN_CODE = "42703"
     
-    def __init__(self, db_connection: DatabaseConnection):
+    def __init__(self, db_connection: DatabaseConnection, cache: bool = True):
         """Initialize a ModelRepository instance.
         
         Args:
             db_connection: A DatabaseConnection instance for database operations.
+            cache: Whether get_model results (and so get_artifact_uri and
+                   model_exists) are cached in-process. Writes made through this
+                   repository invalidate the affected entries; models changed by
+                   other processes are refetched after MODEL_CACHE_TTL seconds.
+                   Callers get their own copy of a cached model.
         """
         self.db_connection = db_connection
+        self._cache: Optional[TTLCache] = TTLCache(self.CACHE_MAXSIZE, self.MODEL_CACHE_TTL) if cache else None
+        self._list_cache: Optional[tuple[tuple, list[Model]]] = None
+        # Set once list_models finds the table has no updated_at column, so later calls skip the probe
+        self._updated_at_column_missing = False
+        
         
+    @cached_property
+    def _table(self):
+        """Query builder for the model table, created once per repository.
         
+        Each select/update/delete call on the builder starts a fresh request,
+        so the builder itself can be reused across queries.
+        """
+        return self.db_connection.table(self.MODEL_TABLE)
     
     def add_model(self, model: Model) -> None:
         """Add a new model to the storage system.
@@ -41,6 +93,7 @@ class ModelRepository:
             self.db_connection.insert(self.MODEL_TABLE, record)
         except APIError as e:
             raise RuntimeError(f"Failed to add model: {e.message}")
+        self._invalidate(model.model_name)
         
     
     def get_model(self, model_name: str) -> Optional[Model]:
@@ -58,8 +111,12 @@ class ModelRepository:
         """
         if not model_name:
             raise ValueError("Model name is required")
+        if self._cache is not None:
+            cached = self._cache.get(model_name)
+            if cached is not None:
+                return copy(cached)
         try:
-            response = self.db_connection.table(self.MODEL_TABLE).select("*").eq("model_name", model_name).execute()
+            response = self._table.select(self._SELECT_COLUMNS).eq("model_name", model_name).execute()
         except Exception as e:
             raise RuntimeError(f"Failed to retrieve model: {str(e)}")
         
@@ -69,6 +126,8 @@ class ModelRepository:
         model_data = response.data[0]
         
         record = Model.from_record(model_data)
+        if self._cache is not None:
+            self._cache.put(model_name, copy(record))
         
         return record
     
@@ -92,14 +151,15 @@ class ModelRepository:
         model_name = model.model_name
         try:
             response = (
-                self.db_connection
-                .table(self.MODEL_TABLE)
+                self._table
                 .update(record)
                 .eq("model_name", model_name)
                 .execute() 
             )
         except Exception as e:
             raise RuntimeError(f"Failed to update model: {str(e)}")
+        finally:
+            self._invalidate(model_name)
         
         if not response.data:
             raise RuntimeError("No model found to update")
@@ -119,20 +179,35 @@ class ModelRepository:
         
         try:
             response = (
-                self.db_connection
-                .table(self.MODEL_TABLE)
+                self._table
                 .delete()
                 .eq("model_name", model_name)
                 .execute()
             )
         except Exception as e:
             raise RuntimeError(f"Failed to delete model: {str(e)}")
+        finally:
+            self._invalidate(model_name)
         if not response.data:
             raise RuntimeError("No model found to delete")
     
+    def clear_cache(self) -> None:
+        """Flush every cached model, e.g. after out-of-band bulk changes."""
+        self._list_cache = None
+        if self._cache is not None:
+            self._cache.clear()
+    
+    def _invalidate(self, model_name: str) -> None:
+        """Drop a model from the get_model cache and the list_models cache."""
+        self._list_cache = None
+        if self._cache is not None:
+            self._cache.pop(model_name)
+    
     def get_artifact_uri(self, model_name: str) -> Optional[str]:
         """Get the artifact URI for a model by its name.
         
+        Served from the get_model cache when enabled.
+        
         Args:
             model_name: The name of the model.
             
@@ -151,29 +226,139 @@ class ModelRepository:
     def list_models(self) -> list[Model]:
         """List all models in the storage system.
         
+        When caching is enabled, a cheap probe of the table's row count and
+        latest ``updated_at`` (see ``storage/sql/model_updated_at.sql``) runs
+        first; if neither changed since the last call, copies of the cached
+        models are returned without transferring the table again.
+        
         Returns:
             list[Model]: A list of all Model instances in the database.
             
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        fingerprint = self._list_fingerprint() if self._cache is not None else None
+        if fingerprint is not None and self._list_cache is not None and self._list_cache[0] == fingerprint:
+            return [copy(model) for model in self._list_cache[1]]
+        
+        models = list(self.iter_models())
+        if fingerprint is not None:
+            self._list_cache = (fingerprint, [copy(model) for model in models])
+        return models
+    
+    def iter_models(self, page_size: Optional[int] = None) -> Iterator[Model]:
+        """Iterate over all models, fetching them one page at a time.
+        
+        Pages are read with keyset pagination on (model_name, model_id): each
+        page starts after the last row seen, so memory stays bounded by the
+        page size and later pages cost the same as the first. model_id breaks
+        ties, since several models can share a name across a page boundary;
+        the column and the index backing the keyset are created by
+        ``storage/sql/model_name_id_idx.sql``.
+        
+        Args:
+            page_size: Number of models per request. Defaults to LIST_PAGE_SIZE.
+            
+        Yields:
+            Model: Each model in the database, ordered by model_name then model_id.
+            
+        Raises:
+            RuntimeError: If the database operation fails, including when the
+                          model_id column has not been added yet.
+        """
+        page_size = page_size or self.LIST_PAGE_SIZE
+        cursor = None
+        while True:
+            query = self._table.select(self._PAGE_COLUMNS)
+            if cursor is not None:
+                name, model_id = (quote_filter_value(str(value)) for value in cursor)
+                query = query.or_(
+                    f"model_name.gt.{name},and(model_name.eq.{name},{self.MODEL_ID_COLUMN}.gt.{model_id})"
+                )
+            try:
+                response = (query
+                            .order("model_name")
+                            .order(self.MODEL_ID_COLUMN)
+                            .limit(page_size)
+                            .execute())
+            except APIError as e:
+                if e.code == self.UNDEFINED_COLUMN_CODE:
+                    raise RuntimeError(
+                        f"Failed to list models: {e.message} (apply storage/sql/model_name_id_idx.sql)"
+                    )
+                raise RuntimeError(f"Failed to list models: {e.message}")
+            except Exception as e:
+                raise RuntimeError(f"Failed to list models: {str(e)}")
+            
+            records = response.data or []
+            yield from Model.from_records(records)
+            if len(records) < page_size:
+                return
+            last = records[-1]
+            cursor = (last["model_name"], last[self.MODEL_ID_COLUMN])
+    
+    def list_model_names(self) -> list[str]:
+        """List the names of all models in the storage system.
+        
+        Cheaper than list_models for callers that only need names: only the
+        model_name column is fetched and no Model objects are built.
+        
+        Returns:
+            list[str]: The name of every model in the database.
+            
         Raises:
             RuntimeError: If the database operation fails.
         """
         try:
-            response = self.db_connection.table(self.MODEL_TABLE).select("*").execute()
+            response = self._table.select("model_name").execute()
         except Exception as e:
             raise RuntimeError(f"Failed to list models: {str(e)}")
+        return [record["model_name"] for record in response.data]
+    
+    def _list_fingerprint(self) -> Optional[tuple]:
+        """Return (row count, latest updated_at) for the model table.
         
-        models = [Model.from_record(record) for record in response.data]
-        return models 
+        Returns:
+            Optional[tuple]: The table fingerprint, or None if the table has no
+                             updated_at column and list_models cannot be cached.
+            
+        Raises:
+            RuntimeError: If the database operation fails for another reason.
+        """
+        if self._updated_at_column_missing:
+            return None
+        try:
+            response = (
+                self._table
+                .select("updated_at", count="exact")
+                .order("updated_at", desc=True)
+                .limit(1)
+                .execute()
+            )
+        except APIError as e:
+            if e.code != self.UNDEFINED_COLUMN_CODE:
+                raise RuntimeError(f"Failed to list models: {e.message}")
+            self._updated_at_column_missing = True
+            return None
+        except Exception as e:
+            raise RuntimeError(f"Failed to list models: {str(e)}")
+        latest = response.data[0].get("updated_at") if response.data else None
+        return (response.count, latest)
     
     def batch_get(self, model_names: list[str]) -> list[Model]:
         """Retrieve multiple models by their names.
         
+        Models are fetched with one ``IN`` query per chunk of
+        ``BATCH_QUERY_CHUNK_SIZE`` names instead of one query per name. With
+        caching enabled, cached models are not requested and fetched models
+        are cached for get_model; as with get_model, callers get copies.
+        
         Args:
             model_names: A list of model names to retrieve.
-                        Invalid entries (empty names or non-strings) are skipped.
+                        Invalid entries (empty names) and duplicates are skipped.
             
         Returns:
-            list[Model]: List of retrieved Model instances (skips models that are not found).
+            list[Model]: List of retrieved Model instances, in request order (skips models that are not found).
             
         Raises:
             ValueError: If any model name is not a string.
@@ -181,18 +366,37 @@ class ModelRepository:
         """
         if not model_names:
             return []
-        models = []
-        for name in model_names:
-            if not name:
-                continue
-            if not isinstance(name, str):
-                raise ValueError("Model names must be strings")
-            record = self.get_model(name)
-            if record is None:
-                continue
-            models.append(record)
+        names = _unique_names(model_names)
         
-        return models
+        found = {}
+        missing = names
+        if self._cache is not None:
+            missing = []
+            for name in names:
+                cached = self._cache.get(name)
+                if cached is not None:
+                    found[name] = copy(cached)
+                else:
+                    missing.append(name)
+        
+        for start in range(0, len(missing), self.BATCH_QUERY_CHUNK_SIZE):
+            chunk = missing[start:start + self.BATCH_QUERY_CHUNK_SIZE]
+            try:
+                response = (
+                    self._table
+                    .select(self._SELECT_COLUMNS)
+                    .in_("model_name", chunk)
+                    .execute()
+                )
+            except Exception as e:
+                raise RuntimeError(f"Failed to retrieve model: {str(e)}")
+            for record in response.data or []:
+                model = Model.from_record(record)
+                found[model.model_name] = model
+                if self._cache is not None:
+                    self._cache.put(model.model_name, copy(model))
+        
+        return [found[name] for name in names if name in found]
         
     def model_exists(self, model_name: str) -> bool:
         """Check if a model exists in the storage system.
@@ -207,6 +411,17 @@ class ModelRepository:
             ValueError: If model_name is empty or None.
             RuntimeError: If the database operation fails.
         """
-        model = self.get_model(model_name)
-        return model is not None
+        if not model_name:
+            raise ValueError("Model name is required")
+        if self._cache is not None and model_name in self._cache:
+            return True
+        try:
+            response = (
+                self._table
+                .select("model_name", head=True, count="exact")
+                .eq("model_name", model_name)
+                .execute())
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve model: {str(e)}")
+        return (response.count or 0) > 0
                         
\ No newline at end of file
@@ -1,8 +1,64 @@
-from .db import DatabaseConnection
+import atexit
+import logging
+import threading
+import weakref
+from copy import deepcopy
+from functools import cached_property
+from .db import BULK_CHUNK_SIZE, DatabaseConnection
 from core.run import Run
 from datetime import datetime, timezone
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+from utils.cache import LRUCache, TTLCache
+from utils.concurrency import map_chunks
+
+# Run attributes whose stored column has a different name.
+_ATTRIBUTE_COLUMNS = {"run_name": "name"}
+
+logger = logging.getLogger(__name__)
+
+# Repositories with runs queued by queue_run, flushed by one atexit hook. Held
+# weakly so a queued run does not keep its repository alive; the hook is
+# unregistered again once no repository has queued runs.
+_queued_repositories: "weakref.WeakSet[RunRepository]" = weakref.WeakSet()
+_queued_lock = threading.Lock()
+_exit_hook_registered = False
+
+
+def _flush_queued_runs() -> None:
+    """atexit hook: flush every repository with queued runs, logging failures since there is no caller to raise to."""
+    for repository in list(_queued_repositories):
+        try:
+            repository.flush()
+        except RuntimeError as e:
+            logger.warning("Flushing queued runs at exit failed: %s", e)
+
+
+def _track_queued(repository: "RunRepository") -> None:
+    """Add a repository to the exit flush, registering the hook if needed."""
+    global _exit_hook_registered
+    with _queued_lock:
+        _queued_repositories.add(repository)
+        if not _exit_hook_registered:
+            atexit.register(_flush_queued_runs)
+            _exit_hook_registered = True
+
+
+def _untrack_queued(repository: "RunRepository") -> None:
+    """Drop a repository from the exit flush, unregistering the hook once none are left."""
+    global _exit_hook_registered
+    with _queued_lock:
+        _queued_repositories.discard(repository)
+        if _exit_hook_registered and not _queued_repositories:
+            atexit.unregister(_flush_queued_runs)
+            _exit_hook_registered = False
+
+
+def _utc_now_iso() -> str:
+    """Return the current UTC time as a naive ISO-8601 string, as stored in the Run table."""
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
 
 class RunRepository:
     """Repository for managing runs (experiment executions) in the storage system.
@@ -11,51 +67,258 @@ class RunRepository:
     from the persistent storage. It abstracts database operations and provides
     a clean interface for run management operations.
     
+    Runs are looked up by their ``name`` column; apply
+    ``storage/sql/run_name_unique.sql`` so those lookups are served by a
+    unique index and stop at the first match.
+    
     Attributes:
         RUN_TABLE: The name of the table where runs are stored.
+        SELECT_FIELDS: The columns fetched when loading runs (Run.RECORD_KEYS, what Run.from_record reads).
+        BATCH_QUERY_CHUNK_SIZE: Maximum number of names per batch query, to stay below URL length limits.
+        MAX_PARALLEL_QUERIES: Maximum number of chunk queries a batch read sends at once (1 disables threading).
+        CACHE_MAXSIZE: Maximum number of entries kept in each lookup cache.
+        RUN_CACHE_TTL: Seconds a run fetched by get_run is served from cache.
+        WRITE_BUFFER_SIZE: Number of runs queued by queue_run that triggers a flush.
+        WRITE_FLUSH_INTERVAL: Seconds after which queued runs are flushed in the background (None disables it).
+        START_RUN_FUNCTION: Database function used by add_run to insert a run stamped with the database clock.
+        END_RUN_FUNCTION: Database function used by end_run to end a run in one request.
+        UNDEFINED_FUNCTION_CODE: PostgREST error code returned when a database function does not exist.
         db_connection: The database connection instance.
     """
     RUN_TABLE = "Run"
+    SELECT_FIELDS = Run.RECORD_KEYS
+    _SELECT_COLUMNS = ",".join(SELECT_FIELDS)
+    BATCH_QUERY_CHUNK_SIZE = 200
+    MAX_PARALLEL_QUERIES = 8
+    CACHE_MAXSIZE = 1024
+    RUN_CACHE_TTL = 30.0
+    WRITE_BUFFER_SIZE = 500
+    WRITE_FLUSH_INTERVAL: Optional[float] = 0.5
+    START_RUN_FUNCTION = "start_run"
+    END_RUN_FUNCTION = "end_run_by_name"
+    UNDEFINED_FUNCTION_CODE = "PGRST202"
     
-    def __init__(self, db_connection: DatabaseConnection):
+    def __init__(self, db_connection: DatabaseConnection, cache: bool = True):
         """Initialize a RunRepository instance.
         
         Args:
             db_connection: A DatabaseConnection instance for database operations.
+            cache: Whether lookups are cached in-process. A run keeps its UUID
+                   for its whole life, so get_run_id hits skip the database;
+                   get_run results are kept for RUN_CACHE_TTL seconds since
+                   runs can still change.
         """
         self.db_connection = db_connection
+        self._id_cache: Optional[LRUCache] = LRUCache(self.CACHE_MAXSIZE) if cache else None
+        self._run_cache: Optional[TTLCache] = TTLCache(self.CACHE_MAXSIZE, self.RUN_CACHE_TTL) if cache else None
+        # Set once add_run/end_run find their database function missing, so later calls skip the probe
+        self._start_run_function_missing = False
+        self._end_run_function_missing = False
+        # Runs queued by queue_run; the timer and exit flush are set up while runs are pending
+        self._pending: list[dict] = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
     
+    @cached_property
+    def _table(self):
+        """Query builder for the run table, created once per repository.
+        
+        Each select/update/delete call on the builder starts a fresh request,
+        so the builder itself can be reused across queries.
+        """
+        return self.db_connection.table(self.RUN_TABLE)
     
-    def add_run(self, run: Run) -> None:
+    def add_run(self, run: Run) -> Optional[str]:
         """Add a new run to the storage system.
         
-        Converts the run to a record format and inserts it into the database.
-        The start_time in the record is overwritten with the current timestamp.
+        Uses the ``start_run`` database function when installed, which stamps
+        start_time with the database clock; otherwise the record is inserted
+        directly with start_time set to the current client timestamp. Either
+        way the generated run UUID comes back in the same round-trip and seeds
+        the get_run_id cache. Share one repository across requests so a missing
+        function is only probed once.
         
         Args:
             run: The Run instance to add to storage.
             
+        Returns:
+            Optional[str]: The UUID of the new run, or None if the server did not return it.
+            
         Raises:
             RuntimeError: If the database operation fails.
         """
-        record = run.to_record()
-        now = datetime.now(timezone.utc)
-        now_naive_utc = now.replace(tzinfo=None)
-        record["start_time"] = now_naive_utc.isoformat()
-        if record.get("end_time"):
-            if isinstance(record["end_time"], datetime):
-                record["end_time"] = record["end_time"].isoformat()
+        run_id = None
+        if not self._start_run_function_missing:
+            try:
+                response = self.db_connection.rpc(self.START_RUN_FUNCTION, {"run": run.to_record()}).execute()
+            except APIError as e:
+                if e.code != self.UNDEFINED_FUNCTION_CODE:
+                    raise RuntimeError(f"Failed to add run: {e.message}")
+                self._start_run_function_missing = True
+            except Exception as e:
+                raise RuntimeError(f"Failed to add run: {str(e)}")
+            else:
+                run_id = response.data
+        if self._start_run_function_missing:
+            record = self._to_insert_record(run, _utc_now_iso())
+            try:
+                inserted = self.db_connection.insert(self.RUN_TABLE, record)
+            except Exception as e:
+                raise RuntimeError(f"Failed to add run: {str(e)}")
+            run_id = inserted.get("run_id")
+        
+        if self._id_cache is not None and run_id is not None and run.run_name:
+            self._id_cache.put(run.run_name, run_id)
+        return run_id
+    
+    
+    def queue_run(self, run: Run) -> None:
+        """Queue a run to be inserted with other queued runs in one bulk insert.
+        
+        For workloads that create many runs over time: instead of one request
+        per run, queued runs are sent together once ``WRITE_BUFFER_SIZE`` are
+        pending, ``WRITE_FLUSH_INTERVAL`` seconds after the first was queued,
+        on flush(), or at interpreter exit if the repository is still referenced.
+        Each run is written later than with add_run and no run UUID is
+        returned; start_time is stamped at queue time.
+        
+        Args:
+            run: The Run instance to add to storage.
+            
+        Raises:
+            ValueError: If run_name is missing from the run.
+            RuntimeError: If a triggered flush fails.
+        """
+        if not run.run_name:
+            raise ValueError("Run name is required to add a run")
+        record = self._to_insert_record(run, _utc_now_iso())
+        with self._pending_lock:
+            if not self._pending:
+                _track_queued(self)
+            self._pending.append(record)
+            full = len(self._pending) >= self.WRITE_BUFFER_SIZE
+            if not full and self._flush_timer is None and self.WRITE_FLUSH_INTERVAL is not None:
+                self._flush_timer = threading.Timer(self.WRITE_FLUSH_INTERVAL, self._flush_in_background)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if full:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Insert every run queued by queue_run.
+        
+        If the insert fails, the runs stay queued for the next flush.
+        
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            records, self._pending = self._pending, []
+            if not records:
+                _untrack_queued(self)
+                return
         try:
-            self.db_connection.insert(self.RUN_TABLE, record)
+            self.db_connection.bulk_insert(self.RUN_TABLE, records, returning=ReturnMethod.minimal)
         except Exception as e:
-            raise RuntimeError(f"Failed to add run: {str(e)}")
+            with self._pending_lock:
+                self._pending[:0] = records
+            raise RuntimeError(f"Failed to add runs: {str(e)}")
+        with self._pending_lock:
+            if not self._pending:
+                _untrack_queued(self)
+    
+    def _flush_in_background(self) -> None:
+        """Timer callback: flush queued runs, logging failures since there is no caller to raise to."""
+        try:
+            self.flush()
+        except RuntimeError as e:
+            logger.warning("Background flush of queued runs failed: %s", e)
+    
+    def save_run(self, run: Run) -> None:
+        """Insert a run, or overwrite the stored run with the same name.
+        
+        One round-trip replaces an add_run followed by update_run, e.g. when
+        metrics are logged incrementally. Unlike add_run, the run's own
+        start_time is kept. Requires the unique constraint on ``"Run".name``
+        from ``storage/sql/run_name_unique.sql``.
+        
+        Args:
+            run: The Run instance to store.
+            
+        Raises:
+            ValueError: If run_name is missing from the run.
+            RuntimeError: If the database operation fails.
+        """
+        if not run.run_name:
+            raise ValueError("Run name is required to save a run")
+        try:
+            self.db_connection.upsert(self.RUN_TABLE, run.to_record(), on_conflict="name")
+        except Exception as e:
+            raise RuntimeError(f"Failed to save run: {str(e)}")
+        finally:
+            self._invalidate(run.run_name)
     
     
-    def get_run(self, run_name: str) -> Optional[Run]:
+    def save_runs(self, runs: list[Run]) -> None:
+        """Insert or overwrite multiple runs with a single upsert keyed on name.
+        
+        The batch counterpart of save_run: one request instead of one per run.
+        
+        Args:
+            runs: A list of Run instances to store.
+                  Invalid entries (runs without run_name) are skipped; when a
+                  name repeats, the last run with that name is stored.
+                  
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        # A single upsert may not touch the same row twice, so keep one record per name
+        records = {run.run_name: run.to_record() for run in runs if run.run_name}
+        if not records:
+            return
+        try:
+            (self._table
+             .upsert(list(records.values()), on_conflict="name", returning=ReturnMethod.minimal)
+             .execute())
+        except APIError as e:
+            raise RuntimeError(f"Failed to save runs: {e.message}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to save runs: {str(e)}")
+        finally:
+            for run_name in records:
+                self._invalidate(run_name)
+    
+    
+    @staticmethod
+    def _to_insert_record(run: Run, start_time: str) -> dict:
+        """Convert a run to the record inserted into the database.
+        
+        Args:
+            run: The Run instance to convert.
+            start_time: ISO timestamp stamped as the record's start_time.
+            
+        Returns:
+            dict: The run record with start_time replaced. The run's own
+                  start_time is never serialized, which matters in bulk paths.
+        """
+        return run.to_record(start_time=start_time)
+    
+    
+    def get_run(self, run_name: str, *, fresh: bool = False) -> Optional[Run]:
         """Retrieve a run by its name.
         
+        Runs found are cached for RUN_CACHE_TTL seconds when caching is enabled.
+        Writes through this repository invalidate the entry; writes from other
+        processes become visible once it expires. The cache keeps the stored
+        row, and each hit builds a new Run from a deep copy of it, so callers
+        mutating parameters or metrics do not change later lookups.
+        
         Args:
             run_name: The name of the run to retrieve.
+            fresh: Skip the cache and read the current row from the database.
             
         Returns:
             Optional[Run]: The retrieved run or None if not found.
@@ -66,27 +329,36 @@ class RunRepository:
         """
         if not run_name:
             raise ValueError("Run name is required to retrieve a run")
+        if self._run_cache is not None and not fresh:
+            cached = self._run_cache.get(run_name)
+            if cached is not None:
+                return Run.from_trusted_record(deepcopy(cached))
         
         try:
             response = (
-                self.db_connection
-                .table(self.RUN_TABLE)
-                .select("*")
+                self._table
+                .select(self._SELECT_COLUMNS)
                 .eq("name", run_name)
+                .limit(1)
                 .execute()
             )
+        except APIError as e:
+            raise RuntimeError(f"Error retrieving run: {e.message}")
         except Exception as e:
             raise RuntimeError(f"Error retrieving run: {str(e)}")
         if not response.data:
             return None
         record = response.data[0]
-        return Run.from_record(record)
+        if self._run_cache is not None:
+            self._run_cache.put(run_name, deepcopy(record))
+        return Run.from_trusted_record(record)
     
     def get_run_id(self, name: str) -> Optional[str]:
         """Get the UUID of a run by its name.
         
         This is useful when you need the run UUID for creating related entities
-        (e.g., creating a Model that was produced by this run).
+        (e.g., creating a Model that was produced by this run). Found IDs are
+        served from the in-process cache when enabled.
         
         Args:
             name: The name of the run.
@@ -100,13 +372,17 @@ class RunRepository:
         """
         if not name:
             raise ValueError("Run name is required to retrieve a run ID")
+        if self._id_cache is not None:
+            cached = self._id_cache.get(name)
+            if cached is not None:
+                return cached
         
         try:
             response = (
-                self.db_connection
-                .table(self.RUN_TABLE)
+                self._table
                 .select("run_id")
                 .eq("name", name)
+                .limit(1)
                 .execute()
             )
         except APIError as e:
@@ -114,68 +390,202 @@ class RunRepository:
         
         if not response.data:
             return None
+        
+        run_id = response.data[0]["run_id"]
+        if self._id_cache is not None and run_id is not None:
+            self._id_cache.put(name, run_id)
+        return run_id
+    
+    def batch_get_ids(self, run_names: list[str]) -> dict[str, str]:
+        """Get the UUIDs of several runs by name.
+        
+        The batch counterpart of get_run_id: cached IDs are served from the
+        in-process cache and the rest are fetched with one ``IN`` query per
+        chunk of ``BATCH_QUERY_CHUNK_SIZE`` names, then cached.
+        
+        Args:
+            run_names: The names of the runs. Empty names and duplicates are skipped.
             
-        return response.data[0].get("run_id")
+        Returns:
+            dict[str, str]: Each found run name mapped to its UUID, in request order.
+            
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        names = list(dict.fromkeys(name for name in run_names or [] if name))
+        found = {}
+        missing = []
+        for name in names:
+            cached = self._id_cache.get(name) if self._id_cache is not None else None
+            if cached is not None:
+                found[name] = cached
+            else:
+                missing.append(name)
+        
+        if missing:
+            for name, record in self._select_by_names(missing, "name,run_id", strict=True).items():
+                run_id = record.get("run_id")
+                if run_id is None:
+                    continue
+                found[name] = run_id
+                if self._id_cache is not None:
+                    self._id_cache.put(name, run_id)
+        return {name: found[name] for name in names if name in found}
+    
+    def clear_cache(self) -> None:
+        """Flush every cached run and run ID, e.g. after out-of-band changes."""
+        if self._id_cache is not None:
+            self._id_cache.clear()
+            self._run_cache.clear()
     
+    def _invalidate(self, run_name: str) -> None:
+        """Drop a run from the get_run cache, if caching is enabled."""
+        if self._run_cache is not None:
+            self._run_cache.pop(run_name)
     
-    def batch_get(self, run_names: list[str]) -> list[Run]:
+    
+    def batch_get(self, run_names: list[str], *, strict: bool = False) -> tuple[list[Run], int]:
         """Retrieve multiple runs by their names.
         
+        Runs are fetched with one ``IN`` query per chunk of
+        ``BATCH_QUERY_CHUNK_SIZE`` names instead of one query per name.
+        
         Args:
             run_names: A list of run names to retrieve.
+                       Empty names and duplicates are skipped.
+            strict: Raise on the first failed chunk instead of skipping it.
             
         Returns:
             tuple[list[Run], int]: A tuple containing:
-                - List of retrieved Run instances (skips runs that cause errors)
+                - List of retrieved Run instances, in request order (skips runs that cause errors)
                 - Count of successfully retrieved runs
                 
+        Raises:
+            RuntimeError: If strict is set and a chunk query fails.
+                
         Note:
-            If a run retrieval fails with a RuntimeError, it is logged and skipped
-            rather than failing the entire batch operation.
+            Unless strict is set, a failed chunk query is logged and its runs
+            are skipped rather than failing the entire batch operation.
         """
-        collected_runs = []
-        if not run_names:
-            return collected_runs, 0
+        names = list(dict.fromkeys(name for name in run_names or [] if name))
+        if not names:
+            return [], 0
+        by_name = self._select_by_names(names, self._SELECT_COLUMNS, strict)
+        collected_runs = Run.from_trusted_records([by_name[name] for name in names if name in by_name])
+        return collected_runs, len(collected_runs)
+    
+    def batch_get_projection(
+        self, run_names: list[str], fields: Iterable[str], *, strict: bool = False
+    ) -> dict[str, list]:
+        """Retrieve selected columns of multiple runs, one list per column.
         
-        for run_name in run_names:
+        A lighter alternative to batch_get for callers that only need a few
+        values (e.g. names and IDs for display): only the requested columns
+        are fetched and no Run objects are built.
+        
+        Args:
+            run_names: A list of run names to retrieve.
+                       Empty names and duplicates are skipped.
+            fields: Column names to return, from SELECT_FIELDS or ``"run_id"``.
+            strict: Raise on the first failed chunk instead of skipping it.
+            
+        Returns:
+            dict[str, list]: Each requested column mapped to its values, aligned
+                across columns and in request order (skips runs that cause errors).
+                
+        Raises:
+            ValueError: If a field is not a known run column.
+            RuntimeError: If strict is set and a chunk query fails.
+            
+        Note:
+            Unless strict is set, a failed chunk query is logged and its runs
+            are skipped rather than failing the entire batch operation.
+        """
+        fields = list(dict.fromkeys(fields))
+        unknown = [field for field in fields if field != "run_id" and field not in self.SELECT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown run fields: {', '.join(unknown)}")
+        
+        names = list(dict.fromkeys(name for name in run_names or [] if name))
+        # "name" is always fetched to put rows back in request order
+        by_name = self._select_by_names(names, ",".join(dict.fromkeys(["name", *fields])), strict)
+        rows = [by_name[name] for name in names if name in by_name]
+        return {field: [row.get(field) for row in rows] for field in fields}
+    
+    def _select_by_names(self, names: list[str], columns: str, strict: bool = False) -> dict[str, dict]:
+        """Fetch the given columns of runs by name using chunked ``IN`` queries.
+        
+        Up to ``MAX_PARALLEL_QUERIES`` chunks are queried at once from worker
+        threads. Chunks whose query fails are logged and skipped, or raise
+        when strict is set.
+        
+        Returns:
+            dict[str, dict]: The fetched records keyed by run name.
+            
+        Raises:
+            RuntimeError: If strict is set and a chunk query fails.
+        """
+        def select_chunk(chunk: list[str]) -> list[dict]:
             try:
-                record = self.get_run(run_name)
-                if record:
-                    collected_runs.append(record)
-            except RuntimeError as e:
-                # Log the error and just continue don't want to fail the whole batch
-                continue
-        return collected_runs
+                response = (
+                    self._table
+                    .select(columns)
+                    .in_("name", chunk)
+                    .execute()
+                )
+            except Exception as e:
+                if strict:
+                    raise RuntimeError(f"Error retrieving runs: {str(e)}")
+                # Don't want to fail the whole batch, just skip this chunk
+                logger.warning("Skipping %d runs after a failed batch query: %s", len(chunk), e)
+                return []
+            return response.data or []
+        
+        results = map_chunks(select_chunk, names, self.BATCH_QUERY_CHUNK_SIZE, self.MAX_PARALLEL_QUERIES)
+        return {record.get("name") or record.get("run_name"): record for chunk in results for record in chunk}
     
     
     
-    def update_run(self, run: Run) -> None:
+    def update_run(self, run: Run, fields: Optional[Iterable[str]] = None) -> None:
         """Update an existing run in the storage system.
         
         Converts the run to a record format and updates it in the database
-        based on the run_name.
+        based on the run_name. Pass ``fields`` to send only the attributes that
+        changed: a smaller payload, and when no indexed column is touched
+        Postgres can apply it as a HOT update.
         
         Args:
             run: The Run instance to update in storage.
+            fields: Optional Run attribute names (e.g. ``"metrics"``) to write.
+                    All columns are written when omitted; nothing is sent when empty.
             
         Raises:
-            ValueError: If run_name is missing from the run.
+            ValueError: If run_name is missing from the run or a field is unknown.
             RuntimeError: If the database operation fails.
         """
         record = run.to_record()
         run_name = record.get("name")
         if not run_name:
             raise ValueError("Run name is required to update a run")
+        if fields is not None:
+            columns = [_ATTRIBUTE_COLUMNS.get(name, name) for name in fields]
+            unknown = [column for column in columns if column not in record]
+            if unknown:
+                raise ValueError(f"Unknown run fields: {', '.join(unknown)}")
+            if not columns:
+                return
+            record = {column: record[column] for column in columns}
         
         try:
-            response = (self.db_connection
-                        .table(self.RUN_TABLE)
+            response = (self._table
                         .update(record)
                         .eq("name", run_name)
                         .execute() 
                         )
         except Exception as e:
             raise RuntimeError(f"Failed to update run: {str(e)}")
+        finally:
+            self._invalidate(run_name)
         
         if not response.data:
             raise RuntimeError("No run found to update")
@@ -189,6 +599,11 @@ class RunRepository:
     def end_run(self, run_name: str) -> None:
         """Mark a run as ended by setting its end_time to the current timestamp.
         
+        Uses the ``end_run_by_name`` database function when installed, so the
+        update and its outcome take one request whose plan the server reuses;
+        otherwise a conditional update is sent directly. Share one repository
+        across requests so a missing function is only probed once.
+        
         Args:
             run_name: The name of the run to end.
             
@@ -199,26 +614,70 @@ class RunRepository:
         if not run_name:
             raise ValueError("Run name is required to end a run")
         
-      
-        record = self.get_run(run_name)  
-        if record is None:
-            raise RuntimeError("Run not found")
-        
-        end_time = record.end_time
+        try:
+            status = None
+            if not self._end_run_function_missing:
+                try:
+                    response = self.db_connection.rpc(self.END_RUN_FUNCTION, {"run_name": run_name}).execute()
+                except APIError as e:
+                    if e.code != self.UNDEFINED_FUNCTION_CODE:
+                        raise RuntimeError(f"Failed to end run: {e.message}")
+                    self._end_run_function_missing = True
+                except Exception as e:
+                    raise RuntimeError(f"Failed to end run: {str(e)}")
+                else:
+                    status = response.data
+            if status is None:
+                status = self._end_run_with_queries(run_name)
+        finally:
+            self._invalidate(run_name)
         
-        if end_time:
+        if status == "not_found":
+            raise RuntimeError("Run not found")
+        if status == "already_ended":
             raise ValueError("Run has already been ended")
+    
+    def _end_run_with_queries(self, run_name: str) -> str:
+        """End a run without the database function.
         
-        now = datetime.now(timezone.utc)
-        now_naive_utc = now.replace(tzinfo=None)
-        self.db_connection.table(self.RUN_TABLE).update({"end_time": now_naive_utc.isoformat()}).eq("name", run_name).execute()
-        
-
+        Returns:
+            str: ``"ended"``, ``"already_ended"`` or ``"not_found"``, as the function reports.
             
+        Raises:
+            RuntimeError: If the database operation fails.
+        """
+        # Conditional update: only rows still open are touched, so one
+        # round-trip both checks and sets end_time. Only the count comes back.
+        try:
+            response = (
+                self._table
+                .update({"end_time": _utc_now_iso()}, count="exact", returning=ReturnMethod.minimal)
+                .eq("name", run_name)
+                .is_("end_time", "null")
+                .execute())
+        except Exception as e:
+            raise RuntimeError(f"Failed to end run: {str(e)}")
+        if response.count:
+            return "ended"
+        
+        # Nothing updated: tell a missing run from one that already ended.
+        try:
+            response = (
+                self._table
+                .select("name", head=True, count="exact")
+                .eq("name", run_name)
+                .execute())
+        except Exception as e:
+            raise RuntimeError(f"Failed to end run: {str(e)}")
+        return "already_ended" if response.count else "not_found"
         
     def batch_create(self, runs: list[Run]) -> None:
         """Add multiple runs to the storage system in a batch operation.
         
+        All records are stamped with the same start_time and sent through a
+        single bulk insert (chunked by the connection) rather than one request
+        per run. Inserted rows are not echoed back, since nothing reads them.
+        
         Args:
             runs: A list of Run instances to add to storage.
                   Invalid entries (runs without run_name) are skipped.
@@ -226,35 +685,89 @@ class RunRepository:
         Raises:
             RuntimeError: If any database operation fails.
         """
-        for run in runs:
-            if not run.run_name:
-                continue
-            else:
-                self.add_run(run)
+        start_time = _utc_now_iso()
+        records = [self._to_insert_record(run, start_time) for run in runs if run.run_name]
+        if not records:
+            return
+        try:
+            self.db_connection.bulk_insert(self.RUN_TABLE, records, BULK_CHUNK_SIZE, returning=ReturnMethod.minimal)
+        except Exception as e:
+            raise RuntimeError(f"Failed to add runs: {str(e)}")
     
     
-    def delete_run(self, run_name: str) -> None:
+    def delete_run(self, run_name: str) -> int:
         """Delete a run by its name.
         
+        The server is asked for the deleted row count only, not the deleted rows.
+        
         Args:
             run_name: The name of the run to delete.
             
         Returns:
             int: The number of deleted records (0 or 1).
+            
+        Raises:
+            ValueError: If run_name is empty or None.
+            RuntimeError: If the database operation fails.
         """
         if not run_name:
             raise ValueError("Run name is required to delete a run")
         
         try:
             response = (
-                self.db_connection
-                .table(self.RUN_TABLE)
-                .delete()
+                self._table
+                .delete(count="exact", returning=ReturnMethod.minimal)
                 .eq("name", run_name)
                 .execute()
             )
+        except APIError as e:
+            raise RuntimeError(f"Error deleting run: {e.message}")
         except Exception as e:
             raise RuntimeError(f"Error deleting run: {str(e)}")
+        finally:
+            if self._id_cache is not None:
+                self._id_cache.pop(run_name)
+            self._invalidate(run_name)
         
-        if not response.data:
-            raise RuntimeError("No run found to delete")
\ No newline at end of file
+        return response.count or 0
+    
+    def delete_runs(self, run_names: list[str]) -> int:
+        """Delete multiple runs by their names.
+        
+        Runs are deleted with one ``IN`` query per chunk of
+        ``BATCH_QUERY_CHUNK_SIZE`` names instead of one query per name.
+        
+        Args:
+            run_names: A list of run names to delete.
+                       Empty names and duplicates are skipped.
+            
+        Returns:
+            int: Total number of deleted records.
+            
+        Raises:
+            RuntimeError: If any database operation fails.
+        """
+        names = list(dict.fromkeys(name for name in run_names or [] if name))
+        
+        deleted_count = 0
+        for start in range(0, len(names), self.BATCH_QUERY_CHUNK_SIZE):
+            chunk = names[start:start + self.BATCH_QUERY_CHUNK_SIZE]
+            try:
+                response = (
+                    self._table
+                    .delete(count="exact", returning=ReturnMethod.minimal)
+                    .in_("name", chunk)
+                    .execute()
+                )
+            except APIError as e:
+                raise RuntimeError(f"Error deleting run: {e.message}")
+            except Exception as e:
+                raise RuntimeError(f"Error deleting run: {str(e)}")
+            finally:
+                for run_name in chunk:
+                    if self._id_cache is not None:
+                        self._id_cache.pop(run_name)
+                    self._invalidate(run_name)
+            deleted_count += response.count or 0
+        
+        return deleted_count
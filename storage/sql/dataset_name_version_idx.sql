@@ -0,0 +1,13 @@
+-- Composite index backing every (name, version) lookup on "Dataset".
+--
+-- DatasetRepository filters get_dataset, get_dataset_id, delete_dataset and the
+-- batch methods on name and version together; without this index each of those
+-- queries is a sequential scan. dataset_id is carried in the index so
+-- get_dataset_id is answered by an index-only scan.
+--
+-- Apply with the Supabase SQL editor or `psql -f`. Replaces the earlier
+-- dataset_name_version_idx, which did not include dataset_id.
+
+create index if not exists dataset_name_version_id_idx on "Dataset" (name, version) include (dataset_id);
+
+drop index if exists dataset_name_version_idx;
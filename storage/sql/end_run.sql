@@ -0,0 +1,28 @@
+-- End a run in one request.
+--
+-- Used by RunRepository.end_run. Sets end_time on the named run if it is still
+-- open and reports the outcome, so telling a missing run from an already ended
+-- one needs no second round-trip. As a plpgsql function its statements are
+-- planned once per database session and the plans are reused on later calls.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+create or replace function end_run_by_name(run_name text)
+returns text
+language plpgsql
+volatile
+as $$
+begin
+    update "Run"
+       set end_time = now()
+     where name = run_name
+       and end_time is null;
+    if found then
+        return 'ended';
+    end if;
+    if exists (select 1 from "Run" where name = run_name) then
+        return 'already_ended';
+    end if;
+    return 'not_found';
+end;
+$$;
@@ -0,0 +1,19 @@
+-- Resolve many (name, version) pairs in one request.
+--
+-- Used by DatasetRepository.batch_get. The keys are passed as a JSON array of
+-- {"name": ..., "version": ...} objects and joined against "Dataset" server-side,
+-- so the lookup is a single index-backed join with no URL-length limit.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+create or replace function get_datasets_by_keys(keys jsonb)
+returns setof "Dataset"
+language sql
+stable
+as $$
+    select d.*
+    from "Dataset" d
+    join jsonb_to_recordset(keys) as k(name text, version text)
+      on d.name = k.name
+     and d.version = k.version;
+$$;
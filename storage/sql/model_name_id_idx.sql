@@ -0,0 +1,12 @@
+-- Unique key that ModelRepository.iter_models (and so list_models) pages on.
+--
+-- model_name is not unique, so pages are keyed on (model_name, model_id): each
+-- page asks for rows after the last (model_name, model_id) seen. The column is
+-- added if the table does not have it yet, and the index backs both the keyset
+-- predicate and the order by. list_models fails until this has been applied.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+alter table "Model" add column if not exists model_id uuid not null default gen_random_uuid();
+
+create unique index if not exists model_name_model_id_idx on "Model" (model_name, model_id);
@@ -0,0 +1,11 @@
+-- Indexes on the name columns ModelRepository and RunRepository filter by.
+--
+-- get_model, model_exists, update_model, delete_model and batch_get look models
+-- up by model_name; get_run, end_run, delete_run and batch_get look runs up by
+-- name. Check the plans with `explain analyze` after applying.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+create index if not exists model_model_name_idx on "Model" (model_name);
+
+create index if not exists run_name_idx on "Run" (name);
@@ -0,0 +1,26 @@
+-- Track when each "Model" row last changed.
+--
+-- ModelRepository.list_models probes (row count, max(updated_at)) before
+-- re-downloading the table and reuses its cached list when neither changed.
+-- Without this column list_models simply skips the cache.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+alter table "Model" add column if not exists updated_at timestamptz not null default now();
+
+create index if not exists model_updated_at_idx on "Model" (updated_at desc);
+
+create or replace function set_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at = now();
+    return new;
+end;
+$$;
+
+drop trigger if exists model_set_updated_at on "Model";
+create trigger model_set_updated_at
+    before update on "Model"
+    for each row execute function set_updated_at();
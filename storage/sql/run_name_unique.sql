@@ -0,0 +1,10 @@
+-- Unique constraint on "Run".name.
+--
+-- RunRepository.save_run upserts with on_conflict=name, which PostgREST can
+-- only resolve against a unique constraint on that column. Remove duplicate
+-- run names before applying; once applied, model_run_name_idx's run_name_idx
+-- is redundant and may be dropped.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+alter table "Run" add constraint run_name_key unique (name);
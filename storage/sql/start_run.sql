@@ -0,0 +1,18 @@
+-- Insert a run stamped with the database clock, in one request.
+--
+-- Used by RunRepository.add_run. The run is passed as a JSON object keyed by
+-- the "Run" column names; its start_time is ignored and set to now() on the
+-- server, so runs from many clients share one clock. Returns the new run_id.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+create or replace function start_run(run jsonb)
+returns uuid
+language sql
+volatile
+as $$
+    insert into "Run" (dataset_id, name, actor, parameters, code_reference, metrics, start_time, end_time)
+    select r.dataset_id, r.name, r.actor, r.parameters, r.code_reference, r.metrics, now(), r.end_time
+    from jsonb_populate_record(null::"Run", run) as r
+    returning run_id;
+$$;
@@ -0,0 +1,198 @@
+import re
+from copy import deepcopy
+from dataclasses import dataclass
+import uuid
+from datetime import datetime
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+_OPERATORS = {
+    "eq": lambda left, right: left == right,
+    "gt": lambda left, right: left is not None and left > right,
+}
+
+
+def _unquote(value: str) -> str:
+    """Undo the double-quoting applied to PostgREST filter values."""
+    if value.startswith('"') and value.endswith('"'):
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def _split_terms(filters: str) -> list[str]:
+    """Split a PostgREST logical filter on its top-level commas."""
+    terms, depth, quoted, escaped, start = [], 0, False, False, 0
+    for index, char in enumerate(filters):
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            terms.append(filters[start:index])
+            start = index + 1
+    terms.append(filters[start:])
+    return terms
+
+
+def _parse_filter(term: str):
+    """Parse one ``column.op.value`` or ``and(...)`` term into a row predicate."""
+    if term.startswith("and(") and term.endswith(")"):
+        predicates = [_parse_filter(inner) for inner in _split_terms(term[4:-1])]
+        return lambda row: all(predicate(row) for predicate in predicates)
+    column, operator, value = term.split(".", 2)
+    compare, value = _OPERATORS[operator], _unquote(value)
+    return lambda row: compare(row.get(column), value)
+
+
+@dataclass(frozen=True, slots=True)
+class FakeResponse:
+    """Stand-in for a PostgREST API response."""
+
+    data: object = None
+    count: int | None = None
+
+
+class FakeQuery:
+    """Chainable in-memory query supporting the filters the repositories use."""
+
+    def __init__(self, rows: list[dict], method: str, columns: str = "*", count=None,
+                 returning=ReturnMethod.representation, values: dict | None = None):
+        self._rows = rows
+        self._method = method
+        self._columns = columns
+        self._count = count
+        self._returning = returning
+        self._values = values
+        self._filters = []
+        self._order = []
+        self._limit = None
+
+    def eq(self, column, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self._filters.append(lambda row: row.get(column) is not None and row[column] > value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self._filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def is_(self, column, value):
+        assert value == "null"
+        self._filters.append(lambda row: row.get(column) is None)
+        return self
+
+    def or_(self, filters):
+        predicates = [_parse_filter(term) for term in _split_terms(filters)]
+        self._filters.append(lambda row: any(predicate(row) for predicate in predicates))
+        return self
+
+    def order(self, column):
+        self._order.append(column)
+        return self
+
+    def limit(self, size):
+        self._limit = size
+        return self
+
+    def execute(self) -> FakeResponse:
+        matched = [row for row in self._rows if all(f(row) for f in self._filters)]
+        if self._order:
+            matched.sort(key=lambda row: tuple(row[column] for column in self._order))
+        if self._limit is not None:
+            matched = matched[:self._limit]
+
+        if self._method == "delete":
+            for row in matched:
+                self._rows.remove(row)
+        elif self._method == "update":
+            for row in matched:
+                row.update(self._values)
+
+        count = len(matched) if self._count else None
+        if self._method == "head" or self._returning == ReturnMethod.minimal:
+            return FakeResponse([], count)
+        if self._method == "select" and self._columns != "*":
+            columns = self._columns.split(",")
+            matched = [{column: row.get(column) for column in columns} for row in matched]
+        # Deep copies, like rows decoded from a fresh JSON response
+        return FakeResponse([deepcopy(row) for row in matched], count)
+
+
+class FakeTable:
+    """In-memory table exposing the query-builder entry points."""
+
+    def __init__(self, rows: list[dict]):
+        self._rows = rows
+
+    def select(self, columns="*", head=None, count=None):
+        return FakeQuery(self._rows, "head" if head else "select", columns, count)
+
+    def delete(self, count=None, returning=ReturnMethod.representation):
+        return FakeQuery(self._rows, "delete", count=count, returning=returning)
+
+    def update(self, values, count=None, returning=ReturnMethod.representation):
+        return FakeQuery(self._rows, "update", count=count, returning=returning, values=values)
+
+
+class FakeRpc:
+    """Deferred call to a fake database function."""
+
+    def __init__(self, function):
+        self._function = function
+
+    def execute(self) -> FakeResponse:
+        return FakeResponse(self._function())
+
+
+class FakeDBConnection:
+    """In-memory stand-in for DatabaseConnection, for round-trip repository tests.
+
+    Tables are plain lists of row dicts in ``tables``. Database functions are
+    registered in ``functions`` by name; calling any other one fails with the
+    PostgREST "function not found" error, as against a database where the
+    SQL in ``storage/sql/`` has not been applied.
+    """
+
+    def __init__(self):
+        self.tables: dict[str, list[dict]] = {}
+        self.functions: dict = {}
+
+    def table(self, table: str) -> FakeTable:
+        return FakeTable(self.tables.setdefault(table, []))
+
+    def insert(self, table: str, record: dict) -> dict:
+        self.tables.setdefault(table, []).append(dict(record))
+        return dict(record)
+
+    def bulk_insert(self, table: str, records: list[dict], chunk_size: int = 500,
+                    returning=ReturnMethod.representation) -> list[dict]:
+        self.tables.setdefault(table, []).extend(dict(record) for record in records)
+        return [dict(record) for record in records]
+
+    def rpc(self, function: str, params: dict) -> FakeRpc:
+        if function not in self.functions:
+            raise APIError({"code": "PGRST202", "message": f"Could not find the function {function}"})
+        return FakeRpc(lambda: self.functions[function](self, **params))
+
+
+def get_datasets_by_keys(connection: FakeDBConnection, keys: list[dict]) -> list[dict]:
+    """Fake of ``storage/sql/get_datasets_by_keys.sql``: join keys against the Dataset table."""
+    wanted = {(key["name"], key["version"]) for key in keys}
+    return [dict(row) for row in connection.tables.get("Dataset", []) if (row["name"], row["version"]) in wanted]
+
+
+def start_run(connection: FakeDBConnection, run: dict) -> str:
+    """Fake of ``storage/sql/start_run.sql``: insert the run stamped with the current time."""
+    run_id = str(uuid.uuid4())
+    connection.tables.setdefault("Run", []).append({**run, "run_id": run_id, "start_time": datetime.now().isoformat()})
+    return run_id
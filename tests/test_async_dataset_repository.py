@@ -0,0 +1,177 @@
+import asyncio
+import pytest
+from unittest.mock import Mock, MagicMock, AsyncMock
+from storage.async_dataset_repository import AsyncDatasetRepository
+from core.dataset import Dataset
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+
+class TestAsyncDatasetRepository:
+    """Test suite for AsyncDatasetRepository class."""
+
+    @pytest.fixture
+    def mock_db_connection(self):
+        """Create a mock async database connection."""
+        connection = Mock()
+        connection.execute = AsyncMock()
+        connection.insert = AsyncMock()
+        connection.bulk_insert = AsyncMock()
+        return connection
+
+    @pytest.fixture
+    def repository(self, mock_db_connection):
+        """Create an AsyncDatasetRepository instance with mocked database connection."""
+        return AsyncDatasetRepository(mock_db_connection)
+
+    @pytest.fixture
+    def sample_dataset(self):
+        """Create a sample dataset for testing."""
+        return Dataset(
+            name="test_dataset",
+            version="1.0.0",
+            source="s3://bucket/data.csv",
+            description="Test dataset"
+        )
+
+    def _response(self, data):
+        """Build a mock API response carrying the given rows."""
+        response = MagicMock()
+        response.data = data
+        return response
+
+    def test_add_dataset_success(self, repository, sample_dataset, mock_db_connection):
+        """Test successfully adding a dataset."""
+        asyncio.run(repository.add_dataset(sample_dataset))
+
+        mock_db_connection.insert.assert_awaited_once_with("Dataset", sample_dataset.to_record())
+
+    def test_add_dataset_always_inserts(self, repository, sample_dataset, mock_db_connection):
+        """Test re-adding a dataset still reaches the database, so its errors surface."""
+        asyncio.run(repository.add_dataset(sample_dataset))
+        asyncio.run(repository.add_dataset(sample_dataset))
+
+        assert mock_db_connection.insert.await_count == 2
+
+    def test_get_dataset_success(self, repository, mock_db_connection):
+        """Test retrieving a dataset and serving the repeat lookup from cache."""
+        mock_db_connection.execute.return_value = self._response([{
+            "name": "my_dataset",
+            "version": "2.0.0",
+            "source": "s3://bucket/data.csv",
+            "description": None
+        }])
+
+        first = asyncio.run(repository.get_dataset("my_dataset", "2.0.0"))
+        second = asyncio.run(repository.get_dataset("my_dataset", "2.0.0"))
+
+        assert first.name == "my_dataset"
+        assert first is not second
+        assert first.to_record() == second.to_record()
+        mock_db_connection.execute.assert_awaited_once()
+
+    def test_get_dataset_not_found(self, repository, mock_db_connection):
+        """Test retrieving a dataset that doesn't exist returns None."""
+        mock_db_connection.execute.return_value = self._response([])
+
+        assert asyncio.run(repository.get_dataset("missing", "1.0.0")) is None
+
+    def test_delete_dataset_missing_name(self, repository):
+        """Test delete_dataset raises ValueError when name is missing."""
+        with pytest.raises(ValueError) as exc_info:
+            asyncio.run(repository.delete_dataset("", "1.0.0"))
+
+        assert "Both name and version are required" in str(exc_info.value)
+
+    def test_delete_dataset_returns_count(self, repository, mock_db_connection):
+        """Test delete_dataset asks only for the deleted row count."""
+        response = self._response([])
+        response.count = 1
+        mock_db_connection.execute.return_value = response
+
+        assert asyncio.run(repository.delete_dataset("test_dataset", "1.0.0")) == 1
+        mock_db_connection.table.return_value.delete.assert_called_once_with(
+            count="exact", returning=ReturnMethod.minimal
+        )
+
+    def test_batch_get_success(self, repository, mock_db_connection):
+        """Test batch_get resolves all pairs with one RPC call in request order."""
+        mock_db_connection.execute.return_value = self._response([
+            {"name": "dataset2", "version": "2.0.0", "source": "s3://b", "description": None},
+            {"name": "dataset1", "version": "1.0.0", "source": "s3://a", "description": None},
+        ])
+
+        datasets, count = asyncio.run(repository.batch_get([("dataset1", "1.0.0"), ("dataset2", "2.0.0")]))
+
+        assert count == 2
+        assert [dataset.name for dataset in datasets] == ["dataset1", "dataset2"]
+        mock_db_connection.execute.assert_awaited_once()
+        mock_db_connection.rpc.assert_called_once()
+
+    def test_batch_get_falls_back_to_concurrent_in_queries(self, repository, mock_db_connection):
+        """Test batch_get sends one IN query per chunk when the RPC is missing."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 1
+        mock_db_connection.execute.side_effect = [
+            APIError({"code": "PGRST202", "message": "Could not find the function"}),
+            self._response([{"name": "dataset1", "version": "1.0.0", "source": "s3://a", "description": None}]),
+            self._response([{"name": "dataset2", "version": "2.0.0", "source": "s3://b", "description": None}]),
+        ]
+
+        datasets, count = asyncio.run(repository.batch_get([("dataset1", "1.0.0"), ("dataset2", "2.0.0")]))
+
+        assert count == 2
+        assert mock_db_connection.execute.await_count == 3
+
+    def test_batch_get_remembers_missing_function(self, repository, mock_db_connection):
+        """Test batch_get stops calling the RPC once it is known to be missing."""
+        mock_db_connection.execute.side_effect = [
+            APIError({"code": "PGRST202", "message": "Could not find the function"}),
+            self._response([]),
+            self._response([]),
+        ]
+
+        asyncio.run(repository.batch_get([("dataset1", "1.0.0")]))
+        asyncio.run(repository.batch_get([("dataset2", "2.0.0")]))
+
+        mock_db_connection.rpc.assert_called_once()
+        assert mock_db_connection.execute.await_count == 3
+
+    def test_batch_get_empty_list(self, repository, mock_db_connection):
+        """Test batch_get with empty list makes no requests."""
+        datasets, count = asyncio.run(repository.batch_get([]))
+
+        assert (datasets, count) == ([], 0)
+        mock_db_connection.execute.assert_not_awaited()
+
+    def test_batch_create_success(self, repository, sample_dataset, mock_db_connection):
+        """Test batch_create sends all records through one bulk insert."""
+        asyncio.run(repository.batch_create([sample_dataset]))
+
+        mock_db_connection.bulk_insert.assert_awaited_once_with(
+            "Dataset", [sample_dataset.to_record()], returning=ReturnMethod.minimal
+        )
+
+    def test_batch_delete_sums_chunks(self, repository, mock_db_connection):
+        """Test batch_delete deletes chunks concurrently and sums the deleted rows."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 1
+        deleted, missing = self._response([]), self._response([])
+        deleted.count, missing.count = 1, 0
+        mock_db_connection.execute.side_effect = [deleted, missing]
+
+        total_deleted = asyncio.run(repository.batch_delete([("dataset1", "1.0.0"), ("missing", "1.0.0"), ("", "x")]))
+
+        assert total_deleted == 1
+        assert mock_db_connection.execute.await_count == 2
+
+    def test_batch_delete_invalidates_cache_on_error(self, repository, mock_db_connection):
+        """Test a failed batch_delete still evicts its pairs, since the server may have deleted them."""
+        mock_db_connection.execute.return_value = self._response([{
+            "name": "dataset1", "version": "1.0.0", "source": "s3://a", "description": None
+        }])
+        asyncio.run(repository.get_dataset("dataset1", "1.0.0"))
+        mock_db_connection.execute.side_effect = TimeoutError("read timed out")
+
+        with pytest.raises(RuntimeError, match="Error deleting dataset"):
+            asyncio.run(repository.batch_delete([("dataset1", "1.0.0")]))
+
+        assert ("dataset1", "1.0.0") not in repository._cache
@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from unittest.mock import Mock, MagicMock, AsyncMock
+from storage.async_model_repository import AsyncModelRepository
+
+
+class TestAsyncModelRepository:
+    """Test suite for AsyncModelRepository class."""
+
+    @pytest.fixture
+    def mock_db_connection(self):
+        """Create a mock async database connection."""
+        connection = Mock()
+        connection.execute = AsyncMock()
+        return connection
+
+    @pytest.fixture
+    def repository(self, mock_db_connection):
+        """Create an AsyncModelRepository instance with mocked database connection."""
+        return AsyncModelRepository(mock_db_connection)
+
+    def _response(self, data):
+        """Build a mock API response carrying the given rows."""
+        response = MagicMock()
+        response.data = data
+        return response
+
+    def _model_row(self, name):
+        """Build a stored model row for the given name."""
+        return {
+            "artifact_uri": f"s3://bucket/{name}.pkl",
+            "model_name": name,
+            "run_id": "run_1",
+            "lifecycle_stage": "registered"
+        }
+
+    def test_get_model_success(self, repository, mock_db_connection):
+        """Test successfully retrieving a model by name."""
+        mock_db_connection.execute.return_value = self._response([self._model_row("model1")])
+
+        model = asyncio.run(repository.get_model("model1"))
+
+        assert model.model_name == "model1"
+        mock_db_connection.execute.assert_awaited_once()
+
+    def test_get_model_missing_name(self, repository):
+        """Test get_model raises ValueError when name is missing."""
+        with pytest.raises(ValueError) as exc_info:
+            asyncio.run(repository.get_model(""))
+
+        assert "Model name is required" in str(exc_info.value)
+
+    def test_get_model_with_error(self, repository, mock_db_connection):
+        """Test get_model wraps database failures in RuntimeError."""
+        mock_db_connection.execute.side_effect = Exception("Database connection failed")
+
+        with pytest.raises(RuntimeError) as exc_info:
+            asyncio.run(repository.get_model("model1"))
+
+        assert "Failed to retrieve model: Database connection failed" in str(exc_info.value)
+
+    def test_independent_reads_gather(self, repository, mock_db_connection):
+        """Test independent reads can be awaited together with asyncio.gather."""
+        missing = self._response([])
+        missing.count = 0
+        mock_db_connection.execute.side_effect = [
+            self._response([self._model_row("model1")]),
+            missing,
+        ]
+
+        async def lookup():
+            return await asyncio.gather(
+                repository.get_artifact_uri("model1"),
+                repository.model_exists("missing"),
+            )
+
+        artifact_uri, exists = asyncio.run(lookup())
+
+        assert artifact_uri == "s3://bucket/model1.pkl"
+        assert exists is False
+
+    def test_table_builder_reused(self, repository, mock_db_connection):
+        """Test the table query builder is created once and reused across queries."""
+        mock_db_connection.execute.return_value = self._response([self._model_row("model1")])
+
+        asyncio.run(repository.get_model("model1"))
+        asyncio.run(repository.get_model("model1"))
+
+        mock_db_connection.table.assert_called_once_with("Model")
+
+    def test_batch_get_success(self, repository, mock_db_connection):
+        """Test batch_get returns models in request order from one query."""
+        mock_db_connection.execute.return_value = self._response([
+            self._model_row("model2"),
+            self._model_row("model1"),
+        ])
+
+        models = asyncio.run(repository.batch_get(["model1", "", "model2", "missing"]))
+
+        assert [model.model_name for model in models] == ["model1", "model2"]
+        mock_db_connection.execute.assert_awaited_once()
+
+    def test_batch_get_non_string_name(self, repository):
+        """Test batch_get raises ValueError when model name is not a string."""
+        with pytest.raises(ValueError) as exc_info:
+            asyncio.run(repository.batch_get([123]))
+
+        assert "Model names must be strings" in str(exc_info.value)
@@ -0,0 +1,136 @@
+import asyncio
+import pytest
+from unittest.mock import Mock, MagicMock, AsyncMock
+from storage.async_run_repository import AsyncRunRepository
+from core.run import Run
+from datetime import datetime
+from postgrest.types import ReturnMethod
+
+
+class TestAsyncRunRepository:
+    """Test suite for AsyncRunRepository class."""
+
+    @pytest.fixture
+    def mock_db_connection(self):
+        """Create a mock async database connection."""
+        connection = Mock()
+        connection.execute = AsyncMock()
+        connection.insert = AsyncMock()
+        connection.bulk_insert = AsyncMock()
+        return connection
+
+    @pytest.fixture
+    def repository(self, mock_db_connection):
+        """Create an AsyncRunRepository instance with mocked database connection."""
+        return AsyncRunRepository(mock_db_connection)
+
+    def _response(self, data):
+        """Build a mock API response carrying the given rows."""
+        response = MagicMock()
+        response.data = data
+        return response
+
+    def _run(self, name):
+        """Build a run with the given name."""
+        return Run(
+            dataset_id="dataset_1",
+            run_name=name,
+            actor="user",
+            parameters={},
+            start_time=datetime(2024, 1, 1, 12, 0, 0)
+        )
+
+    def _run_row(self, name):
+        """Build a stored run row for the given name."""
+        return {
+            "dataset_id": "dataset_1",
+            "name": name,
+            "actor": "user",
+            "parameters": {},
+            "code_reference": None,
+            "metrics": {},
+            "start_time": "2024-01-01T12:00:00",
+            "end_time": None
+        }
+
+    def test_add_run_caches_run_id(self, repository, mock_db_connection):
+        """Test add_run returns the generated UUID and get_run_id reuses it."""
+        mock_db_connection.insert.return_value = {"run_id": "uuid-1"}
+
+        assert asyncio.run(repository.add_run(self._run("run1"))) == "uuid-1"
+        assert asyncio.run(repository.get_run_id("run1")) == "uuid-1"
+        mock_db_connection.execute.assert_not_awaited()
+
+    def test_get_run_success(self, repository, mock_db_connection):
+        """Test successfully retrieving a run by name."""
+        mock_db_connection.execute.return_value = self._response([self._run_row("run1")])
+
+        run = asyncio.run(repository.get_run("run1"))
+
+        assert run.run_name == "run1"
+        mock_db_connection.execute.assert_awaited_once()
+
+    def test_get_run_missing_name(self, repository):
+        """Test get_run raises ValueError when name is missing."""
+        with pytest.raises(ValueError) as exc_info:
+            asyncio.run(repository.get_run(""))
+
+        assert "Run name is required to retrieve a run" in str(exc_info.value)
+
+    def test_get_many_runs_lookups_concurrently(self, repository, mock_db_connection):
+        """Test get_many issues one query per distinct name and maps misses to None."""
+        in_flight = 0
+        peak = 0
+
+        async def execute(name):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return self._response([self._run_row(name)] if name == "run1" else [])
+
+        # Let each query resolve to the name it filters on so execute can answer per name
+        select = mock_db_connection.table.return_value.select.return_value
+        select.eq.side_effect = lambda column, value: Mock(limit=Mock(return_value=value))
+        mock_db_connection.execute.side_effect = execute
+
+        result = asyncio.run(repository.get_many(["run1", "missing", "run1"]))
+
+        assert list(result) == ["run1", "missing"]
+        assert result["run1"].run_name == "run1"
+        assert result["missing"] is None
+        assert peak == 2
+
+    def test_batch_get_skips_failed_chunks(self, repository, mock_db_connection):
+        """Test batch_get queries chunks concurrently and skips the ones that fail."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 1
+        mock_db_connection.execute.side_effect = [
+            self._response([self._run_row("run1")]),
+            Exception("Database error"),
+        ]
+
+        runs, count = asyncio.run(repository.batch_get(["run1", "", "run2"]))
+
+        assert count == 1
+        assert runs[0].run_name == "run1"
+        assert mock_db_connection.execute.await_count == 2
+
+    def test_batch_get_strict_raises(self, repository, mock_db_connection):
+        """Test batch_get raises on a failed chunk when strict is set."""
+        mock_db_connection.execute.side_effect = Exception("Database error")
+
+        with pytest.raises(RuntimeError) as exc_info:
+            asyncio.run(repository.batch_get(["run1"], strict=True))
+
+        assert "Error retrieving runs: Database error" in str(exc_info.value)
+
+    def test_batch_create_shares_start_time(self, repository, mock_db_connection):
+        """Test batch_create sends all runs through one bulk insert with one start_time."""
+        asyncio.run(repository.batch_create([self._run("run1"), self._run("run2")]))
+
+        table, records = mock_db_connection.bulk_insert.await_args.args
+        assert table == "Run"
+        assert [record["name"] for record in records] == ["run1", "run2"]
+        assert records[0]["start_time"] == records[1]["start_time"]
+        assert mock_db_connection.bulk_insert.await_args.kwargs["returning"] == ReturnMethod.minimal
@@ -1,7 +1,11 @@
+import threading
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 from storage.dataset_repository import DatasetRepository
 from core.dataset import Dataset
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+from tests.fakes import FakeDBConnection, get_datasets_by_keys
 
 
 class TestDatasetRepository:
@@ -54,6 +58,23 @@ class TestDatasetRepository:
         }
         mock_db_connection.insert.assert_called_once_with("Dataset", expected_record)
     
+    def test_datasets_hash_by_identity(self, sample_dataset):
+        """Test datasets can be used in sets and as dict keys, compared by identity."""
+        copy = Dataset(**{field: getattr(sample_dataset, field) for field in Dataset.RECORD_KEYS})
+        
+        assert len({sample_dataset, copy, sample_dataset}) == 2
+    
+    def test_add_dataset_sends_fresh_record(self, repository, sample_dataset, mock_db_connection):
+        """Test each write gets its own record, so changes made downstream do not leak into retries."""
+        mock_db_connection.insert.side_effect = lambda table, record: record.update(dataset_id="uuid-1")
+        
+        repository.add_dataset(sample_dataset)
+        repository.add_dataset(sample_dataset)
+        
+        first, second = (c.args[1] for c in mock_db_connection.insert.call_args_list)
+        assert first is not second
+        assert "dataset_id" not in sample_dataset.to_record()
+    
     def test_get_dataset_success(self, repository, mock_db_connection):
         """Test successfully retrieving a dataset by name and version."""
         mock_response = MagicMock()
@@ -82,7 +103,7 @@ class TestDatasetRepository:
         assert result.description == "Test dataset"
         
         mock_db_connection.table.assert_called_once_with("Dataset")
-        mock_query.select.assert_called_once_with("*")
+        mock_query.select.assert_called_once_with("name,version,source,description")
         mock_query.eq.assert_any_call("name", "test_dataset")
         mock_query.eq.assert_any_call("version", "1.0.0")
         mock_query.execute.assert_called_once()
@@ -138,13 +159,150 @@ class TestDatasetRepository:
         repository.get_dataset("my_dataset", "2.0.0")
         
         mock_db_connection.table.assert_called_once_with("Dataset")
-        mock_query.select.assert_called_once_with("*")
+        mock_query.select.assert_called_once_with("name,version,source,description")
         assert mock_query.eq.call_count == 2
         calls = [call[0] for call in mock_query.eq.call_args_list]
         assert ("name", "my_dataset") in calls
         assert ("version", "2.0.0") in calls
         mock_query.execute.assert_called_once()
     
+    def _mock_get_query(self, mock_db_connection, data):
+        """Wire mock_db_connection so select/eq/execute returns the given rows."""
+        mock_response = MagicMock()
+        mock_response.data = data
+        
+        mock_query = MagicMock()
+        mock_query.execute.return_value = mock_response
+        mock_query.eq.return_value = mock_query
+        mock_query.select.return_value = mock_query
+        mock_query.delete.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        return mock_query
+    
+    def test_get_dataset_served_from_cache(self, repository, mock_db_connection):
+        """Test repeated get_dataset calls for the same pair hit the database once."""
+        mock_query = self._mock_get_query(mock_db_connection, [{
+            "name": "my_dataset",
+            "version": "2.0.0",
+            "source": "s3://bucket/data.csv",
+            "description": None
+        }])
+        
+        first = repository.get_dataset("my_dataset", "2.0.0")
+        second = repository.get_dataset("my_dataset", "2.0.0")
+        
+        assert first is not second
+        assert first.to_record() == second.to_record()
+        mock_query.execute.assert_called_once()
+    
+    def test_get_dataset_does_not_cache_misses(self, repository, mock_db_connection):
+        """Test a missing dataset is looked up again on the next call."""
+        mock_query = self._mock_get_query(mock_db_connection, [])
+        
+        assert repository.get_dataset("missing", "1.0.0") is None
+        assert repository.get_dataset("missing", "1.0.0") is None
+        assert mock_query.execute.call_count == 2
+    
+    def test_delete_dataset_invalidates_cache(self, repository, mock_db_connection):
+        """Test deleting a dataset evicts it from the get_dataset cache."""
+        mock_query = self._mock_get_query(mock_db_connection, [{
+            "name": "my_dataset",
+            "version": "2.0.0",
+            "source": "s3://bucket/data.csv",
+            "description": None
+        }])
+        
+        repository.get_dataset("my_dataset", "2.0.0")
+        repository.delete_dataset("my_dataset", "2.0.0")
+        repository.get_dataset("my_dataset", "2.0.0")
+        
+        assert mock_query.execute.call_count == 3
+    
+    def test_get_dataset_id_served_from_cache(self, repository, mock_db_connection):
+        """Test repeated get_dataset_id calls hit the database once until the cache is cleared."""
+        mock_query = self._mock_get_query(mock_db_connection, [{"dataset_id": "uuid-1"}])
+        
+        assert repository.get_dataset_id("my_dataset", "2.0.0") == "uuid-1"
+        assert repository.get_dataset_id("my_dataset", "2.0.0") == "uuid-1"
+        mock_query.execute.assert_called_once()
+        
+        repository.clear_cache()
+        repository.get_dataset_id("my_dataset", "2.0.0")
+        assert mock_query.execute.call_count == 2
+    
+    def test_batch_get_uses_and_fills_cache(self, repository, mock_db_connection):
+        """Test batch_get requests only uncached pairs and caches what it fetches."""
+        self._mock_get_query(mock_db_connection, [{
+            "name": "dataset1",
+            "version": "1.0.0",
+            "source": "s3://bucket/data1.csv",
+            "description": None
+        }])
+        cached = repository.get_dataset("dataset1", "1.0.0")
+        mock_rpc = self._mock_rpc(mock_db_connection, [{
+            "name": "dataset2",
+            "version": "2.0.0",
+            "source": "s3://bucket/data2.csv",
+            "description": None
+        }])
+        
+        datasets, count = repository.batch_get([("dataset2", "2.0.0"), ("dataset1", "1.0.0")])
+        
+        assert count == 2
+        assert datasets[1].to_record() == cached.to_record()
+        mock_db_connection.rpc.assert_called_once_with(
+            "get_datasets_by_keys", {"keys": [{"name": "dataset2", "version": "2.0.0"}]}
+        )
+        
+        assert repository.get_dataset("dataset2", "2.0.0").to_record() == datasets[0].to_record()
+        assert repository.batch_get([("dataset1", "1.0.0"), ("dataset2", "2.0.0")])[1] == 2
+        mock_rpc.execute.assert_called_once()
+    
+    def test_cache_shared_across_threads(self, repository, mock_db_connection):
+        """Test concurrent reads, writes and deletes keep the shared cache consistent."""
+        self._mock_get_query(mock_db_connection, [{
+            "name": "dataset1",
+            "version": "1.0.0",
+            "source": "s3://bucket/data1.csv",
+            "description": None
+        }])
+        repository._cache.maxsize = 2
+        errors = []
+        
+        def worker(index):
+            try:
+                for i in range(200):
+                    key = (f"dataset{(index + i) % 4}", "1.0.0")
+                    repository.get_dataset(*key)
+                    repository.add_dataset(Dataset(name=key[0], version=key[1], source="s3://bucket/data.csv"))
+                    repository.delete_dataset(*key)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert len(repository._cache) <= 2
+    
+    def test_get_dataset_cache_disabled(self, mock_db_connection):
+        """Test get_dataset always queries the database when caching is disabled."""
+        repository = DatasetRepository(mock_db_connection, cache=False)
+        mock_query = self._mock_get_query(mock_db_connection, [{
+            "name": "my_dataset",
+            "version": "2.0.0",
+            "source": "s3://bucket/data.csv",
+            "description": None
+        }])
+        
+        repository.get_dataset("my_dataset", "2.0.0")
+        repository.get_dataset("my_dataset", "2.0.0")
+        
+        assert mock_query.execute.call_count == 2
+    
     def test_add_dataset_with_minimal_dataset(self, repository, mock_db_connection):
         """Test adding a dataset with only required fields."""
         minimal_dataset = Dataset(
@@ -167,7 +325,8 @@ class TestDatasetRepository:
         """Test successfully deleting a dataset by name and version."""
         mock_response = MagicMock()
         mock_response.error = None
-        mock_response.data = [{"name": "test_dataset", "version": "1.0.0"}]
+        mock_response.data = []
+        mock_response.count = 1
         
         mock_query = MagicMock()
         mock_query.execute.return_value = mock_response
@@ -179,7 +338,7 @@ class TestDatasetRepository:
         
         assert result == 1
         mock_db_connection.table.assert_called_once_with("Dataset")
-        mock_query.delete.assert_called_once()
+        mock_query.delete.assert_called_once_with(count="exact", returning=ReturnMethod.minimal)
         mock_query.eq.assert_any_call("name", "test_dataset")
         mock_query.eq.assert_any_call("version", "1.0.0")
         mock_query.execute.assert_called_once()
@@ -189,6 +348,7 @@ class TestDatasetRepository:
         mock_response = MagicMock()
         mock_response.error = None
         mock_response.data = []
+        mock_response.count = 0
         
         mock_query = MagicMock()
         mock_query.execute.return_value = mock_response
@@ -264,38 +424,36 @@ class TestDatasetRepository:
         repository.delete_dataset("my_dataset", "2.0.0")
         
         mock_db_connection.table.assert_called_once_with("Dataset")
-        mock_query.delete.assert_called_once()
+        mock_query.delete.assert_called_once_with(count="exact", returning=ReturnMethod.minimal)
         assert mock_query.eq.call_count == 2
         calls = [call[0] for call in mock_query.eq.call_args_list]
         assert ("name", "my_dataset") in calls
         assert ("version", "2.0.0") in calls
         mock_query.execute.assert_called_once()
     
+    def _mock_rpc(self, mock_db_connection, data):
+        """Wire mock_db_connection so rpc(...).execute() returns the given rows."""
+        mock_response = MagicMock()
+        mock_response.data = data
+        mock_db_connection.rpc.return_value.execute.return_value = mock_response
+        return mock_db_connection.rpc.return_value
+    
     def test_batch_get_success(self, repository, mock_db_connection):
-        """Test successfully retrieving multiple datasets."""
-        mock_response_1 = MagicMock()
-        mock_response_1.error = None
-        mock_response_1.data = [{
-            "name": "dataset1",
-            "version": "1.0.0",
-            "source": "s3://bucket/data1.csv",
-            "description": "Dataset 1"
-        }]
-        
-        mock_response_2 = MagicMock()
-        mock_response_2.error = None
-        mock_response_2.data = [{
-            "name": "dataset2",
-            "version": "2.0.0",
-            "source": "s3://bucket/data2.csv",
-            "description": "Dataset 2"
-        }]
-        
-        mock_query = MagicMock()
-        mock_query.execute.side_effect = [mock_response_1, mock_response_2]
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+        """Test successfully retrieving multiple datasets in a single RPC call."""
+        mock_rpc = self._mock_rpc(mock_db_connection, [
+            {
+                "name": "dataset2",
+                "version": "2.0.0",
+                "source": "s3://bucket/data2.csv",
+                "description": "Dataset 2"
+            },
+            {
+                "name": "dataset1",
+                "version": "1.0.0",
+                "source": "s3://bucket/data1.csv",
+                "description": "Dataset 1"
+            }
+        ])
         
         names_versions = [("dataset1", "1.0.0"), ("dataset2", "2.0.0")]
         datasets, count = repository.batch_get(names_versions)
@@ -304,51 +462,138 @@ class TestDatasetRepository:
         assert len(datasets) == 2
         assert datasets[0].name == "dataset1"
         assert datasets[1].name == "dataset2"
+        mock_rpc.execute.assert_called_once()
+        mock_db_connection.rpc.assert_called_once_with("get_datasets_by_keys", {"keys": [
+            {"name": "dataset1", "version": "1.0.0"},
+            {"name": "dataset2", "version": "2.0.0"}
+        ]})
+    
+    def test_batch_get_builds_slotted_datasets(self, repository, mock_db_connection):
+        """Test batch_get rows are slot-backed Datasets with no per-instance __dict__."""
+        self._mock_rpc(mock_db_connection, [{
+            "name": "dataset1",
+            "version": "1.0.0",
+            "source": "s3://bucket/data1.csv",
+            "description": None
+        }])
+        
+        datasets, _ = repository.batch_get([("dataset1", "1.0.0")])
+        
+        assert not hasattr(datasets[0], "__dict__")
+        assert set(Dataset.__slots__) == set(Dataset.RECORD_KEYS)
+    
+    def test_batch_get_iter_fetches_chunks_lazily(self, repository, mock_db_connection):
+        """Test batch_get_iter requests the next chunk only once the previous one is consumed."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 2
+        rows = [
+            {"name": f"dataset{i}", "version": "1.0.0", "source": "s3://bucket/data.csv", "description": None}
+            for i in range(3)
+        ]
+        mock_db_connection.rpc.return_value.execute.side_effect = [
+            MagicMock(data=rows[:2]),
+            MagicMock(data=rows[2:]),
+        ]
+        
+        datasets = repository.batch_get_iter([(f"dataset{i}", "1.0.0") for i in range(3)] + [("", "x")])
+        mock_db_connection.rpc.assert_not_called()
+        
+        assert next(datasets).name == "dataset0"
+        assert mock_db_connection.rpc.call_count == 1
+        assert [dataset.name for dataset in datasets] == ["dataset1", "dataset2"]
+        assert mock_db_connection.rpc.call_count == 2
     
     def test_batch_get_partial_success(self, repository, mock_db_connection):
         """Test batch_get when some datasets are not found."""
-        mock_response_1 = MagicMock()
-        mock_response_1.error = None
-        mock_response_1.data = [{
+        self._mock_rpc(mock_db_connection, [{
             "name": "dataset1",
             "version": "1.0.0",
             "source": "s3://bucket/data1.csv",
             "description": None
-        }]
+        }])
         
-        mock_response_2 = MagicMock()
-        mock_response_2.error = None
-        mock_response_2.data = []
+        names_versions = [("dataset1", "1.0.0"), ("nonexistent", "1.0.0")]
+        datasets, count = repository.batch_get(names_versions)
         
+        assert count == 1
+        assert len(datasets) == 1
+        assert datasets[0].name == "dataset1"
+    
+    def _mock_fallback_query(self, mock_db_connection, rows):
+        """Make the RPC report a missing function and wire the fallback select chain."""
+        mock_db_connection.rpc.return_value.execute.side_effect = APIError(
+            {"code": "PGRST202", "message": "Could not find the function"}
+        )
         mock_query = MagicMock()
-        mock_query.execute.side_effect = [mock_response_1, mock_response_2]
-        mock_query.eq.return_value = mock_query
+        mock_query.execute.return_value = MagicMock(data=rows)
+        mock_query.in_.return_value = mock_query
+        mock_query.or_.return_value = mock_query
         mock_query.select.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
+        return mock_query
+    
+    def test_batch_get_falls_back_to_in_query(self, repository, mock_db_connection):
+        """Test batch_get uses IN filters when they match exactly the requested pairs."""
+        mock_query = self._mock_fallback_query(mock_db_connection, [
+            {"name": "dataset1", "version": "2.0.0", "source": "s3://b", "description": None},
+            {"name": "dataset1", "version": "1.0.0", "source": "s3://a", "description": None},
+        ])
         
-        names_versions = [("dataset1", "1.0.0"), ("nonexistent", "1.0.0")]
+        datasets, count = repository.batch_get([("dataset1", "1.0.0"), ("dataset1", "2.0.0")])
+        
+        assert count == 2
+        assert [dataset.version for dataset in datasets] == ["1.0.0", "2.0.0"]
+        mock_query.execute.assert_called_once()
+        in_calls = {args[0]: args[1] for args, _ in mock_query.in_.call_args_list}
+        assert in_calls == {"name": ["dataset1"], "version": ["1.0.0", "2.0.0"]}
+        mock_query.or_.assert_not_called()
+    
+    def test_batch_get_falls_back_to_exact_pair_filter(self, repository, mock_db_connection):
+        """Test batch_get matches exact pairs when IN filters would also match other pairs."""
+        mock_query = self._mock_fallback_query(mock_db_connection, [
+            {"name": "dataset1", "version": "1.0.0", "source": "s3://a", "description": None},
+        ])
+        
+        names_versions = [("dataset1", "1.0.0"), ("dataset2", "2.0.0")]
         datasets, count = repository.batch_get(names_versions)
         
         assert count == 1
-        assert len(datasets) == 1
-        assert datasets[0].name == "dataset1"
+        assert datasets[0].version == "1.0.0"
+        mock_query.execute.assert_called_once()
+        mock_query.or_.assert_called_once_with(
+            'and(name.eq."dataset1",version.eq."1.0.0"),and(name.eq."dataset2",version.eq."2.0.0")'
+        )
+        mock_query.in_.assert_not_called()
+    
+    def test_batch_get_remembers_missing_function(self, repository, mock_db_connection):
+        """Test batch_get stops calling the RPC once it is known to be missing."""
+        mock_query = self._mock_fallback_query(mock_db_connection, [])
+        
+        repository.batch_get([("dataset1", "1.0.0")])
+        repository.batch_get([("dataset2", "2.0.0")])
+        
+        mock_db_connection.rpc.assert_called_once()
+        assert mock_query.execute.call_count == 2
+    
+    def test_batch_get_rpc_error(self, repository, mock_db_connection):
+        """Test batch_get raises RuntimeError for RPC errors other than a missing function."""
+        mock_db_connection.rpc.return_value.execute.side_effect = APIError(
+            {"code": "57014", "message": "canceling statement due to statement timeout"}
+        )
+        
+        with pytest.raises(RuntimeError) as exc_info:
+            repository.batch_get([("dataset1", "1.0.0")])
+        
+        assert "Error retrieving dataset: canceling statement" in str(exc_info.value)
+        mock_db_connection.table.assert_not_called()
     
     def test_batch_get_skips_invalid_entries(self, repository, mock_db_connection):
         """Test batch_get skips entries with empty name or version."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = [{
+        mock_rpc = self._mock_rpc(mock_db_connection, [{
             "name": "dataset1",
             "version": "1.0.0",
             "source": "s3://bucket/data1.csv",
             "description": None
-        }]
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+        }])
         
         names_versions = [("dataset1", "1.0.0"), ("", "1.0.0"), ("dataset2", "")]
         datasets, count = repository.batch_get(names_versions)
@@ -356,29 +601,25 @@ class TestDatasetRepository:
         assert count == 1
         assert len(datasets) == 1
         assert datasets[0].name == "dataset1"
-        assert mock_query.execute.call_count == 1
+        assert mock_rpc.execute.call_count == 1
+        mock_db_connection.rpc.assert_called_once_with(
+            "get_datasets_by_keys", {"keys": [{"name": "dataset1", "version": "1.0.0"}]}
+        )
     
-    def test_batch_get_empty_list(self, repository):
+    def test_batch_get_empty_list(self, repository, mock_db_connection):
         """Test batch_get with empty list."""
         datasets, count = repository.batch_get([])
         
         assert count == 0
         assert len(datasets) == 0
+        mock_db_connection.table.assert_not_called()
+        mock_db_connection.rpc.assert_not_called()
     
     def test_batch_get_with_error(self, repository, mock_db_connection):
         """Test batch_get raises RuntimeError when database returns an error."""
-        mock_error = MagicMock()
-        mock_error.message = "Database connection failed"
-        
-        mock_response = MagicMock()
-        mock_response.error = mock_error
-        mock_response.data = None
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+        mock_db_connection.rpc.return_value.execute.side_effect = APIError(
+            {"message": "Database connection failed"}
+        )
         
         names_versions = [("dataset1", "1.0.0")]
         
@@ -405,41 +646,59 @@ class TestDatasetRepository:
         datasets = [dataset1, dataset2]
         repository.batch_create(datasets)
         
-        assert mock_db_connection.insert.call_count == 2
-        calls = mock_db_connection.insert.call_args_list
-        assert calls[0][0][0] == "Dataset"
-        assert calls[0][0][1] == dataset1.to_record()
-        assert calls[1][0][0] == "Dataset"
-        assert calls[1][0][1] == dataset2.to_record()
+        mock_db_connection.bulk_insert.assert_called_once_with(
+            "Dataset", [dataset1.to_record(), dataset2.to_record()], returning=ReturnMethod.minimal
+        )
+        mock_db_connection.insert.assert_not_called()
     
     def test_batch_create_empty_list(self, repository, mock_db_connection):
         """Test batch_create with empty list."""
         repository.batch_create([])
         
+        mock_db_connection.bulk_insert.assert_not_called()
         mock_db_connection.insert.assert_not_called()
     
+    def test_batch_create_skips_empty_entries(self, repository, sample_dataset, mock_db_connection):
+        """Test batch_create drops None entries and skips the request when nothing is left."""
+        repository.batch_create([None, sample_dataset, None])
+        mock_db_connection.bulk_insert.assert_called_once_with(
+            "Dataset", [sample_dataset.to_record()], returning=ReturnMethod.minimal
+        )
+        
+        mock_db_connection.bulk_insert.reset_mock()
+        repository.batch_create([None])
+        mock_db_connection.bulk_insert.assert_not_called()
+    
+    def test_batch_create_streams_in_chunks(self, repository, mock_db_connection):
+        """Test batch_create consumes a generator and sends one bulk insert per chunk."""
+        datasets = (
+            Dataset(name=f"dataset{i}", version="1.0.0", source="s3://bucket/data.csv")
+            for i in range(5)
+        )
+        
+        repository.batch_create(datasets, chunk_size=2)
+        
+        sizes = [len(c.args[1]) for c in mock_db_connection.bulk_insert.call_args_list]
+        assert sizes == [2, 2, 1]
+    
     def test_batch_create_single_dataset(self, repository, sample_dataset, mock_db_connection):
         """Test batch_create with single dataset."""
         repository.batch_create([sample_dataset])
         
-        mock_db_connection.insert.assert_called_once()
-        call_args = mock_db_connection.insert.call_args
+        mock_db_connection.bulk_insert.assert_called_once()
+        call_args = mock_db_connection.bulk_insert.call_args
         assert call_args[0][0] == "Dataset"
-        assert call_args[0][1] == sample_dataset.to_record()
+        assert call_args[0][1] == [sample_dataset.to_record()]
     
     def test_batch_delete_success(self, repository, mock_db_connection):
-        """Test successfully deleting multiple datasets."""
-        mock_response_1 = MagicMock()
-        mock_response_1.error = None
-        mock_response_1.data = [{"name": "dataset1", "version": "1.0.0"}]
-        
-        mock_response_2 = MagicMock()
-        mock_response_2.error = None
-        mock_response_2.data = [{"name": "dataset2", "version": "2.0.0"}]
+        """Test successfully deleting multiple datasets in a single query."""
+        mock_response = MagicMock()
+        mock_response.error = None
+        mock_response.count = 2
         
         mock_query = MagicMock()
-        mock_query.execute.side_effect = [mock_response_1, mock_response_2]
-        mock_query.eq.return_value = mock_query
+        mock_query.execute.return_value = mock_response
+        mock_query.or_.return_value = mock_query
         mock_query.delete.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
         
@@ -447,21 +706,22 @@ class TestDatasetRepository:
         total_deleted = repository.batch_delete(name_versions)
         
         assert total_deleted == 2
-        assert mock_query.execute.call_count == 2
+        assert mock_query.execute.call_count == 1
+        mock_query.delete.assert_called_once_with(count="exact", returning=ReturnMethod.minimal)
+        mock_query.or_.assert_called_once_with(
+            'and(name.eq."dataset1",version.eq."1.0.0"),'
+            'and(name.eq."dataset2",version.eq."2.0.0")'
+        )
     
     def test_batch_delete_partial_success(self, repository, mock_db_connection):
         """Test batch_delete when some datasets don't exist."""
-        mock_response_1 = MagicMock()
-        mock_response_1.error = None
-        mock_response_1.data = [{"name": "dataset1", "version": "1.0.0"}]
-        
-        mock_response_2 = MagicMock()
-        mock_response_2.error = None
-        mock_response_2.data = []
+        mock_response = MagicMock()
+        mock_response.error = None
+        mock_response.count = 1
         
         mock_query = MagicMock()
-        mock_query.execute.side_effect = [mock_response_1, mock_response_2]
-        mock_query.eq.return_value = mock_query
+        mock_query.execute.return_value = mock_response
+        mock_query.or_.return_value = mock_query
         mock_query.delete.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
         
@@ -474,11 +734,11 @@ class TestDatasetRepository:
         """Test batch_delete skips entries with empty name or version."""
         mock_response = MagicMock()
         mock_response.error = None
-        mock_response.data = [{"name": "dataset1", "version": "1.0.0"}]
+        mock_response.count = 1
         
         mock_query = MagicMock()
         mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
+        mock_query.or_.return_value = mock_query
         mock_query.delete.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
         
@@ -487,25 +747,99 @@ class TestDatasetRepository:
         
         assert total_deleted == 1
         assert mock_query.execute.call_count == 1
+        mock_query.or_.assert_called_once_with('and(name.eq."dataset1",version.eq."1.0.0")')
     
-    def test_batch_delete_empty_list(self, repository):
+    def test_batch_delete_empty_list(self, repository, mock_db_connection):
         """Test batch_delete with empty list."""
         total_deleted = repository.batch_delete([])
         
         assert total_deleted == 0
+        mock_db_connection.table.assert_not_called()
     
-    def test_batch_delete_with_error(self, repository, mock_db_connection):
-        """Test batch_delete raises RuntimeError when database returns an error."""
-        mock_error = MagicMock()
-        mock_error.message = "Database connection failed"
+    def test_batch_delete_only_invalid_entries(self, repository, mock_db_connection):
+        """Test batch_delete returns before building a query when no pair is valid."""
+        total_deleted = repository.batch_delete([("", "1.0.0"), ("dataset1", ""), (None, None)])
+        
+        assert total_deleted == 0
+        mock_db_connection.table.assert_not_called()
+    
+    def test_batch_delete_quotes_reserved_characters(self, repository, mock_db_connection):
+        """Test batch_delete quotes values containing PostgREST reserved characters."""
+        mock_response = MagicMock()
+        mock_response.count = 0
+        
+        mock_query = MagicMock()
+        mock_query.execute.return_value = mock_response
+        mock_query.or_.return_value = mock_query
+        mock_query.delete.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        repository.batch_delete([('a,b"(c)', "1.0")])
         
+        mock_query.or_.assert_called_once_with('and(name.eq."a,b\\"(c)",version.eq."1.0")')
+    
+    def test_batch_delete_chunks_large_requests(self, repository, mock_db_connection):
+        """Test batch_delete issues one DELETE per BATCH_QUERY_CHUNK_SIZE pairs."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 2
         mock_response = MagicMock()
-        mock_response.error = mock_error
-        mock_response.data = None
+        mock_response.count = 1
         
         mock_query = MagicMock()
         mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
+        mock_query.or_.return_value = mock_query
+        mock_query.delete.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        name_versions = [(f"dataset{i}", "1.0.0") for i in range(5)]
+        total_deleted = repository.batch_delete(name_versions)
+        
+        assert mock_query.execute.call_count == 3
+        assert total_deleted == 3
+    
+    def test_batch_delete_runs_chunks_in_parallel(self, repository, mock_db_connection):
+        """Test batch_delete has several chunk queries in flight at once."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 1
+        # Each execute waits for the other; sequential dispatch would break the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def execute():
+            barrier.wait()
+            return MagicMock(count=1)
+        
+        mock_query = MagicMock()
+        mock_query.execute.side_effect = execute
+        mock_query.or_.return_value = mock_query
+        mock_query.delete.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        total_deleted = repository.batch_delete([("dataset1", "1.0.0"), ("dataset2", "1.0.0")])
+        
+        assert total_deleted == 2
+    
+    def test_batch_delete_sequential_when_parallelism_disabled(self, repository, mock_db_connection):
+        """Test MAX_PARALLEL_QUERIES = 1 sends chunk queries one after another in order."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 1
+        repository.MAX_PARALLEL_QUERIES = 1
+        mock_query = MagicMock()
+        mock_query.execute.return_value = MagicMock(count=1)
+        mock_query.or_.return_value = mock_query
+        mock_query.delete.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        with patch("utils.concurrency.ThreadPoolExecutor") as mock_pool:
+            assert repository.batch_delete([("dataset1", "1.0.0"), ("dataset2", "1.0.0")]) == 2
+        
+        mock_pool.assert_not_called()
+        assert [c.args[0] for c in mock_query.or_.call_args_list] == [
+            'and(name.eq."dataset1",version.eq."1.0.0")',
+            'and(name.eq."dataset2",version.eq."1.0.0")',
+        ]
+    
+    def test_batch_delete_with_error(self, repository, mock_db_connection):
+        """Test batch_delete raises RuntimeError when database returns an error."""
+        mock_query = MagicMock()
+        mock_query.execute.side_effect = APIError({"message": "Database connection failed"})
+        mock_query.or_.return_value = mock_query
         mock_query.delete.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
         
@@ -516,3 +850,76 @@ class TestDatasetRepository:
         
         assert "Error deleting dataset: Database connection failed" in str(exc_info.value)
 
+
+
+class TestDatasetRepositoryWithFakeDB:
+    """Round-trip tests for DatasetRepository against the in-memory FakeDBConnection."""
+    
+    @pytest.fixture
+    def fake_db(self):
+        """Create an empty in-memory database connection."""
+        return FakeDBConnection()
+    
+    @pytest.fixture
+    def repository(self, fake_db):
+        """Create a DatasetRepository backed by the fake connection."""
+        return DatasetRepository(fake_db)
+    
+    def _dataset(self, name, version="1.0.0"):
+        """Build a dataset with the given name and version."""
+        return Dataset(name=name, version=version, source=f"s3://bucket/{name}.csv", description=None)
+    
+    def test_add_then_get_dataset(self, repository):
+        """Test a dataset written with add_dataset reads back unchanged."""
+        dataset = self._dataset("data")
+        repository.add_dataset(dataset)
+        
+        assert repository.get_dataset("data", "1.0.0").to_record() == dataset.to_record()
+        assert repository.get_dataset("data", "2.0.0") is None
+    
+    def test_get_dataset_returns_copies_of_cached_datasets(self, repository):
+        """Test mutating a returned dataset does not change what later lookups see."""
+        repository.add_dataset(self._dataset("data"))
+        
+        repository.get_dataset("data", "1.0.0").source = "MUTATED"
+        
+        assert repository.get_dataset("data", "1.0.0").source == "s3://bucket/data.csv"
+    
+    def test_delete_dataset_removes_row(self, repository, fake_db):
+        """Test delete_dataset removes only the requested version."""
+        repository.batch_create([self._dataset("data", "1.0.0"), self._dataset("data", "2.0.0")])
+        
+        assert repository.delete_dataset("data", "1.0.0") == 1
+        assert repository.get_dataset("data", "1.0.0") is None
+        assert [row["version"] for row in fake_db.tables["Dataset"]] == ["2.0.0"]
+    
+    @pytest.mark.parametrize("install_function", [True, False])
+    def test_batch_get_round_trip(self, repository, fake_db, install_function):
+        """Test batch_get returns exactly the requested pairs, with or without the database function."""
+        if install_function:
+            fake_db.functions["get_datasets_by_keys"] = get_datasets_by_keys
+        datasets = [self._dataset("a", "1"), self._dataset("a", "2"), self._dataset("b,(x)", "1")]
+        repository.batch_create(datasets)
+        
+        found, count = repository.batch_get([("b,(x)", "1"), ("a", "1"), ("b,(x)", "2")])
+        
+        assert count == 2
+        assert [dataset.to_record() for dataset in found] == [datasets[2].to_record(), datasets[0].to_record()]
+    
+    def test_batch_get_returns_copies_of_cached_datasets(self, repository):
+        """Test datasets returned by batch_get are not shared with the cache."""
+        repository.add_dataset(self._dataset("data"))
+        
+        (fetched,), _ = repository.batch_get([("data", "1.0.0")])
+        fetched.source = "MUTATED"
+        (cached,), _ = repository.batch_get([("data", "1.0.0")])
+        cached.source = "MUTATED"
+        
+        assert repository.get_dataset("data", "1.0.0").source == "s3://bucket/data.csv"
+    
+    def test_batch_delete_round_trip(self, repository, fake_db):
+        """Test batch_delete counts and removes only the requested pairs."""
+        repository.batch_create([self._dataset("a", "1"), self._dataset("a", "2"), self._dataset("b", "1")])
+        
+        assert repository.batch_delete([("a", "1"), ("b", "1"), ("b", "2")]) == 2
+        assert [(row["name"], row["version"]) for row in fake_db.tables["Dataset"]] == [("a", "2")]
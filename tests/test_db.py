@@ -0,0 +1,212 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+import httpx
+import pytest
+from unittest.mock import Mock, MagicMock
+from datetime import datetime
+from storage.db import HTTP_TIMEOUT, DatabaseConnection, OrjsonClient, create_http_client, http_pool_limits
+from storage.async_db import AsyncDatabaseConnection, create_async_http_client
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+
+class TestBulkInsert:
+    """Test suite for DatabaseConnection.bulk_insert."""
+
+    def test_sends_one_insert_per_chunk(self):
+        """Test records are split into chunk_size multi-row inserts."""
+        client = MagicMock()
+        query = client.table.return_value.insert.return_value
+        query.execute.side_effect = [MagicMock(data=[{"id": 1}, {"id": 2}]), MagicMock(data=[{"id": 3}])]
+
+        inserted = DatabaseConnection(client).bulk_insert("Run", [{"n": 1}, {"n": 2}, {"n": 3}], chunk_size=2)
+
+        assert inserted == [{"id": 1}, {"id": 2}, {"id": 3}]
+        client.table.return_value.insert.assert_any_call([{"n": 1}, {"n": 2}], returning=ReturnMethod.representation)
+        client.table.return_value.insert.assert_any_call([{"n": 3}], returning=ReturnMethod.representation)
+
+    def test_minimal_return_yields_sent_records(self):
+        """Test a minimal-return load hands back the records as sent."""
+        client = MagicMock()
+        client.table.return_value.insert.return_value.execute.return_value = MagicMock(data=[])
+
+        inserted = DatabaseConnection(client).bulk_insert("Run", [{"n": 1}], returning=ReturnMethod.minimal)
+
+        assert inserted == [{"n": 1}]
+        client.table.return_value.insert.assert_called_once_with([{"n": 1}], returning=ReturnMethod.minimal)
+
+    def test_error_names_failed_rows(self):
+        """Test a failing chunk is reported with its row range."""
+        client = MagicMock()
+        query = client.table.return_value.insert.return_value
+        query.execute.side_effect = [MagicMock(data=[]), APIError({"message": "duplicate key"})]
+
+        with pytest.raises(RuntimeError) as exc_info:
+            DatabaseConnection(client).bulk_insert("Run", [{"n": 1}, {"n": 2}, {"n": 3}], chunk_size=2)
+
+        assert "Failed to insert into Run (rows 2-2): duplicate key" in str(exc_info.value)
+
+
+class TestAsyncBulkInsert:
+    """Test suite for AsyncDatabaseConnection.bulk_insert."""
+
+    def test_write_concurrency_is_capped(self):
+        """Test no more than max_concurrent_writes chunks are in flight at once."""
+        in_flight = peak = 0
+
+        async def execute():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return Mock(data=[])
+
+        client = Mock()
+        client.table.return_value.insert.return_value.execute = execute
+        connection = AsyncDatabaseConnection(client, max_concurrent_writes=3)
+
+        records = [{"n": n} for n in range(10)]
+        inserted = asyncio.run(connection.bulk_insert("Run", records, chunk_size=1))
+
+        assert inserted == records
+        assert peak == 3
+
+
+class TestInsertPipeline:
+    """Test suite for DatabaseConnection.pipeline."""
+
+    @pytest.fixture
+    def connection(self):
+        """Create a DatabaseConnection with bulk_insert mocked out."""
+        connection = DatabaseConnection(Mock())
+        connection.bulk_insert = Mock()
+        return connection
+
+    def test_flushes_each_table_on_exit(self, connection):
+        """Test buffered rows are sent as one bulk insert per table on exit."""
+        with connection.pipeline() as pipeline:
+            pipeline.insert("Dataset", {"name": "d1"})
+            pipeline.insert("Run", {"name": "r1"})
+            pipeline.insert("Dataset", {"name": "d2"})
+            connection.bulk_insert.assert_not_called()
+
+        assert connection.bulk_insert.call_count == 2
+        connection.bulk_insert.assert_any_call("Dataset", [{"name": "d1"}, {"name": "d2"}], 500)
+        connection.bulk_insert.assert_any_call("Run", [{"name": "r1"}], 500)
+
+    def test_flushes_table_when_buffer_is_full(self, connection):
+        """Test a table is flushed as soon as its buffer reaches chunk_size."""
+        with connection.pipeline(chunk_size=2) as pipeline:
+            pipeline.insert("Dataset", {"name": "d1"})
+            pipeline.insert("Dataset", {"name": "d2"})
+            connection.bulk_insert.assert_called_once_with("Dataset", [{"name": "d1"}, {"name": "d2"}], 2)
+            pipeline.insert("Dataset", {"name": "d3"})
+
+        connection.bulk_insert.assert_called_with("Dataset", [{"name": "d3"}], 2)
+        assert connection.bulk_insert.call_count == 2
+
+    def test_discards_buffer_on_error(self, connection):
+        """Test buffered rows are not written when the block raises."""
+        with pytest.raises(ValueError):
+            with connection.pipeline() as pipeline:
+                pipeline.insert("Dataset", {"name": "d1"})
+                raise ValueError("boom")
+
+        connection.bulk_insert.assert_not_called()
+
+
+class TestHttpClient:
+    """Test suite for the pooled HTTP client factory."""
+
+    def test_pool_limits_follow_pool_size(self, monkeypatch):
+        """Test the pool caps and keeps alive HTTP_POOL_SIZE connections."""
+        monkeypatch.delenv("ML_LINEAGE_DB_POOL_SIZE", raising=False)
+        monkeypatch.setattr("storage.db.HTTP_POOL_SIZE", 7)
+
+        client = create_http_client()
+        try:
+            pool = client._transport._pool
+            assert pool._max_connections == 7
+            assert pool._max_keepalive_connections == 7
+        finally:
+            client.close()
+
+    def test_pool_size_from_environment(self, monkeypatch):
+        """Test ML_LINEAGE_DB_POOL_SIZE overrides the default pool size."""
+        monkeypatch.setenv("ML_LINEAGE_DB_POOL_SIZE", "3")
+
+        limits = http_pool_limits()
+
+        assert limits.max_connections == 3
+        assert limits.max_keepalive_connections == 3
+
+    @pytest.mark.parametrize("value", ["abc", "0", "-1"])
+    def test_invalid_pool_size_from_environment(self, monkeypatch, value):
+        """Test a bad ML_LINEAGE_DB_POOL_SIZE raises a clear error when a client is created."""
+        monkeypatch.setenv("ML_LINEAGE_DB_POOL_SIZE", value)
+
+        with pytest.raises(ValueError, match="ML_LINEAGE_DB_POOL_SIZE must be a positive integer"):
+            create_http_client()
+
+    def test_keeps_postgrest_timeout_and_redirects(self):
+        """Test the injected client keeps postgrest's default timeout and redirect handling."""
+        client = create_http_client()
+        try:
+            assert client.timeout == httpx.Timeout(HTTP_TIMEOUT)
+            assert client.follow_redirects is True
+        finally:
+            client.close()
+
+    def test_async_client_keeps_postgrest_timeout_and_redirects(self):
+        """Test the async client matches the sync client's timeout and redirect handling."""
+        client = create_async_http_client()
+        try:
+            assert client.timeout == httpx.Timeout(HTTP_TIMEOUT)
+            assert client.follow_redirects is True
+        finally:
+            asyncio.run(client.aclose())
+
+    def test_orjson_client_encodes_request_body(self):
+        """Test JSON bodies are encoded by orjson, including datetimes."""
+        pytest.importorskip("orjson")
+        client = OrjsonClient()
+        try:
+            request = client.build_request(
+                "POST", "https://example.test/rest/v1/Run",
+                json={"name": "run1", "start_time": datetime(2024, 1, 1, 12, 0, 0)},
+            )
+        finally:
+            client.close()
+
+        assert request.content == b'{"name":"run1","start_time":"2024-01-01T12:00:00"}'
+        assert request.headers["Content-Type"] == "application/json"
+
+    def test_orjson_client_falls_back_for_unsupported_payloads(self):
+        """Test payloads orjson rejects go through httpx's stdlib encoder."""
+        pytest.importorskip("orjson")
+        client = OrjsonClient()
+        try:
+            request = client.build_request("POST", "https://example.test/rest/v1/Run", json={1: "one"})
+        finally:
+            client.close()
+
+        assert request.content == b'{"1":"one"}'
+
+
+class TestImport:
+    """Test suite for the storage package's import footprint."""
+
+    def test_storage_import_defers_supabase(self):
+        """Test importing the repositories does not load the supabase package until a client is created."""
+        root = Path(__file__).resolve().parents[1]
+        code = (
+            "import sys, storage.model_repository, storage.async_dataset_repository, storage.async_run_repository\n"
+            "print('supabase' in sys.modules)"
+        )
+
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "False"
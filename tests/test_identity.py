@@ -0,0 +1,71 @@
+import subprocess
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from utils import identity
+from utils.identity import Identity
+
+
+class TestGithubUsername:
+    """Test suite for the GitHub username lookup behind Identity."""
+
+    @pytest.fixture(autouse=True)
+    def clean_environment(self, monkeypatch, tmp_path):
+        """Start each test without credentials, ~/.netrc or memoized lookups."""
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.setattr(identity, "_github_logins", {})
+        identity._git_config_github_user.cache_clear()
+        yield
+        identity._git_config_github_user.cache_clear()
+
+    def test_without_credentials_uses_git_config(self):
+        """Test no token and no ~/.netrc skips GitHub and reads github.user from git config."""
+        with patch.object(identity._github_session, "get") as mock_get, \
+                patch("utils.identity.subprocess.run", return_value=SimpleNamespace(stdout="octocat\n")) as mock_run:
+            assert Identity().github_username == "octocat"
+            assert Identity().github_username == "octocat"
+
+        mock_get.assert_not_called()
+        mock_run.assert_called_once()
+        assert mock_run.call_args.args[0] == ["git", "config", "--global", "github.user"]
+
+    def test_git_config_unavailable(self):
+        """Test a missing or hanging git leaves the username unset."""
+        with patch("utils.identity.subprocess.run", side_effect=subprocess.TimeoutExpired("git", 0.5)):
+            assert Identity().github_username is None
+
+    def test_token_lookup_is_cached(self, monkeypatch):
+        """Test a successful GitHub lookup is made once per token."""
+        monkeypatch.setenv("GITHUB_TOKEN", "token-1")
+        response = Mock()
+        response.json.return_value = {"login": "octocat"}
+        with patch.object(identity._github_session, "get", return_value=response) as mock_get:
+            assert Identity().github_username == "octocat"
+            assert Identity().github_username == "octocat"
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs["headers"] == {"Authorization": "Bearer token-1"}
+
+    def test_failed_lookup_is_not_cached(self, monkeypatch):
+        """Test a failed GitHub lookup is retried on the next access."""
+        monkeypatch.setenv("GITHUB_TOKEN", "token-1")
+        response = Mock()
+        response.json.return_value = {"login": "octocat"}
+        with patch.object(identity._github_session, "get",
+                          side_effect=[ConnectionError("network down"), response]) as mock_get:
+            assert Identity().github_username is None
+            assert Identity().github_username == "octocat"
+
+        assert mock_get.call_count == 2
+
+    def test_name_does_not_look_up_github(self, monkeypatch):
+        """Test reading Identity().name never contacts GitHub or git."""
+        monkeypatch.setenv("GITHUB_TOKEN", "token-1")
+        with patch.object(identity._github_session, "get") as mock_get, \
+                patch("utils.identity.subprocess.run") as mock_run, \
+                patch("utils.identity.getpass.getuser", return_value="alice"):
+            assert Identity().name == "alice"
+
+        mock_get.assert_not_called()
+        mock_run.assert_not_called()
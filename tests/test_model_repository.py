@@ -1,23 +1,47 @@
 import pytest
-from unittest.mock import Mock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock, call, patch
 from storage.model_repository import ModelRepository
 from core.model import Model
+from postgrest.exceptions import APIError
+from tests.fakes import FakeDBConnection
+
+
+# Stored Model rows shared by the tests; treat as read-only.
+_TEST_MODEL_ROW = {
+    "artifact_uri": "s3://bucket/model.pkl",
+    "model_name": "test_model",
+    "run_id": "run_123",
+    "lifecycle_stage": "registered"
+}
+_MODEL1_ROW = {"artifact_uri": "s3://bucket/model1.pkl", "model_name": "model1", "run_id": "run_1", "lifecycle_stage": "registered"}
+_MODEL2_ROW = {"artifact_uri": "s3://bucket/model2.pkl", "model_name": "model2", "run_id": "run_2", "lifecycle_stage": "staging"}
+_SELECT_COLUMNS = "artifact_uri,model_name,run_id,lifecycle_stage"
 
 
 class TestModelRepository:
     """Test suite for ModelRepository class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_db_connection(self):
-        """Create a mock database connection."""
+        """Create a mock database connection shared by the module's tests."""
         return Mock()
     
+    @pytest.fixture(autouse=True)
+    def _reset_db_connection(self, mock_db_connection):
+        """Clear calls and configured return values on the shared connection after each test."""
+        yield
+        mock_db_connection.reset_mock(return_value=True, side_effect=True)
+    
     @pytest.fixture
     def repository(self, mock_db_connection):
-        """Create a ModelRepository instance with mocked database connection."""
+        """Create a ModelRepository instance with mocked database connection.
+        
+        Not shared across tests: the repository caches models and its table builder.
+        """
         return ModelRepository(mock_db_connection)
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_model(self):
         """Create a sample model for testing."""
         return Model(
@@ -27,37 +51,51 @@ class TestModelRepository:
             lifecycle_stage="registered"
         )
     
-    def test_init(self, mock_db_connection):
+    @pytest.fixture(scope="module")
+    def sample_record(self, sample_model):
+        """The stored record for sample_model, converted once per module."""
+        return sample_model.to_record()
+    
+    def _mock_model_query(self, mock_db_connection, data, count=None):
+        """Wire mock_db_connection so every query chain ends in one response.
+        
+        Args:
+            mock_db_connection: The mocked connection to wire.
+            data: Rows carried by the response.
+            count: Value of the response's count attribute.
+        
+        Returns:
+            The mock query returned by every chained builder method.
+        """
+        mock_response = SimpleNamespace(data=data, count=count)
+        mock_query = Mock()
+        mock_query.execute.return_value = mock_response
+        for method in ("select", "eq", "in_", "order", "limit", "update", "delete"):
+            getattr(mock_query, method).return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        return mock_query
+    
+    def test_init(self, repository, mock_db_connection):
         """Test ModelRepository initialization."""
-        repo = ModelRepository(mock_db_connection)
-        assert repo.db_connection == mock_db_connection
-        assert repo.MODEL_TABLE == "Model"
+        assert repository.db_connection is mock_db_connection
+        assert ModelRepository.MODEL_TABLE == "Model"
+    
+    def test_models_hash_by_identity(self, sample_model, sample_record):
+        """Test models can be used in sets and as dict keys, compared by identity."""
+        assert len({sample_model, Model.from_record(sample_record), sample_model}) == 2
     
-    def test_add_model_success(self, repository, sample_model, mock_db_connection):
+    def test_add_model_success(self, repository, sample_model, sample_record, mock_db_connection):
         """Test successfully adding a model to the repository."""
         repository.add_model(sample_model)
         
         mock_db_connection.insert.assert_called_once()
         call_args = mock_db_connection.insert.call_args
         assert call_args[0][0] == "Model"
-        assert call_args[0][1] == sample_model.to_record()
+        assert call_args[0][1] == sample_record
     
     def test_get_model_success(self, repository, mock_db_connection):
         """Test successfully retrieving a model by name."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = [{
-            "artifact_uri": "s3://bucket/model.pkl",
-            "model_name": "test_model",
-            "associated_run_id": "run_123",
-            "lifecycle_stage": "registered"
-        }]
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+        mock_query = self._mock_model_query(mock_db_connection, [_TEST_MODEL_ROW])
         
         result = repository.get_model("test_model")
         
@@ -67,323 +105,374 @@ class TestModelRepository:
         assert result.artifact_uri == "s3://bucket/model.pkl"
         assert result.associated_run_id == "run_123"
         assert result.lifecycle_stage == "registered"
+    
+    @pytest.mark.parametrize("method", ["get_model", "get_artifact_uri"])
+    def test_lookup_not_found_returns_none(self, repository, mock_db_connection, method):
+        """Test lookups of a model that doesn't exist return None."""
+        self._mock_model_query(mock_db_connection, [])
         
-        mock_db_connection.table.assert_called_once_with("Model")
-        mock_query.select.assert_called_once_with("*")
-        mock_query.eq.assert_called_once_with("model_name", "test_model")
-        mock_query.execute.assert_called_once()
+        assert getattr(repository, method)("nonexistent") is None
+    
+    @pytest.mark.parametrize("call,message", [
+        (lambda repository, model: repository.update_model(model), "No model found to update"),
+        (lambda repository, model: repository.delete_model(model.model_name), "No model found to delete"),
+    ], ids=["update_model", "delete_model"])
+    def test_write_not_found(self, repository, sample_model, mock_db_connection, call, message):
+        """Test update_model and delete_model raise RuntimeError when no row matches."""
+        self._mock_model_query(mock_db_connection, [])
+        
+        with pytest.raises(RuntimeError, match=message):
+            call(repository, sample_model)
+    
+    @pytest.mark.parametrize("call,prefix", [
+        (lambda repository, model: repository.get_model(model.model_name), "Failed to retrieve model"),
+        (lambda repository, model: repository.update_model(model), "Failed to update model"),
+        (lambda repository, model: repository.delete_model(model.model_name), "Failed to delete model"),
+        (lambda repository, model: repository.list_models(), "Failed to list models"),
+    ], ids=["get_model", "update_model", "delete_model", "list_models"])
+    def test_operation_with_error(self, repository, sample_model, mock_db_connection, call, prefix):
+        """Test each operation wraps a failed request in RuntimeError."""
+        mock_query = self._mock_model_query(mock_db_connection, None)
+        mock_query.execute.side_effect = APIError({"message": "Database connection failed"})
+        
+        with pytest.raises(RuntimeError, match=f"{prefix}: .*Database connection failed"):
+            call(repository, sample_model)
     
-    def test_get_model_not_found(self, repository, mock_db_connection):
-        """Test retrieving a model that doesn't exist returns None."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = []
+    @pytest.mark.parametrize("method,argument,message", [
+        ("get_model", "", "Model name is required"),
+        ("model_exists", "", "Model name is required"),
+        ("delete_model", "", "Model name is required for deletion"),
+        ("update_model", SimpleNamespace(model_name="", to_record=lambda: {}), "Model is required for update"),
+    ], ids=["get_model", "model_exists", "delete_model", "update_model"])
+    def test_missing_model_name(self, repository, mock_db_connection, method, argument, message):
+        """Test operations reject an empty model name before making a request."""
+        with pytest.raises(ValueError, match=message):
+            getattr(repository, method)(argument)
+        
+        mock_db_connection.table.assert_not_called()
+    
+    def test_update_model_success(self, repository, sample_model, mock_db_connection):
+        """Test successfully updating a model."""
+        self._mock_model_query(mock_db_connection, [{"model_name": "test_model"}])
         
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+        repository.update_model(sample_model)
+    
+    def test_delete_model_success(self, repository, mock_db_connection):
+        """Test successfully deleting a model."""
+        self._mock_model_query(mock_db_connection, [{"model_name": "test_model"}])
         
-        result = repository.get_model("nonexistent")
+        repository.delete_model("test_model")
+    
+    def test_get_artifact_uri_success(self, repository, mock_db_connection):
+        """Test successfully getting artifact URI for a model."""
+        self._mock_model_query(mock_db_connection, [_TEST_MODEL_ROW])
+        
+        result = repository.get_artifact_uri("test_model")
         
-        assert result is None
+        assert result == "s3://bucket/model.pkl"
     
-    def test_get_model_with_error(self, repository, mock_db_connection):
-        """Test that get_model raises RuntimeError when database returns an error."""
-        mock_error = MagicMock()
-        mock_error.message = "Database connection failed"
+    def test_list_models_success(self, repository, mock_db_connection):
+        """Test successfully listing all models."""
+        self._mock_model_query(mock_db_connection, [_MODEL1_ROW, _MODEL2_ROW])
         
-        mock_response = MagicMock()
-        mock_response.error = mock_error
-        mock_response.data = None
+        result = repository.list_models()
         
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
+        assert len(result) == 2
+        assert all(isinstance(model, Model) for model in result)
+        assert result[0].model_name == "model1"
+        assert result[1].model_name == "model2"
+    
+    @pytest.mark.parametrize("operation,data,expected", [
+        (
+            lambda repository: repository.get_model("test_model"),
+            [_TEST_MODEL_ROW],
+            [call.select(_SELECT_COLUMNS), call.eq("model_name", "test_model")],
+        ),
+        (
+            lambda repository: repository.update_model(Model.from_record(_TEST_MODEL_ROW)),
+            [{"model_name": "test_model"}],
+            [call.update(_TEST_MODEL_ROW), call.eq("model_name", "test_model")],
+        ),
+        (
+            lambda repository: repository.delete_model("test_model"),
+            [{"model_name": "test_model"}],
+            [call.delete(), call.eq("model_name", "test_model")],
+        ),
+        (
+            lambda repository: repository.list_models(),
+            [_MODEL1_ROW],
+            [
+                call.select(f"{_SELECT_COLUMNS},model_id"),
+                call.order("model_name"),
+                call.order("model_id"),
+                call.limit(ModelRepository.LIST_PAGE_SIZE),
+            ],
+        ),
+    ], ids=["get_model", "update_model", "delete_model", "list_models"])
+    def test_builder_calls(self, repository, mock_db_connection, operation, data, expected):
+        """Test the query each operation sends: table, columns, and filters, ending in one execute."""
+        mock_query = self._mock_model_query(mock_db_connection, data)
+        
+        operation(repository)
+        
+        mock_db_connection.table.assert_called_with("Model")
+        assert mock_query.method_calls[-len(expected) - 1:] == expected + [call.execute()]
+    
+    def test_iter_models_pages_by_model_name(self, repository, mock_db_connection):
+        """Test iter_models follows the (model_name, model_id) keyset until a short page."""
+        rows = [
+            {"artifact_uri": f"s3://bucket/{name}.pkl", "model_name": name, "run_id": "run_1",
+             "lifecycle_stage": "registered", "model_id": f"id-{name}"}
+            for name in ("model1", "model2", "model3")
+        ]
+        mock_query = Mock()
         mock_query.select.return_value = mock_query
+        mock_query.or_.return_value = mock_query
+        mock_query.order.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.execute.side_effect = [SimpleNamespace(data=rows[:2]), SimpleNamespace(data=rows[2:])]
         mock_db_connection.table.return_value = mock_query
         
-        with pytest.raises(RuntimeError) as exc_info:
-            repository.get_model("test_model")
+        result = list(repository.iter_models(page_size=2))
         
-        assert "Failed to retrieve model: Database connection failed" in str(exc_info.value)
-    
-    def test_get_model_missing_name(self, repository):
-        """Test that get_model raises ValueError when model_name is missing."""
-        with pytest.raises(ValueError) as exc_info:
-            repository.get_model("")
-        
-        assert "Model name is required" in str(exc_info.value)
+        assert [model.model_name for model in result] == ["model1", "model2", "model3"]
+        mock_query.or_.assert_called_once_with(
+            'model_name.gt."model2",and(model_name.eq."model2",model_id.gt."id-model2")'
+        )
+        assert mock_query.order.call_args_list[-2:] == [call("model_name"), call("model_id")]
+        mock_query.limit.assert_called_with(2)
+        assert mock_query.execute.call_count == 2
     
-    def test_update_model_success(self, repository, sample_model, mock_db_connection):
-        """Test successfully updating a model."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = [{"model_name": "test_model"}]
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.update.return_value = mock_query
+    def test_iter_models_names_missing_model_id_migration(self, repository, mock_db_connection):
+        """Test listing without the model_id column points at the migration that adds it."""
+        mock_query = Mock()
+        mock_query.select.return_value = mock_query
+        mock_query.order.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.execute.side_effect = APIError({"code": "42703", "message": "column Model.model_id does not exist"})
         mock_db_connection.table.return_value = mock_query
         
-        repository.update_model(sample_model)
-        
-        mock_db_connection.table.assert_called_once_with("Model")
-        mock_query.update.assert_called_once()
-        mock_query.eq.assert_called_once_with("model_name", "test_model")
-        mock_query.execute.assert_called_once()
+        with pytest.raises(RuntimeError, match="model_name_id_idx.sql"):
+            list(repository.iter_models())
     
-    def test_update_model_missing_model_name(self, repository, mock_db_connection):
-        """Test update_model raises ValueError when model_name is missing."""
-        mock_model = MagicMock()
-        mock_model.model_name = ""
-        mock_model.to_record.return_value = {}
+    def test_iter_models_keeps_duplicate_names_across_pages(self):
+        """Test models sharing a name across a page boundary are all listed."""
+        fake_db = FakeDBConnection()
+        fake_db.tables["Model"] = [
+            {"artifact_uri": f"s3://bucket/{model_id}.pkl", "model_name": name, "run_id": "run_1",
+             "lifecycle_stage": "registered", "model_id": model_id}
+            for name, model_id in [("b", "id-3"), ("a", "id-1"), ("b", "id-2"), ("b", "id-5"), ("c", "id-4")]
+        ]
         
-        with pytest.raises(ValueError) as exc_info:
-            repository.update_model(mock_model)
+        result = list(ModelRepository(fake_db).iter_models(page_size=2))
         
-        assert "Model is required for update" in str(exc_info.value)
+        assert [model.artifact_uri for model in result] == [
+            "s3://bucket/id-1.pkl", "s3://bucket/id-2.pkl", "s3://bucket/id-3.pkl",
+            "s3://bucket/id-5.pkl", "s3://bucket/id-4.pkl",
+        ]
     
-    def test_update_model_not_found(self, repository, sample_model, mock_db_connection):
-        """Test update_model raises RuntimeError when model is not found."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = []
+    def test_list_model_names(self, repository, mock_db_connection):
+        """Test list_model_names fetches only the name column."""
+        mock_query = self._mock_model_query(mock_db_connection, [{"model_name": "model1"}, {"model_name": "model2"}])
         
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.update.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
-        
-        with pytest.raises(RuntimeError) as exc_info:
-            repository.update_model(sample_model)
+        result = repository.list_model_names()
         
-        assert "No model found to update" in str(exc_info.value)
+        assert result == ["model1", "model2"]
+        mock_query.select.assert_called_once_with("model_name")
     
-    def test_update_model_with_error(self, repository, sample_model, mock_db_connection):
-        """Test update_model raises RuntimeError when database returns an error."""
-        mock_error = MagicMock()
-        mock_error.message = "Database connection failed"
+    def _mock_list_queries(self, mock_db_connection, fingerprints, rows):
+        """Wire separate mock chains for the list_models probe and full select."""
+        probe_query = Mock()
+        probe_query.order.return_value = probe_query
+        probe_query.limit.return_value = probe_query
+        probe_responses = []
+        for count, updated_at in fingerprints:
+            probe_responses.append(SimpleNamespace(count=count, data=[{"updated_at": updated_at}]))
+        probe_query.execute.side_effect = probe_responses
+        
+        list_query = Mock()
+        list_query.order.return_value = list_query
+        list_query.limit.return_value = list_query
+        list_query.execute.return_value = SimpleNamespace(data=rows)
+        
+        table = Mock()
+        table.select.side_effect = lambda *columns, **kwargs: list_query if columns != ("updated_at",) else probe_query
+        mock_db_connection.table.return_value = table
+        return list_query
+    
+    def test_list_models_served_from_cache_when_unchanged(self, repository, mock_db_connection):
+        """Test list_models skips the full select when count and updated_at are unchanged."""
+        list_query = self._mock_list_queries(
+            mock_db_connection,
+            [(1, "2024-01-01T00:00:00"), (1, "2024-01-01T00:00:00")],
+            [_MODEL1_ROW],
+        )
         
-        mock_response = MagicMock()
-        mock_response.error = mock_error
-        mock_response.data = None
+        first = repository.list_models()
+        second = repository.list_models()
         
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.update.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+        assert [model.model_name for model in second] == ["model1"]
+        assert [model.to_record() for model in first] == [model.to_record() for model in second]
+        list_query.execute.assert_called_once()
+    
+    def test_list_models_returns_copies_of_cached_models(self, repository, mock_db_connection):
+        """Test mutating a listed model does not change later list_models results."""
+        self._mock_list_queries(
+            mock_db_connection,
+            [(1, "2024-01-01T00:00:00")] * 3,
+            [_MODEL1_ROW],
+        )
         
-        with pytest.raises(RuntimeError) as exc_info:
-            repository.update_model(sample_model)
+        repository.list_models()[0].lifecycle_stage = "archived"
+        repository.list_models()[0].lifecycle_stage = "archived"
         
-        assert "Failed to update model: Database connection failed" in str(exc_info.value)
+        assert repository.list_models()[0].lifecycle_stage == "registered"
     
-    def test_delete_model_success(self, repository, mock_db_connection):
-        """Test successfully deleting a model."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = [{"model_name": "test_model"}]
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.delete.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+    def test_list_models_refetches_when_table_changes(self, repository, mock_db_connection):
+        """Test list_models refetches when the probe reports a newer updated_at."""
+        list_query = self._mock_list_queries(
+            mock_db_connection,
+            [(1, "2024-01-01T00:00:00"), (1, "2024-01-02T00:00:00")],
+            [],
+        )
         
-        repository.delete_model("test_model")
+        repository.list_models()
+        repository.list_models()
         
-        mock_db_connection.table.assert_called_once_with("Model")
-        mock_query.delete.assert_called_once()
-        mock_query.eq.assert_called_once_with("model_name", "test_model")
-        mock_query.execute.assert_called_once()
+        assert list_query.execute.call_count == 2
     
-    def test_delete_model_not_found(self, repository, mock_db_connection):
-        """Test delete_model raises RuntimeError when model is not found."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = []
+    def test_list_models_without_updated_at_column(self, repository, mock_db_connection):
+        """Test list_models falls back to uncached reads when the probe column is missing."""
+        list_query = self._mock_list_queries(mock_db_connection, [], [])
+        probe_error = APIError({"code": "42703", "message": "column Model.updated_at does not exist"})
+        
+        def select(*columns, **kwargs):
+            if columns != ("updated_at",):
+                return list_query
+            raise probe_error
+        mock_db_connection.table.return_value.select.side_effect = select
+        
+        repository.list_models()
+        repository.list_models()
+        
+        assert list_query.execute.call_count == 2
+        probes = [c for c in mock_db_connection.table.return_value.select.call_args_list if c.args == ("updated_at",)]
+        assert len(probes) == 1
+    
+    def test_list_models_probe_error(self, repository, mock_db_connection):
+        """Test list_models raises when the probe fails for a reason other than a missing column."""
+        probe_error = APIError({"code": "57014", "message": "canceling statement due to statement timeout"})
+        mock_db_connection.table.return_value.select.side_effect = probe_error
         
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.delete.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+        with pytest.raises(RuntimeError, match="Failed to list models"):
+            repository.list_models()
+    
+    def test_list_models_empty(self, repository, mock_db_connection):
+        """Test listing models when database is empty."""
+        self._mock_model_query(mock_db_connection, [])
         
-        with pytest.raises(RuntimeError) as exc_info:
-            repository.delete_model("nonexistent")
+        result = repository.list_models()
         
-        assert "No model found to delete" in str(exc_info.value)
+        assert result == []
     
-    def test_delete_model_with_error(self, repository, mock_db_connection):
-        """Test delete_model raises RuntimeError when database returns an error."""
-        mock_error = MagicMock()
-        mock_error.message = "Database connection failed"
+    def test_get_model_served_from_cache(self, repository, mock_db_connection):
+        """Test get_model, get_artifact_uri and model_exists share one cached lookup."""
+        mock_query = self._mock_model_query(mock_db_connection, [_TEST_MODEL_ROW])
         
-        mock_response = MagicMock()
-        mock_response.error = mock_error
-        mock_response.data = None
+        repository.get_model("test_model")
+        assert repository.get_artifact_uri("test_model") == "s3://bucket/model.pkl"
+        assert repository.model_exists("test_model") is True
         
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.delete.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+        mock_query.execute.assert_called_once()
+    
+    def test_get_model_returns_copies_of_cached_models(self, repository, mock_db_connection):
+        """Test mutating a returned model does not change what the cache serves."""
+        self._mock_model_query(mock_db_connection, [_TEST_MODEL_ROW])
         
-        with pytest.raises(RuntimeError) as exc_info:
-            repository.delete_model("test_model")
+        first = repository.get_model("test_model")
+        first.lifecycle_stage = "archived"
+        second = repository.get_model("test_model")
         
-        assert "Failed to delete model: Database connection failed" in str(exc_info.value)
+        assert second is not first
+        assert second.lifecycle_stage == _TEST_MODEL_ROW["lifecycle_stage"]
     
-    def test_delete_model_missing_name(self, repository):
-        """Test delete_model raises ValueError when model_name is missing."""
-        with pytest.raises(ValueError) as exc_info:
-            repository.delete_model("")
+    def test_get_model_cache_expires(self, repository, mock_db_connection):
+        """Test cached models are refetched once MODEL_CACHE_TTL has passed."""
+        mock_query = self._mock_model_query(mock_db_connection, [_TEST_MODEL_ROW])
         
-        assert "Model name is required for deletion" in str(exc_info.value)
+        with patch('utils.cache.monotonic', return_value=100.0):
+            repository.get_model("test_model")
+        with patch('utils.cache.monotonic', return_value=100.0 + repository.MODEL_CACHE_TTL):
+            repository.get_model("test_model")
+        
+        assert mock_query.execute.call_count == 2
     
-    def test_get_artifact_uri_success(self, repository, mock_db_connection):
-        """Test successfully getting artifact URI for a model."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = [{
-            "artifact_uri": "s3://bucket/model.pkl",
-            "model_name": "test_model",
-            "associated_run_id": "run_123",
-            "lifecycle_stage": "registered"
-        }]
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+    def test_update_model_invalidates_cache(self, repository, sample_model, sample_record, mock_db_connection):
+        """Test updating a model evicts it from the get_model cache."""
+        mock_query = self._mock_model_query(mock_db_connection, [sample_record])
         
-        result = repository.get_artifact_uri("test_model")
+        repository.get_model("test_model")
+        repository.update_model(sample_model)
+        repository.get_model("test_model")
         
-        assert result == "s3://bucket/model.pkl"
+        assert mock_query.execute.call_count == 3
     
-    def test_get_artifact_uri_not_found(self, repository, mock_db_connection):
-        """Test get_artifact_uri returns None when model is not found."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = []
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+    def test_get_model_cache_disabled(self, mock_db_connection):
+        """Test get_model always queries the database when caching is disabled."""
+        repository = ModelRepository(mock_db_connection, cache=False)
+        mock_query = self._mock_model_query(mock_db_connection, [_TEST_MODEL_ROW])
         
-        result = repository.get_artifact_uri("nonexistent")
+        repository.get_model("test_model")
+        repository.get_model("test_model")
         
-        assert result is None
+        assert mock_query.execute.call_count == 2
+        mock_db_connection.table.assert_called_once_with("Model")
     
-    def test_list_models_success(self, repository, mock_db_connection):
-        """Test successfully listing all models."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = [
+    @pytest.mark.parametrize("model_names,stored,queried", [
+        (["model1", "model2"], ["model2", "model1"], ["model1", "model2"]),
+        (["model1", "", "nonexistent"], ["model1"], ["model1", "nonexistent"]),
+    ], ids=["all_found", "skips_invalid_and_missing"])
+    def test_batch_get(self, repository, mock_db_connection, model_names, stored, queried):
+        """Test batch_get fetches valid names in one query and returns found models in request order."""
+        mock_query = self._mock_model_query(mock_db_connection, [
             {
-                "artifact_uri": "s3://bucket/model1.pkl",
-                "model_name": "model1",
+                "artifact_uri": f"s3://bucket/{name}.pkl",
+                "model_name": name,
                 "associated_run_id": "run_1",
                 "lifecycle_stage": "registered"
-            },
-            {
-                "artifact_uri": "s3://bucket/model2.pkl",
-                "model_name": "model2",
-                "associated_run_id": "run_2",
-                "lifecycle_stage": "staging"
             }
-        ]
+            for name in stored
+        ])
         
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
-        
-        result = repository.list_models()
-        
-        assert len(result) == 2
-        assert all(isinstance(model, Model) for model in result)
-        assert result[0].model_name == "model1"
-        assert result[1].model_name == "model2"
+        result = repository.batch_get(model_names)
         
-        mock_db_connection.table.assert_called_once_with("Model")
-        mock_query.select.assert_called_once_with("*")
+        assert [model.model_name for model in result] == [name for name in queried if name in stored]
+        mock_query.in_.assert_called_once_with("model_name", queried)
         mock_query.execute.assert_called_once()
     
-    def test_list_models_empty(self, repository, mock_db_connection):
-        """Test listing models when database is empty."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = []
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
-        
-        result = repository.list_models()
-        
-        assert result == []
+    def test_batch_get_requests_only_uncached_models(self, repository, sample_record, mock_db_connection):
+        """Test batch_get serves cached models and caches the ones it fetches."""
+        mock_query = self._mock_model_query(mock_db_connection, [sample_record])
+        repository.get_model("test_model")
+        mock_query.execute.return_value = SimpleNamespace(data=[dict(sample_record, model_name="model2")])
+        
+        result = repository.batch_get(["model2", "test_model"])
+        
+        assert [model.model_name for model in result] == ["model2", "test_model"]
+        mock_query.in_.assert_called_once_with("model_name", ["model2"])
+        assert repository.get_model("model2").to_record() == result[0].to_record()
+        assert mock_query.execute.call_count == 2
     
-    def test_list_models_with_error(self, repository, mock_db_connection):
-        """Test list_models raises RuntimeError when database returns an error."""
-        mock_error = MagicMock()
-        mock_error.message = "Database connection failed"
-        
-        mock_response = MagicMock()
-        mock_response.error = mock_error
-        mock_response.data = None
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
-        
-        with pytest.raises(RuntimeError) as exc_info:
-            repository.list_models()
-        
-        assert "Failed to list models: Database connection failed" in str(exc_info.value)
-    
-    def test_batch_get_success(self, repository, mock_db_connection):
-        """Test successfully retrieving multiple models."""
-        mock_response_1 = MagicMock()
-        mock_response_1.error = None
-        mock_response_1.data = [{
-            "artifact_uri": "s3://bucket/model1.pkl",
-            "model_name": "model1",
-            "associated_run_id": "run_1",
-            "lifecycle_stage": "registered"
-        }]
-        
-        mock_response_2 = MagicMock()
-        mock_response_2.error = None
-        mock_response_2.data = [{
-            "artifact_uri": "s3://bucket/model2.pkl",
-            "model_name": "model2",
-            "associated_run_id": "run_2",
-            "lifecycle_stage": "staging"
-        }]
-        
-        mock_query = MagicMock()
-        mock_query.execute.side_effect = [mock_response_1, mock_response_2]
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+    def test_batch_get_returns_copies_of_cached_models(self, repository, sample_record, mock_db_connection):
+        """Test models returned by batch_get are not shared with the cache."""
+        self._mock_model_query(mock_db_connection, [sample_record])
         
-        model_names = ["model1", "model2"]
-        result = repository.batch_get(model_names)
+        fetched, = repository.batch_get(["test_model"])
+        fetched.lifecycle_stage = "archived"
+        cached, = repository.batch_get(["test_model"])
+        cached.lifecycle_stage = "staging"
         
-        assert len(result) == 2
-        assert result[0].model_name == "model1"
-        assert result[1].model_name == "model2"
+        assert repository.get_model("test_model").lifecycle_stage == sample_record["lifecycle_stage"]
     
     def test_batch_get_empty_list(self, repository):
         """Test batch_get with empty list."""
@@ -391,74 +480,32 @@ class TestModelRepository:
         
         assert result == []
     
-    def test_batch_get_skips_invalid_entries(self, repository, mock_db_connection):
-        """Test batch_get skips empty names and non-found models."""
-        mock_response_1 = MagicMock()
-        mock_response_1.error = None
-        mock_response_1.data = [{
-            "artifact_uri": "s3://bucket/model1.pkl",
-            "model_name": "model1",
-            "associated_run_id": "run_1",
-            "lifecycle_stage": "registered"
-        }]
-        
-        mock_response_2 = MagicMock()
-        mock_response_2.error = None
-        mock_response_2.data = []
-        
-        mock_query = MagicMock()
-        mock_query.execute.side_effect = [mock_response_1, mock_response_2]
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
-        
-        model_names = ["model1", "", "nonexistent"]
-        result = repository.batch_get(model_names)
-        
-        assert len(result) == 1
-        assert result[0].model_name == "model1"
-    
     def test_batch_get_non_string_name(self, repository):
         """Test batch_get raises ValueError when model name is not a string."""
-        with pytest.raises(ValueError) as exc_info:
+        with pytest.raises(ValueError, match="Model names must be strings"):
             repository.batch_get([123])
+    
+    def test_batch_get_non_string_name_reports_index(self, repository, mock_db_connection):
+        """Test batch_get names the offending entry and makes no request."""
+        with pytest.raises(ValueError, match="int at index 2"):
+            repository.batch_get(["model1", "", 42])
         
-        assert "Model names must be strings" in str(exc_info.value)
+        mock_db_connection.table.assert_not_called()
     
     def test_model_exists_true(self, repository, mock_db_connection):
         """Test model_exists returns True when model exists."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = [{
-            "artifact_uri": "s3://bucket/model.pkl",
-            "model_name": "test_model",
-            "associated_run_id": "run_123",
-            "lifecycle_stage": "registered"
-        }]
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+        mock_query = self._mock_model_query(mock_db_connection, [], count=1)
         
         result = repository.model_exists("test_model")
         
         assert result is True
+        mock_query.select.assert_called_once_with("model_name", head=True, count="exact")
+        mock_query.eq.assert_called_once_with("model_name", "test_model")
     
     def test_model_exists_false(self, repository, mock_db_connection):
         """Test model_exists returns False when model does not exist."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = []
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
-        mock_query.eq.return_value = mock_query
-        mock_query.select.return_value = mock_query
-        mock_db_connection.table.return_value = mock_query
+        self._mock_model_query(mock_db_connection, [], count=0)
         
         result = repository.model_exists("nonexistent")
         
         assert result is False
-
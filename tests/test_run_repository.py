@@ -1,8 +1,17 @@
+import gc
+import logging
+import threading
+import httpx
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, patch
+from storage.db import BULK_CHUNK_SIZE
+from storage import run_repository
 from storage.run_repository import RunRepository
 from core.run import Run
 from datetime import datetime, timezone
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+from tests.fakes import FakeDBConnection, FakeResponse, start_run
 
 
 class TestRunRepository:
@@ -43,6 +52,7 @@ class TestRunRepository:
         fixed_time = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
         mock_datetime.now.return_value = fixed_time
         mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
+        self._without_start_run_function(mock_db_connection)
         
         repository.add_run(sample_run)
         
@@ -50,15 +60,78 @@ class TestRunRepository:
         call_args = mock_db_connection.insert.call_args
         assert call_args[0][0] == "Run"
         record = call_args[0][1]
-        assert record["run_name"] == "test_run"
+        assert record["name"] == "test_run"
         assert record["dataset_id"] == "dataset_1"
-        assert record["start_time"] == fixed_time.replace(tzinfo=None)
+        assert record["start_time"] == fixed_time.replace(tzinfo=None).isoformat()
+    
+    def _without_start_run_function(self, mock_db_connection):
+        """Make the start_run database function look uninstalled."""
+        mock_db_connection.rpc.return_value.execute.side_effect = APIError(
+            {"code": "PGRST202", "message": "Could not find the function"}
+        )
+    
+    def test_add_run_returns_and_caches_run_id(self, repository, sample_run, mock_db_connection):
+        """Test add_run returns the generated UUID and get_run_id reuses it."""
+        self._without_start_run_function(mock_db_connection)
+        mock_db_connection.insert.return_value = {"run_id": "uuid-1", "name": sample_run.run_name}
+        
+        assert repository.add_run(sample_run) == "uuid-1"
+        assert repository.get_run_id(sample_run.run_name) == "uuid-1"
+        mock_db_connection.table.assert_not_called()
+    
+    def test_add_run_uses_function(self, repository, sample_run, mock_db_connection):
+        """Test add_run inserts through the database function and caches the UUID it returns."""
+        mock_db_connection.rpc.return_value.execute.return_value = FakeResponse(data="uuid-1")
+        
+        assert repository.add_run(sample_run) == "uuid-1"
+        
+        mock_db_connection.rpc.assert_called_once_with("start_run", {"run": sample_run.to_record()})
+        mock_db_connection.insert.assert_not_called()
+        assert repository.get_run_id(sample_run.run_name) == "uuid-1"
+    
+    def test_add_run_probes_missing_function_once(self, repository, sample_run, mock_db_connection):
+        """Test add_run falls back to a direct insert and stops calling a missing function."""
+        self._without_start_run_function(mock_db_connection)
+        mock_db_connection.insert.return_value = {"run_id": "uuid-1"}
+        
+        repository.add_run(sample_run)
+        repository.add_run(sample_run)
+        
+        mock_db_connection.rpc.assert_called_once()
+        assert mock_db_connection.insert.call_count == 2
+    
+    def test_add_run_function_error(self, repository, sample_run, mock_db_connection):
+        """Test add_run raises RuntimeError for function errors other than a missing function."""
+        mock_db_connection.rpc.return_value.execute.side_effect = APIError({"message": "Database connection failed"})
+        
+        with pytest.raises(RuntimeError, match="Failed to add run: Database connection failed"):
+            repository.add_run(sample_run)
+        mock_db_connection.insert.assert_not_called()
+    
+    def test_runs_hash_by_identity(self, sample_run):
+        """Test runs can be used in sets and as dict keys, compared by identity."""
+        assert {sample_run: 1}[sample_run] == 1
+        assert sample_run != Run.from_trusted_record(sample_run.to_record())
+    
+    def test_to_insert_record_serializes_times(self, repository):
+        """Test insert records carry the shared start_time and an ISO end_time."""
+        run = Run(
+            dataset_id="dataset_1",
+            run_name="run1",
+            actor="user",
+            parameters={},
+            start_time=datetime(2024, 1, 1, 9, 0, 0),
+            end_time=datetime(2024, 1, 1, 10, 0, 0)
+        )
+        
+        record = repository._to_insert_record(run, "2024-01-01T12:00:00")
+        
+        assert record["start_time"] == "2024-01-01T12:00:00"
+        assert record["end_time"] == "2024-01-01T10:00:00"
     
     def test_get_run_success(self, repository, mock_db_connection):
         """Test successfully retrieving a run by name."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = [{
+        mock_response = FakeResponse(data=[{
             "dataset_id": "dataset_1",
             "run_name": "test_run",
             "actor": "test_user",
@@ -67,11 +140,12 @@ class TestRunRepository:
             "code_reference": "abc123",
             "metrics": {"accuracy": 0.95},
             "end_time": None
-        }]
+        }])
         
-        mock_query = MagicMock()
+        mock_query = Mock()
         mock_query.execute.return_value = mock_response
         mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
         mock_query.select.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
         
@@ -82,19 +156,20 @@ class TestRunRepository:
         assert result.run_name == "test_run"
         
         mock_db_connection.table.assert_called_once_with("Run")
-        mock_query.select.assert_called_once_with("*")
-        mock_query.eq.assert_called_once_with("run_name", "test_run")
+        mock_query.select.assert_called_once_with(
+            "dataset_id,name,actor,parameters,code_reference,metrics,start_time,end_time")
+        mock_query.eq.assert_called_once_with("name", "test_run")
+        mock_query.limit.assert_called_once_with(1)
         mock_query.execute.assert_called_once()
     
     def test_get_run_not_found(self, repository, mock_db_connection):
         """Test retrieving a run that doesn't exist returns None."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.data = []
+        mock_response = FakeResponse(data=[])
         
-        mock_query = MagicMock()
+        mock_query = Mock()
         mock_query.execute.return_value = mock_response
         mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
         mock_query.select.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
         
@@ -104,23 +179,152 @@ class TestRunRepository:
     
     def test_get_run_with_error(self, repository, mock_db_connection):
         """Test that get_run raises RuntimeError when database returns an error."""
-        mock_error = MagicMock()
-        mock_error.message = "Database connection failed"
+        mock_query = Mock()
+        mock_query.execute.side_effect = APIError({"message": "Database connection failed"})
+        mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.select.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
         
-        mock_response = MagicMock()
-        mock_response.error = mock_error
-        mock_response.data = None
+        with pytest.raises(RuntimeError) as exc_info:
+            repository.get_run("test_run")
         
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
+        assert "Error retrieving run: Database connection failed" in str(exc_info.value)
+    
+    def test_get_run_id_limits_to_one_row(self, repository, mock_db_connection):
+        """Test get_run_id projects run_id and stops at the first match."""
+        mock_query = Mock()
+        mock_query.execute.return_value = FakeResponse(data=[{"run_id": "uuid-1"}])
+        mock_query.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        assert repository.get_run_id("test_run") == "uuid-1"
+        mock_query.select.assert_called_once_with("run_id")
+        mock_query.eq.assert_called_once_with("name", "test_run")
+        mock_query.limit.assert_called_once_with(1)
+    
+    def test_get_run_id_cached(self, repository, mock_db_connection):
+        """Test repeat get_run_id calls are served from cache until the run is deleted."""
+        mock_query = Mock()
+        mock_query.execute.return_value = FakeResponse(data=[{"run_id": "uuid-1"}], count=1)
+        mock_query.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.delete.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        assert repository.get_run_id("test_run") == "uuid-1"
+        assert repository.get_run_id("test_run") == "uuid-1"
+        assert mock_query.select.call_count == 1
+        
+        repository.delete_run("test_run")
+        repository.get_run_id("test_run")
+        assert mock_query.select.call_count == 2
+    
+    def test_get_run_id_cache_disabled(self, mock_db_connection):
+        """Test get_run_id always queries the database when caching is disabled."""
+        repository = RunRepository(mock_db_connection, cache=False)
+        mock_query = Mock()
+        mock_query.execute.return_value = FakeResponse(data=[{"run_id": "uuid-1"}])
+        mock_query.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        repository.get_run_id("test_run")
+        repository.get_run_id("test_run")
+        
+        assert mock_query.execute.call_count == 2
+    
+    def test_batch_get_ids_fetches_uncached_names_in_one_query(self, repository, mock_db_connection):
+        """Test batch_get_ids serves cached IDs, fetches the rest with one IN query, and caches them."""
+        mock_query = Mock()
+        mock_query.execute.side_effect = [
+            FakeResponse(data=[{"run_id": "uuid-1"}]),
+            FakeResponse(data=[{"name": "run2", "run_id": "uuid-2"}]),
+        ]
+        mock_query.select.return_value = mock_query
         mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.in_.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        repository.get_run_id("run1")
+        
+        ids = repository.batch_get_ids(["run2", "", "run1", "missing", "run2"])
+        
+        assert ids == {"run2": "uuid-2", "run1": "uuid-1"}
+        assert list(ids) == ["run2", "run1"]
+        mock_query.in_.assert_called_once_with("name", ["run2", "missing"])
+        assert repository.get_run_id("run2") == "uuid-2"
+        assert mock_query.execute.call_count == 2
+    
+    def test_batch_get_ids_raises_on_failed_query(self, repository, mock_db_connection):
+        """Test batch_get_ids does not silently drop IDs when a query fails."""
+        mock_query = Mock()
+        mock_query.execute.side_effect = Exception("Database error")
         mock_query.select.return_value = mock_query
+        mock_query.in_.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
         
         with pytest.raises(RuntimeError) as exc_info:
+            repository.batch_get_ids(["run1"])
+        
+        assert "Error retrieving runs: Database error" in str(exc_info.value)
+    
+    def _mock_get_run_query(self, mock_db_connection):
+        """Wire a select chain returning one stored run row."""
+        mock_query = Mock()
+        mock_query.execute.return_value = FakeResponse(data=[{
+            "dataset_id": "dataset_1",
+            "name": "test_run",
+            "actor": "test_user",
+            "parameters": {},
+            "code_reference": None,
+            "metrics": {},
+            "start_time": "2024-01-01T12:00:00",
+            "end_time": None
+        }])
+        mock_query.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.update.return_value = mock_query
+        mock_query.is_.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        return mock_query
+    
+    def test_get_run_cached(self, repository, mock_db_connection):
+        """Test repeat get_run calls are served from cache unless fresh is requested."""
+        mock_query = self._mock_get_run_query(mock_db_connection)
+        
+        first = repository.get_run("test_run")
+        assert repository.get_run("test_run").to_record() == first.to_record()
+        assert mock_query.select.call_count == 1
+        
+        repository.get_run("test_run", fresh=True)
+        assert mock_query.select.call_count == 2
+    
+    def test_get_run_cache_invalidated_by_end_run(self, repository, mock_db_connection):
+        """Test ending a run evicts it from the get_run cache."""
+        mock_query = self._mock_get_run_query(mock_db_connection)
+        
+        repository.get_run("test_run")
+        repository.end_run("test_run")
+        repository.get_run("test_run")
+        
+        assert mock_query.select.call_count == 2
+    
+    def test_get_run_cache_expires(self, repository, mock_db_connection):
+        """Test cached runs are refetched once RUN_CACHE_TTL has passed."""
+        mock_query = self._mock_get_run_query(mock_db_connection)
+        
+        with patch('utils.cache.monotonic', return_value=100.0):
+            repository.get_run("test_run")
+        with patch('utils.cache.monotonic', return_value=100.0 + repository.RUN_CACHE_TTL):
             repository.get_run("test_run")
         
-        assert "Error retrieving run: Database connection failed" in str(exc_info.value)
+        assert mock_query.select.call_count == 2
     
     def test_get_run_missing_name(self, repository):
         """Test that get_run raises ValueError when run_name is missing."""
@@ -130,32 +334,29 @@ class TestRunRepository:
         assert "Run name is required to retrieve a run" in str(exc_info.value)
     
     def test_batch_get_success(self, repository, mock_db_connection):
-        """Test successfully retrieving multiple runs."""
-        mock_response_1 = MagicMock()
-        mock_response_1.error = None
-        mock_response_1.data = [{
-            "dataset_id": "dataset_1",
-            "run_name": "run1",
-            "actor": "user1",
-            "parameters": {},
-            "start_time": datetime.now(timezone.utc),
-            "end_time": None
-        }]
-        
-        mock_response_2 = MagicMock()
-        mock_response_2.error = None
-        mock_response_2.data = [{
-            "dataset_id": "dataset_2",
-            "run_name": "run2",
-            "actor": "user2",
-            "parameters": {},
-            "start_time": datetime.now(timezone.utc),
-            "end_time": None
-        }]
+        """Test successfully retrieving multiple runs with a single query."""
+        mock_response = FakeResponse(data=[
+            {
+                "dataset_id": "dataset_2",
+                "run_name": "run2",
+                "actor": "user2",
+                "parameters": {},
+                "start_time": datetime.now(timezone.utc),
+                "end_time": None
+            },
+            {
+                "dataset_id": "dataset_1",
+                "run_name": "run1",
+                "actor": "user1",
+                "parameters": {},
+                "start_time": datetime.now(timezone.utc),
+                "end_time": None
+            }
+        ])
         
-        mock_query = MagicMock()
-        mock_query.execute.side_effect = [mock_response_1, mock_response_2]
-        mock_query.eq.return_value = mock_query
+        mock_query = Mock()
+        mock_query.execute.return_value = mock_response
+        mock_query.in_.return_value = mock_query
         mock_query.select.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
         
@@ -166,37 +367,74 @@ class TestRunRepository:
         assert len(runs) == 2
         assert runs[0].run_name == "run1"
         assert runs[1].run_name == "run2"
+        mock_query.in_.assert_called_once_with("name", ["run1", "run2"])
+        mock_query.execute.assert_called_once()
+    
+    def test_batch_get_dedupes_and_chunks_names(self, repository, mock_db_connection):
+        """Test batch_get drops empty and repeated names and queries each chunk once."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 2
+        mock_query = Mock()
+        mock_query.execute.return_value = FakeResponse(data=[])
+        mock_query.in_.return_value = mock_query
+        mock_query.select.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        runs, count = repository.batch_get(["run1", "", "run2", "run1", "run3"])
+        
+        assert (runs, count) == ([], 0)
+        # Chunks run on worker threads, so compare them regardless of order
+        assert sorted(c.args for c in mock_query.in_.call_args_list) == [
+            ("name", ["run1", "run2"]),
+            ("name", ["run3"]),
+        ]
     
-    def test_batch_get_empty_list(self, repository):
+    def test_batch_get_projection_returns_columns(self, repository, mock_db_connection):
+        """Test batch_get_projection fetches only the requested columns as aligned lists."""
+        mock_query = Mock()
+        mock_query.execute.return_value = FakeResponse(data=[
+            {"name": "run2", "run_id": "uuid-2"},
+            {"name": "run1", "run_id": "uuid-1"},
+        ])
+        mock_query.in_.return_value = mock_query
+        mock_query.select.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        records = repository.batch_get_projection(["run1", "missing", "run2"], ["run_id", "name"])
+        
+        assert records == {"run_id": ["uuid-1", "uuid-2"], "name": ["run1", "run2"]}
+        mock_query.select.assert_called_once_with("name,run_id")
+    
+    def test_batch_get_projection_unknown_field(self, repository, mock_db_connection):
+        """Test batch_get_projection rejects columns the run table does not have."""
+        with pytest.raises(ValueError) as exc_info:
+            repository.batch_get_projection(["run1"], ["run_name"])
+        
+        assert "Unknown run fields: run_name" in str(exc_info.value)
+        mock_db_connection.table.assert_not_called()
+    
+    def test_batch_get_empty_list(self, repository, mock_db_connection):
         """Test batch_get with empty list."""
         runs, count = repository.batch_get([])
         
         assert count == 0
         assert len(runs) == 0
+        mock_db_connection.table.assert_not_called()
     
     def test_batch_get_skips_errors(self, repository, mock_db_connection):
-        """Test batch_get skips runs that cause RuntimeError."""
-        mock_response_1 = MagicMock()
-        mock_response_1.error = None
-        mock_response_1.data = [{
+        """Test batch_get skips chunks whose query fails."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 1
+        mock_response_1 = FakeResponse(data=[{
             "dataset_id": "dataset_1",
             "run_name": "run1",
             "actor": "user1",
             "parameters": {},
             "start_time": datetime.now(timezone.utc),
             "end_time": None
-        }]
+        }])
         
-        mock_error = MagicMock()
-        mock_error.message = "Database error"
-        
-        mock_response_2 = MagicMock()
-        mock_response_2.error = mock_error
-        mock_response_2.data = None
-        
-        mock_query = MagicMock()
-        mock_query.execute.side_effect = [mock_response_1, mock_response_2]
-        mock_query.eq.return_value = mock_query
+        mock_query = Mock()
+        mock_query.execute.side_effect = [mock_response_1, Exception("Database error")]
+        mock_query.in_.return_value = mock_query
         mock_query.select.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
         
@@ -207,9 +445,42 @@ class TestRunRepository:
         assert len(runs) == 1
         assert runs[0].run_name == "run1"
     
+    def test_batch_get_runs_chunks_in_parallel(self, repository, mock_db_connection):
+        """Test batch_get has several chunk queries in flight at once and keeps request order."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 1
+        # Each execute waits for the other; sequential dispatch would break the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def in_(column, chunk):
+            def execute():
+                barrier.wait()
+                return FakeResponse(data=[{"dataset_id": "dataset_1", "name": chunk[0], "actor": "user",
+                                        "parameters": {}, "start_time": "2024-01-01T12:00:00", "end_time": None}])
+            return Mock(execute=execute)
+        
+        mock_db_connection.table.return_value.select.return_value.in_.side_effect = in_
+        
+        runs, count = repository.batch_get(["run2", "run1"])
+        
+        assert count == 2
+        assert [run.run_name for run in runs] == ["run2", "run1"]
+    
+    def test_batch_get_strict_raises(self, repository, mock_db_connection):
+        """Test batch_get raises on a failed chunk when strict is set."""
+        mock_query = Mock()
+        mock_query.execute.side_effect = Exception("Database error")
+        mock_query.in_.return_value = mock_query
+        mock_query.select.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        with pytest.raises(RuntimeError) as exc_info:
+            repository.batch_get(["run1"], strict=True)
+        
+        assert "Error retrieving runs: Database error" in str(exc_info.value)
+    
     def test_update_run_success(self, repository, sample_run, mock_db_connection):
         """Test successfully updating a run."""
-        mock_query = MagicMock()
+        mock_query = Mock()
         mock_query.update.return_value = mock_query
         mock_query.eq.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
@@ -218,12 +489,37 @@ class TestRunRepository:
         
         mock_db_connection.table.assert_called_once_with("Run")
         mock_query.update.assert_called_once()
-        mock_query.eq.assert_called_once_with("run_name", "test_run")
+        mock_query.eq.assert_called_once_with("name", "test_run")
         mock_query.execute.assert_called_once()
     
+    def test_update_run_only_given_fields(self, repository, sample_run, mock_db_connection):
+        """Test update_run sends only the requested columns."""
+        mock_query = Mock()
+        mock_query.update.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        repository.update_run(sample_run, fields=["metrics", "run_name"])
+        
+        mock_query.update.assert_called_once_with({"metrics": sample_run.metrics, "name": "test_run"})
+        mock_query.eq.assert_called_once_with("name", "test_run")
+    
+    def test_update_run_no_fields_is_noop(self, repository, sample_run, mock_db_connection):
+        """Test update_run with an empty field list sends nothing."""
+        repository.update_run(sample_run, fields=[])
+        
+        mock_db_connection.table.assert_not_called()
+    
+    def test_update_run_unknown_field(self, repository, sample_run):
+        """Test update_run rejects fields that are not Run attributes."""
+        with pytest.raises(ValueError) as exc_info:
+            repository.update_run(sample_run, fields=["status"])
+        
+        assert "Unknown run fields: status" in str(exc_info.value)
+    
     def test_update_run_missing_run_name(self, repository, mock_db_connection):
         """Test update_run raises ValueError when run_name is missing."""
-        mock_run = MagicMock()
+        mock_run = Mock()
         mock_run.to_record.return_value = {"dataset_id": "dataset_1", "actor": "user"}
         
         with pytest.raises(ValueError) as exc_info:
@@ -231,27 +527,249 @@ class TestRunRepository:
         
         assert "Run name is required to update a run" in str(exc_info.value)
     
+    def _mock_end_run_queries(self, mock_db_connection, updated_count, existing_count=0):
+        """Wire mock chains for end_run's fallback: conditional update and existence count."""
+        mock_db_connection.rpc.return_value.execute.side_effect = APIError(
+            {"code": "PGRST202", "message": "Could not find the function"}
+        )
+        update_query = Mock()
+        update_query.update.return_value = update_query
+        update_query.eq.return_value = update_query
+        update_query.is_.return_value = update_query
+        update_query.execute.return_value = FakeResponse(data=[], count=updated_count)
+        
+        count_query = Mock()
+        count_query.eq.return_value = count_query
+        count_query.execute.return_value = FakeResponse(data=[], count=existing_count)
+        update_query.select.return_value = count_query
+        
+        mock_db_connection.table.return_value = update_query
+        return update_query, count_query
+    
     @patch('storage.run_repository.datetime')
     def test_end_run_success(self, mock_datetime, repository, mock_db_connection):
-        """Test successfully ending a run."""
+        """Test ending a run with a single conditional update."""
         fixed_time = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
         mock_datetime.now.return_value = fixed_time
+        update_query, count_query = self._mock_end_run_queries(mock_db_connection, 1)
+        
+        repository.end_run("test_run")
         
-        mock_run = MagicMock()
-        mock_run.end_time = None
+        mock_db_connection.table.assert_called_with("Run")
+        update_query.update.assert_called_once_with(
+            {"end_time": fixed_time.replace(tzinfo=None).isoformat()}, count="exact", returning=ReturnMethod.minimal
+        )
+        update_query.eq.assert_called_once_with("name", "test_run")
+        update_query.is_.assert_called_once_with("end_time", "null")
+        update_query.execute.assert_called_once()
+        count_query.execute.assert_not_called()
+    
+    def test_to_insert_record_stamps_start_time(self, sample_run):
+        """Test insert records carry the given start_time and the run's other fields."""
+        record = RunRepository._to_insert_record(sample_run, "2024-01-01T12:00:00")
         
-        mock_query_update = MagicMock()
-        mock_query_update.eq.return_value = mock_query_update
-        mock_query_update.update.return_value = mock_query_update
-        mock_db_connection.table.return_value = mock_query_update
+        assert record == {**sample_run.to_record(), "start_time": "2024-01-01T12:00:00"}
+        assert list(record) == list(Run.RECORD_KEYS)
+    
+    def test_end_run_with_error(self, repository, mock_db_connection):
+        """Test end_run wraps a failed update in RuntimeError without probing."""
+        update_query, count_query = self._mock_end_run_queries(mock_db_connection, 0)
+        update_query.execute.side_effect = APIError({"message": "Database connection failed"})
+        
+        with pytest.raises(RuntimeError) as exc_info:
+            repository.end_run("test_run")
+        
+        assert "Failed to end run" in str(exc_info.value)
+        count_query.execute.assert_not_called()
+    
+    def _queued_run(self, name):
+        """Build a run for the write-buffer tests."""
+        return Run(dataset_id="dataset_1", run_name=name, actor="user", parameters={},
+                   start_time=datetime(2024, 1, 1, 12, 0, 0))
+    
+    @pytest.fixture
+    def mock_atexit(self, monkeypatch):
+        """Patch atexit and start from a clean exit-flush registry."""
+        mock = Mock()
+        monkeypatch.setattr(run_repository, "atexit", mock)
+        monkeypatch.setattr(run_repository, "_exit_hook_registered", False)
+        monkeypatch.setattr(run_repository, "_queued_repositories", run_repository.weakref.WeakSet())
+        return mock
+    
+    @patch('storage.run_repository.threading.Timer')
+    def test_queue_run_flushes_when_buffer_is_full(self, mock_timer, mock_atexit, repository, mock_db_connection):
+        """Test queued runs are sent in one minimal bulk insert once WRITE_BUFFER_SIZE is reached."""
+        repository.WRITE_BUFFER_SIZE = 2
+        
+        repository.queue_run(self._queued_run("run1"))
+        mock_db_connection.bulk_insert.assert_not_called()
+        repository.queue_run(self._queued_run("run2"))
+        
+        table, records = mock_db_connection.bulk_insert.call_args.args
+        assert table == "Run"
+        assert [record["name"] for record in records] == ["run1", "run2"]
+        assert mock_db_connection.bulk_insert.call_args.kwargs["returning"] == ReturnMethod.minimal
+        mock_timer.return_value.start.assert_called_once()
+        mock_timer.return_value.cancel.assert_called_once()
+        mock_atexit.register.assert_called_once_with(run_repository._flush_queued_runs)
+        mock_atexit.unregister.assert_called_once_with(run_repository._flush_queued_runs)
+    
+    @patch('storage.run_repository.threading.Timer')
+    def test_queue_run_flushes_on_timer(self, mock_timer, mock_atexit, repository, mock_db_connection):
+        """Test the background timer flushes runs queued below the buffer size."""
+        repository.queue_run(self._queued_run("run1"))
+        
+        interval, callback = mock_timer.call_args.args
+        assert interval == repository.WRITE_FLUSH_INTERVAL
+        callback()
+        
+        mock_db_connection.bulk_insert.assert_called_once()
+        repository.flush()
+        mock_db_connection.bulk_insert.assert_called_once()
+    
+    def test_flush_keeps_runs_queued_on_error(self, mock_atexit, repository, mock_db_connection):
+        """Test a failed flush raises and leaves the runs queued for the next flush."""
+        repository.WRITE_FLUSH_INTERVAL = None
+        repository.queue_run(self._queued_run("run1"))
+        mock_db_connection.bulk_insert.side_effect = RuntimeError("Failed to insert into Run: boom")
+        
+        with pytest.raises(RuntimeError) as exc_info:
+            repository.flush()
+        assert "Failed to add runs" in str(exc_info.value)
+        
+        mock_db_connection.bulk_insert.side_effect = None
+        repository.flush()
+        records = mock_db_connection.bulk_insert.call_args.args[1]
+        assert [record["name"] for record in records] == ["run1"]
+    
+    def test_exit_flush_logs_failures(self, mock_atexit, repository, mock_db_connection, caplog):
+        """Test the exit hook logs a failed flush instead of raising, and keeps the runs queued."""
+        repository.WRITE_FLUSH_INTERVAL = None
+        repository.queue_run(self._queued_run("run1"))
+        mock_db_connection.bulk_insert.side_effect = RuntimeError("Failed to insert into Run: boom")
+        
+        with caplog.at_level(logging.WARNING, logger="storage.run_repository"):
+            run_repository._flush_queued_runs()
+        
+        assert "Flushing queued runs at exit failed" in caplog.text
+        mock_atexit.unregister.assert_not_called()
+    
+    def test_exit_flush_does_not_keep_repositories_alive(self, mock_atexit, mock_db_connection):
+        """Test a repository with queued runs can still be garbage collected."""
+        repository = RunRepository(mock_db_connection)
+        repository.WRITE_FLUSH_INTERVAL = None
+        repository.queue_run(self._queued_run("run1"))
+        assert list(run_repository._queued_repositories) == [repository]
+        
+        del repository
+        gc.collect()
+        
+        assert list(run_repository._queued_repositories) == []
+    
+    def test_save_run_upserts_on_name(self, repository, mock_db_connection):
+        """Test save_run writes the run with one upsert keyed on name."""
+        run = Run(
+            dataset_id="dataset_1",
+            run_name="run1",
+            actor="user",
+            parameters={},
+            start_time=datetime(2024, 1, 1, 12, 0, 0),
+            metrics={"accuracy": 0.9}
+        )
+        
+        repository.save_run(run)
+        
+        mock_db_connection.upsert.assert_called_once_with("Run", run.to_record(), on_conflict="name")
+        mock_db_connection.insert.assert_not_called()
+    
+    def test_save_runs_upserts_once(self, repository, mock_db_connection):
+        """Test save_runs writes all runs with one upsert, keeping the last run per name."""
+        runs = [
+            Run(dataset_id="dataset_1", run_name=name, actor="user", parameters={},
+                start_time=datetime(2024, 1, 1, 12, 0, 0), metrics={"accuracy": accuracy})
+            for name, accuracy in [("run1", 0.1), ("run2", 0.2), ("run1", 0.3)]
+        ]
+        mock_query = Mock()
+        mock_query.upsert.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        repository.save_runs(runs)
+        
+        mock_query.upsert.assert_called_once_with(
+            [runs[2].to_record(), runs[1].to_record()], on_conflict="name", returning=ReturnMethod.minimal
+        )
+        mock_query.execute.assert_called_once()
+    
+    def test_save_runs_wraps_transport_errors(self, repository, mock_db_connection):
+        """Test save_runs wraps failures other than APIError, e.g. a dropped connection."""
+        mock_query = Mock()
+        mock_query.upsert.return_value = mock_query
+        mock_query.execute.side_effect = httpx.ConnectError("connection refused")
+        mock_db_connection.table.return_value = mock_query
+        
+        with pytest.raises(RuntimeError, match="Failed to save runs: connection refused"):
+            repository.save_runs([Run(dataset_id="dataset_1", run_name="run1", actor="user", parameters={},
+                                      start_time=datetime(2024, 1, 1, 12, 0, 0))])
+    
+    def test_save_run_wraps_errors(self, repository, mock_db_connection):
+        """Test save_run wraps database failures in RuntimeError."""
+        mock_db_connection.upsert.side_effect = RuntimeError("Failed to upsert into Run: boom")
+        run = Run(
+            dataset_id="dataset_1",
+            run_name="run1",
+            actor="user",
+            parameters={},
+            start_time=datetime(2024, 1, 1, 12, 0, 0)
+        )
+        
+        with pytest.raises(RuntimeError) as exc_info:
+            repository.save_run(run)
+        
+        assert "Failed to save run" in str(exc_info.value)
+    
+    def test_end_run_uses_function(self, repository, mock_db_connection):
+        """Test end_run ends the run with one call to the database function."""
+        mock_db_connection.rpc.return_value.execute.return_value = FakeResponse(data="ended")
+        
+        repository.end_run("test_run")
+        
+        mock_db_connection.rpc.assert_called_once_with("end_run_by_name", {"run_name": "test_run"})
+        mock_db_connection.table.assert_not_called()
+    
+    @pytest.mark.parametrize("status, error, message", [
+        ("already_ended", ValueError, "Run has already been ended"),
+        ("not_found", RuntimeError, "Run not found"),
+    ])
+    def test_end_run_function_reports_failure(self, repository, mock_db_connection, status, error, message):
+        """Test end_run maps the function's outcome to the matching error."""
+        mock_db_connection.rpc.return_value.execute.return_value = FakeResponse(data=status)
+        
+        with pytest.raises(error) as exc_info:
+            repository.end_run("test_run")
+        
+        assert message in str(exc_info.value)
+    
+    def test_end_run_function_error(self, repository, mock_db_connection):
+        """Test end_run raises RuntimeError for function errors other than a missing function."""
+        mock_db_connection.rpc.return_value.execute.side_effect = APIError(
+            {"code": "57014", "message": "canceling statement due to statement timeout"}
+        )
         
-        with patch.object(repository, 'get_run', return_value=mock_run):
+        with pytest.raises(RuntimeError) as exc_info:
             repository.end_run("test_run")
-            
-            mock_db_connection.table.assert_called_with("Run")
-            mock_query_update.update.assert_called_once_with({"end_time": fixed_time.replace(tzinfo=None)})
-            mock_query_update.eq.assert_called_once_with("run_name", "test_run")
-            mock_query_update.execute.assert_called_once()
+        
+        assert "Failed to end run: canceling statement" in str(exc_info.value)
+        mock_db_connection.table.assert_not_called()
+    
+    def test_end_run_probes_missing_function_once(self, repository, mock_db_connection):
+        """Test end_run stops calling the function once it is known to be missing."""
+        update_query, _ = self._mock_end_run_queries(mock_db_connection, 1)
+        
+        repository.end_run("run1")
+        repository.end_run("run2")
+        
+        mock_db_connection.rpc.assert_called_once()
+        assert update_query.update.call_count == 2
     
     def test_end_run_missing_name(self, repository):
         """Test end_run raises ValueError when run_name is missing."""
@@ -262,14 +780,22 @@ class TestRunRepository:
     
     def test_end_run_already_ended(self, repository, mock_db_connection):
         """Test end_run raises ValueError when run is already ended."""
-        mock_run = MagicMock()
-        mock_run.end_time = datetime.now(timezone.utc)
+        self._mock_end_run_queries(mock_db_connection, 0, existing_count=1)
         
-        with patch.object(repository, 'get_run', return_value=mock_run):
-            with pytest.raises(ValueError) as exc_info:
-                repository.end_run("test_run")
-            
-            assert "Run has already been ended" in str(exc_info.value)
+        with pytest.raises(ValueError) as exc_info:
+            repository.end_run("test_run")
+        
+        assert "Run has already been ended" in str(exc_info.value)
+    
+    def test_end_run_not_found(self, repository, mock_db_connection):
+        """Test end_run raises RuntimeError when the run does not exist."""
+        _, count_query = self._mock_end_run_queries(mock_db_connection, 0, existing_count=0)
+        
+        with pytest.raises(RuntimeError) as exc_info:
+            repository.end_run("missing_run")
+        
+        assert "Run not found" in str(exc_info.value)
+        count_query.execute.assert_called_once()
     
     @patch('storage.run_repository.datetime')
     def test_batch_create_success(self, mock_datetime, repository, mock_db_connection):
@@ -296,7 +822,15 @@ class TestRunRepository:
         runs = [run1, run2]
         repository.batch_create(runs)
         
-        assert mock_db_connection.insert.call_count == 2
+        mock_db_connection.insert.assert_not_called()
+        mock_db_connection.bulk_insert.assert_called_once()
+        table, records, chunk_size = mock_db_connection.bulk_insert.call_args[0]
+        assert table == "Run"
+        assert [record["name"] for record in records] == ["run1", "run2"]
+        assert {record["start_time"] for record in records} == {"2024-01-01T12:00:00"}
+        mock_datetime.now.assert_called_once_with(timezone.utc)
+        assert chunk_size == BULK_CHUNK_SIZE
+        assert mock_db_connection.bulk_insert.call_args.kwargs["returning"] == ReturnMethod.minimal
     
     @patch('storage.run_repository.datetime')
     def test_batch_create_skips_invalid_entries(self, mock_datetime, repository, mock_db_connection):
@@ -312,27 +846,27 @@ class TestRunRepository:
             start_time=datetime.now(timezone.utc)
         )
         
-        mock_run_without_name = MagicMock()
+        mock_run_without_name = Mock()
         mock_run_without_name.run_name = ""
         
         runs = [run1, mock_run_without_name]
         repository.batch_create(runs)
         
-        assert mock_db_connection.insert.call_count == 1
+        records = mock_db_connection.bulk_insert.call_args[0][1]
+        assert [record["name"] for record in records] == ["run1"]
     
     def test_batch_create_empty_list(self, repository, mock_db_connection):
         """Test batch_create with empty list."""
         repository.batch_create([])
         
         mock_db_connection.insert.assert_not_called()
+        mock_db_connection.bulk_insert.assert_not_called()
     
     def test_delete_run_success(self, repository, mock_db_connection):
         """Test successfully deleting a run."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.count = 1
+        mock_response = FakeResponse(count=1)
         
-        mock_query = MagicMock()
+        mock_query = Mock()
         mock_query.execute.return_value = mock_response
         mock_query.eq.return_value = mock_query
         mock_query.delete.return_value = mock_query
@@ -342,17 +876,15 @@ class TestRunRepository:
         
         assert result == 1
         mock_db_connection.table.assert_called_once_with("Run")
-        mock_query.delete.assert_called_once()
-        mock_query.eq.assert_called_once_with("run_name", "test_run")
+        mock_query.delete.assert_called_once_with(count="exact", returning=ReturnMethod.minimal)
+        mock_query.eq.assert_called_once_with("name", "test_run")
         mock_query.execute.assert_called_once()
     
     def test_delete_run_not_found(self, repository, mock_db_connection):
         """Test deleting a run that doesn't exist returns 0."""
-        mock_response = MagicMock()
-        mock_response.error = None
-        mock_response.count = 0
+        mock_response = FakeResponse(count=0)
         
-        mock_query = MagicMock()
+        mock_query = Mock()
         mock_query.execute.return_value = mock_response
         mock_query.eq.return_value = mock_query
         mock_query.delete.return_value = mock_query
@@ -364,15 +896,8 @@ class TestRunRepository:
     
     def test_delete_run_with_error(self, repository, mock_db_connection):
         """Test that delete_run raises RuntimeError when database returns an error."""
-        mock_error = MagicMock()
-        mock_error.message = "Database connection failed"
-        
-        mock_response = MagicMock()
-        mock_response.error = mock_error
-        mock_response.count = None
-        
-        mock_query = MagicMock()
-        mock_query.execute.return_value = mock_response
+        mock_query = Mock()
+        mock_query.execute.side_effect = APIError({"message": "Database connection failed"})
         mock_query.eq.return_value = mock_query
         mock_query.delete.return_value = mock_query
         mock_db_connection.table.return_value = mock_query
@@ -382,10 +907,147 @@ class TestRunRepository:
         
         assert "Error deleting run: Database connection failed" in str(exc_info.value)
     
+    def test_delete_run_wraps_transport_errors(self, repository, mock_db_connection):
+        """Test delete_run wraps failures other than APIError, e.g. a dropped connection."""
+        mock_query = Mock()
+        mock_query.execute.side_effect = httpx.ConnectError("connection refused")
+        mock_query.eq.return_value = mock_query
+        mock_query.delete.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        with pytest.raises(RuntimeError, match="Error deleting run: connection refused"):
+            repository.delete_run("test_run")
+    
     def test_delete_run_missing_name(self, repository):
         """Test delete_run raises ValueError when run_name is missing."""
         with pytest.raises(ValueError) as exc_info:
             repository.delete_run("")
         
         assert "Run name is required to delete a run" in str(exc_info.value)
+    
+    def test_delete_runs_chunks_names(self, repository, mock_db_connection):
+        """Test delete_runs issues one IN delete per chunk and sums the counts."""
+        repository.BATCH_QUERY_CHUNK_SIZE = 2
+        mock_query = Mock()
+        mock_query.execute.side_effect = [FakeResponse(count=2), FakeResponse(count=0)]
+        mock_query.in_.return_value = mock_query
+        mock_query.delete.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        result = repository.delete_runs(["run1", "", "run2", "run1", "run3"])
+        
+        assert result == 2
+        assert [c.args for c in mock_query.in_.call_args_list] == [
+            ("name", ["run1", "run2"]),
+            ("name", ["run3"]),
+        ]
+        mock_query.eq.assert_not_called()
+    
+    def test_delete_runs_with_error(self, repository, mock_db_connection):
+        """Test delete_runs raises RuntimeError when a chunk fails."""
+        mock_query = Mock()
+        mock_query.execute.side_effect = APIError({"message": "Database connection failed"})
+        mock_query.in_.return_value = mock_query
+        mock_query.delete.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        with pytest.raises(RuntimeError) as exc_info:
+            repository.delete_runs(["run1"])
+        
+        assert "Error deleting run: Database connection failed" in str(exc_info.value)
+    
+    def test_delete_runs_wraps_transport_errors(self, repository, mock_db_connection):
+        """Test delete_runs wraps failures other than APIError, e.g. a dropped connection."""
+        mock_query = Mock()
+        mock_query.execute.side_effect = httpx.ConnectError("connection refused")
+        mock_query.in_.return_value = mock_query
+        mock_query.delete.return_value = mock_query
+        mock_db_connection.table.return_value = mock_query
+        
+        with pytest.raises(RuntimeError, match="Error deleting run: connection refused"):
+            repository.delete_runs(["run1"])
+
+
 
+class TestRunRepositoryWithFakeDB:
+    """Round-trip tests for RunRepository against the in-memory FakeDBConnection."""
+    
+    @pytest.fixture
+    def fake_db(self):
+        """Create an empty in-memory database connection."""
+        return FakeDBConnection()
+    
+    @pytest.fixture
+    def repository(self, fake_db):
+        """Create a RunRepository backed by the fake connection."""
+        return RunRepository(fake_db)
+    
+    def _run(self, name):
+        """Build an open run with the given name."""
+        return Run(
+            dataset_id="dataset_1",
+            run_name=name,
+            actor="user",
+            parameters={"epochs": 10},
+            start_time=datetime(2024, 1, 1, 9, 0, 0),
+            metrics={"accuracy": 0.95}
+        )
+    
+    @pytest.mark.parametrize("install_function", [True, False])
+    def test_add_then_get_run(self, repository, fake_db, install_function):
+        """Test a run written with add_run reads back with its fields intact, with or without the database function."""
+        if install_function:
+            fake_db.functions["start_run"] = start_run
+        run_id = repository.add_run(self._run("run1"))
+        
+        assert run_id == (fake_db.tables["Run"][0]["run_id"] if install_function else None)
+        assert fake_db.tables["Run"][0]["start_time"] != "2024-01-01T09:00:00"
+        run = repository.get_run("run1")
+        assert (run.run_name, run.dataset_id, run.parameters, run.metrics) == (
+            "run1", "dataset_1", {"epochs": 10}, {"accuracy": 0.95}
+        )
+        assert run.end_time is None
+        assert repository.get_run("missing") is None
+    
+    def test_get_run_returns_independent_runs(self, repository):
+        """Test mutating a returned run's metrics does not change cached or stored runs."""
+        repository.add_run(self._run("run1"))
+        
+        repository.get_run("run1").metrics["accuracy"] = 0.1
+        repository.get_run("run1").parameters["epochs"] = 1
+        
+        assert repository.get_run("run1").metrics == {"accuracy": 0.95}
+        assert repository.get_run("run1").parameters == {"epochs": 10}
+        assert repository.get_run("run1", fresh=True).metrics == {"accuracy": 0.95}
+    
+    def test_end_run_without_database_function(self, repository, fake_db):
+        """Test end_run falls back to queries and tells ended and missing runs apart."""
+        repository.add_run(self._run("run1"))
+        
+        repository.end_run("run1")
+        
+        assert fake_db.tables["Run"][0]["end_time"] is not None
+        assert repository.get_run("run1").end_time is not None
+        with pytest.raises(ValueError, match="already been ended"):
+            repository.end_run("run1")
+        with pytest.raises(RuntimeError, match="Run not found"):
+            repository.end_run("missing")
+    
+    def test_batch_create_get_and_delete(self, repository, fake_db):
+        """Test runs created in a batch can be fetched and deleted by name."""
+        repository.batch_create([self._run("run1"), self._run("run2"), self._run("run3")])
+        
+        runs, count = repository.batch_get(["run3", "missing", "run1"])
+        assert count == 2
+        assert [run.run_name for run in runs] == ["run3", "run1"]
+        
+        assert repository.delete_runs(["run1", "run3", "missing"]) == 2
+        assert [row["name"] for row in fake_db.tables["Run"]] == ["run2"]
+    
+    def test_batch_get_ids(self, repository, fake_db):
+        """Test batch_get_ids maps stored run names to their UUIDs."""
+        repository.batch_create([self._run("run1"), self._run("run2")])
+        for index, row in enumerate(fake_db.tables["Run"]):
+            row["run_id"] = f"uuid-{index}"
+        
+        assert repository.batch_get_ids(["run2", "missing", "run1"]) == {"run2": "uuid-1", "run1": "uuid-0"}
@@ -0,0 +1,152 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """A small bounded least-recently-used cache for repository lookups.
+
+    Repositories use this to avoid repeated database round-trips for records
+    that do not change once written. When the cache grows past ``maxsize``
+    the least recently used entry is evicted. Each operation holds an internal
+    lock, so one cache can be shared by threads (e.g. a repository's parallel
+    batch queries); repository I/O never runs under it.
+
+    Attributes:
+        maxsize: The maximum number of entries kept in the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Initialize an empty LRUCache.
+
+        Args:
+            maxsize: The maximum number of entries kept in the cache.
+
+        Raises:
+            ValueError: If maxsize is not a positive integer.
+        """
+        if maxsize <= 0:
+            raise ValueError("Cache maxsize must be positive")
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, marking it as recently used.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is not cached.
+
+        Returns:
+            Any: The cached value, or default if the key is not cached.
+        """
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return default
+            return self._entries[key]
+
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry if full.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+    def pop(self, key: Hashable) -> None:
+        """Remove key from the cache if present.
+
+        Args:
+            key: The cache key to invalidate.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TTLCache(LRUCache):
+    """An LRUCache whose entries also expire a fixed time after being stored.
+
+    For records that can change after they are written, a short time-to-live
+    bounds how stale a cached copy can get even when a writer in another
+    process does not invalidate it.
+
+    Attributes:
+        maxsize: The maximum number of entries kept in the cache.
+        ttl: Seconds an entry stays valid after it is stored.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0) -> None:
+        """Initialize an empty TTLCache.
+
+        Args:
+            maxsize: The maximum number of entries kept in the cache.
+            ttl: Seconds an entry stays valid after it is stored.
+
+        Raises:
+            ValueError: If maxsize or ttl is not positive.
+        """
+        if ttl <= 0:
+            raise ValueError("Cache ttl must be positive")
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key if it has not expired.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is not cached or has expired.
+
+        Returns:
+            Any: The cached value, or default.
+        """
+        entry = super().get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if monotonic() >= expires_at:
+            self.pop(key)
+            return default
+        return value
+
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key for ttl seconds, evicting the least recently used entry if full.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+        """
+        super().put(key, (value, monotonic() + self.ttl))
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and monotonic() < entry[1]
@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Sequence, TypeVar
+
+_Item = TypeVar("_Item")
+_Result = TypeVar("_Result")
+
+
+def map_chunks(
+    function: Callable[[list[_Item]], _Result],
+    items: Sequence[_Item],
+    chunk_size: int,
+    max_workers: int,
+) -> list[_Result]:
+    """Apply function to consecutive chunks of items, in parallel threads when there are several.
+
+    Repositories use this to overlap the round-trips of chunked batch queries;
+    the HTTP client releases the GIL while waiting on the network.
+
+    Args:
+        function: Called once per chunk; typically sends one query.
+        items: The items to split.
+        chunk_size: Maximum number of items per chunk.
+        max_workers: Maximum number of chunks in flight at once; 1 runs them sequentially.
+
+    Returns:
+        list: The results, in chunk order.
+
+    Raises:
+        Exception: The first exception raised by function, in chunk order.
+    """
+    chunks = [list(items[start:start + chunk_size]) for start in range(0, len(items), chunk_size)]
+    if len(chunks) <= 1 or max_workers <= 1:
+        return [function(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=min(len(chunks), max_workers)) as pool:
+        return list(pool.map(function, chunks))
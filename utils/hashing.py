@@ -1,10 +1,25 @@
-from hashlib import sha256
+from functools import lru_cache
+from hashlib import blake2b
+
+# 128-bit digests (32 hex characters) are ample for telling identities apart
+# and keep stored hashes half the size of SHA-256's.
+HASH_DIGEST_SIZE = 16
+
+
+@lru_cache(maxsize=1024)
+def _hash(name: str) -> str:
+    """Return the hex digest of name, memoized since the same identities recur.
+
+    The digest fingerprints identities rather than protecting anything, so it
+    is marked as not used for security and stays available on FIPS-restricted builds.
+    """
+    return blake2b(name.encode(), digest_size=HASH_DIGEST_SIZE, usedforsecurity=False).hexdigest()
 
 
 class Hashing:
     """Provides hashing functionality for identity and other data.
     
-    This class can be used to generate SHA-256 hashes of strings, making it
+    This class can be used to generate BLAKE2b hashes of strings, making it
     reusable for hashing identities and other metadata in the ML lineage tracker.
     """
     def __init__(self) -> None:
@@ -13,12 +28,12 @@ class Hashing:
         
     
     def set_hash_name_from_env_(self, name:str) -> None:
-        """Generate and store a SHA-256 hash of the provided name.
+        """Generate and store a BLAKE2b hash of the provided name.
         
         Args:
             name: The string to hash.
         """
-        self.hash_name = sha256(name.encode()).hexdigest()
+        self.hash_name = _hash(name)
     
     
     def get_hash(self) -> str:
@@ -1,31 +1,118 @@
 import getpass
+import os
+import subprocess
+from functools import cached_property, lru_cache
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Optional
+from urllib3.util.retry import Retry
+
+GITHUB_USER_URL = "https://api.github.com/user"
+# (connect, read) seconds to wait for GitHub before giving up on the username.
+GITHUB_REQUEST_TIMEOUT = (3.05, 5)
+# Seconds to wait for `git config` when reading the GitHub username locally.
+GIT_CONFIG_TIMEOUT = 0.5
+
+# Reused across lookups so the TCP and TLS handshake with GitHub is paid once.
+# Connection errors and 5xx responses are retried twice with a short backoff.
+_github_session = requests.Session()
+_github_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+))
+# Logins fetched from GitHub, per token. Only successful lookups are kept,
+# so a transient failure is retried on the next call.
+_github_logins: Dict[Optional[str], str] = {}
+
+
+def _fetch_github_login(token: Optional[str]) -> Optional[str]:
+    """Fetch the login of the GitHub user authenticated by token.
+
+    Memoized per token, so each process asks GitHub at most once per token
+    once a lookup has succeeded.
+
+    Args:
+        token: A GitHub token, or None to query unauthenticated.
+
+    Returns:
+        Optional[str]: The GitHub login, or None if the request fails.
+    """
+    if token in _github_logins:
+        return _github_logins[token]
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    try:
+        response = _github_session.get(GITHUB_USER_URL, headers=headers, timeout=GITHUB_REQUEST_TIMEOUT)
+        login = response.json()["login"]
+    except Exception as e:
+        print(f"Error setting GitHub username: {e}")
+        return None
+    _github_logins[token] = login
+    return login
+
+
+def _has_github_credentials() -> bool:
+    """Whether a GitHub API request could be authenticated (token or ~/.netrc)."""
+    return bool(os.environ.get("GITHUB_TOKEN")) or os.path.exists(os.path.expanduser("~/.netrc"))
+
+
+@lru_cache(maxsize=1)
+def _git_config_github_user() -> Optional[str]:
+    """Read the ``github.user`` setting from the global git config.
+
+    Memoized, so ``git`` is spawned at most once per process.
+
+    Returns:
+        Optional[str]: The configured GitHub username, or None if unset or git is unavailable.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "config", "--global", "github.user"],
+            capture_output=True, text=True, timeout=GIT_CONFIG_TIMEOUT,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _resolve_github_username() -> Optional[str]:
+    """Look up the GitHub username, from GitHub's API when credentials are available.
+
+    Returns:
+        Optional[str]: The GitHub username, or None if it cannot be determined.
+    """
+    if not _has_github_credentials():
+        return _git_config_github_user()
+    return _fetch_github_login(os.environ.get("GITHUB_TOKEN"))
+
+
 class Identity:
     """Represents a user identity with name and GitHub username.
     
     This class manages identity information that can be derived from the local
     environment. The identity can be hashed later for use in tracking datasets,
-    runs, and models.
+    runs, and models. Each attribute is looked up on first access, so callers
+    that only read name never wait on GitHub.
     """
-    def __init__(self) -> None:
-        """Initialize an Identity instance with empty name and GitHub username."""
-        self.name = None
-        self.github_username = None
+    @cached_property
+    def name(self) -> str:
+        """The system username, read on first access."""
+        return getpass.getuser()
+    
+    @cached_property
+    def github_username(self) -> Optional[str]:
+        """The GitHub username, looked up on first access; None if it cannot be determined."""
+        return _resolve_github_username()
     
     
     def get_identity(self) -> dict[str, str]:
         """Get the identity as a dictionary mapping name to GitHub username.
         
-        Automatically sets name and GitHub username from environment if not already set.
+        Name and GitHub username are looked up from the environment if not already set.
         
         Returns:
             dict[str, str]: Dictionary with name as key and GitHub username as value.
         """
-        if not self.name:
-            self.set_identity_name_from_env_()
-        if not self.github_username:
-            self.set_identity_github_username_from_env_()
         return {self.name:self.github_username}
     
     def set_identity_name_from_env_(self) -> None:
@@ -35,13 +122,13 @@ class Identity:
     def set_identity_github_username_from_env_(self) -> None:
         """Set the GitHub username by querying GitHub's API.
         
-        Attempts to fetch the GitHub username from the authenticated user endpoint.
-        If the request fails (e.g., no authentication), sets github_username to None.
+        Attempts to fetch the GitHub username from the authenticated user endpoint,
+        authenticating with the ``GITHUB_TOKEN`` environment variable when set.
+        The result is cached per token for the life of the process. Without a
+        token or ``~/.netrc`` the request could only fail, so GitHub is not
+        contacted and the ``github.user`` git config setting is used instead.
+        If the request fails or nothing is configured, sets github_username to None.
         """
-        try:
-            self.github_username = requests.get("https://api.github.com/user").json()["login"]
-        except Exception as e:
-            print(f"Error setting GitHub username: {e}")
-            self.github_username = None
+        self.github_username = _resolve_github_username()
     
     
\ No newline at end of file